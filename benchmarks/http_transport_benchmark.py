@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the HTTP transport modes used by the Selise MCP server.
+Compares a new httpx.AsyncClient per call (the original behaviour) against the
+shared pooled client over HTTP/1.1 and HTTP/2.
+
+Usage:
+    python benchmarks/http_transport_benchmark.py --requests 40 --concurrency 8
+    python benchmarks/http_transport_benchmark.py --url https://api.seliseblocks.com/identifier/v1/Project/Gets
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import selise_mcp_server as server  # noqa: E402
+
+
+async def run_per_call(url: str, total: int, concurrency: int) -> list:
+    """Open a fresh client for every request, like the tools used to."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            async with httpx.AsyncClient() as client:
+                await client.get(url, headers=server.API_CONFIG["HEADERS"], timeout=30.0)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+async def run_pooled(url: str, total: int, concurrency: int, http2: bool) -> list:
+    """Send every request through one shared client."""
+    server.http_state["client"] = server.create_http_client(http2=http2)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await server.api_request("GET", url, headers=server.API_CONFIG["HEADERS"])
+            latencies.append(time.perf_counter() - start)
+
+    try:
+        await asyncio.gather(*(one() for _ in range(total)))
+    finally:
+        await server.close_http_client()
+    return latencies
+
+
+def summarize(name: str, wall: float, latencies: list) -> dict:
+    """Build a summary row for one benchmark mode."""
+    ordered = sorted(latencies)
+    return {
+        "mode": name,
+        "requests": len(latencies),
+        "wall_seconds": round(wall, 3),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 1),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1)
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=server.API_CONFIG["GET_PROJECTS_URL"], help="URL to request")
+    parser.add_argument("--requests", type=int, default=40, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent requests in flight")
+    args = parser.parse_args()
+
+    modes = [
+        ("per_call_http1", lambda: run_per_call(args.url, args.requests, args.concurrency)),
+        ("pooled_http1", lambda: run_pooled(args.url, args.requests, args.concurrency, http2=False))
+    ]
+    if server.http2_available():
+        modes.append(("pooled_http2", lambda: run_pooled(args.url, args.requests, args.concurrency, http2=True)))
+    else:
+        print("h2 is not installed; skipping pooled_http2 (pip install 'httpx[http2]')", file=sys.stderr)
+
+    results = []
+    for name, runner in modes:
+        start = time.perf_counter()
+        latencies = await runner()
+        results.append(summarize(name, time.perf_counter() - start, latencies))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
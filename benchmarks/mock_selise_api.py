@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Selise Blocks API, for offline benchmarks and tests.
+Serves every endpoint in API_CONFIG from in-memory fixtures with realistic payload
+shapes, and can inject latency, 5xx errors and 429 rate limiting.
+
+Run it as an HTTP server and point the MCP server at it:
+    python benchmarks/mock_selise_api.py --port 8765 --permissions 10000 --latency 0.05
+    SELISE_API_BASE_URL=http://127.0.0.1:8765 python src/selise_mcp_server.py
+
+Or use it in-process without a socket:
+    app = create_app(permissions=10000)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+"""
+
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+DEFAULT_TENANT_GROUP_ID = "mock-tenant-group"
+DEFAULT_PROJECT_NAME = "mockproject"
+DEFAULT_PROJECT_KEY = "MOCKPROJECTKEY0001"
+
+RESOURCE_GROUPS = ("users", "orders", "products", "invoices", "reports", "settings", "files", "messages")
+PERMISSION_TYPES = (1, 2, 3, 4)  # read, write, delete, manage
+FIELD_TYPES = ("String", "Int", "Float", "Boolean", "DateTime")
+
+DEFAULT_OPTIONS = {
+    "latency": 0.0,
+    "jitter": 0.0,
+    "error_rate": 0.0,
+    "rate_limit_rate": 0.0,
+    "retry_after": 1.0,
+    "token_expires_in": 8000,
+    "projects": 3,
+    "schemas": 10,
+    "fields_per_schema": 8,
+    "roles": 6,
+    "permissions": 50,
+    "repos": 5,
+    "seed": 42
+}
+
+
+def new_id(rng: random.Random) -> str:
+    """Return a Mongo-style 24-character hex ID."""
+    return "%024x" % rng.getrandbits(96)
+
+
+def iso_date(rng: random.Random) -> str:
+    """Return a plausible creation date within the last year."""
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=rng.randrange(525600))
+    return created.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def build_project_fixtures(project_key: str, options: dict, rng: random.Random) -> dict:
+    """Generate the per-project data (schemas, roles, permissions, configuration)."""
+    roles = []
+    for index in range(options["roles"]):
+        slug = "admin" if index == 0 else f"role-{index}"
+        roles.append({
+            "itemId": new_id(rng),
+            "name": slug.replace("-", " ").title(),
+            "slug": slug,
+            "description": f"Mock role {slug}",
+            "count": 0,
+            "projectKey": project_key,
+            "createdDate": iso_date(rng)
+        })
+
+    permissions = []
+    for index in range(options["permissions"]):
+        group = RESOURCE_GROUPS[index % len(RESOURCE_GROUPS)]
+        assigned = [role["slug"] for role in roles if rng.random() < 0.2]
+        permissions.append({
+            "itemId": new_id(rng),
+            "name": f"{group}-permission-{index}",
+            "type": PERMISSION_TYPES[index % len(PERMISSION_TYPES)],
+            "resource": f"{group}-resource-{index // len(RESOURCE_GROUPS)}",
+            "resourceGroup": group,
+            "tags": [group, "mock"],
+            "description": f"Mock permission {index}",
+            "dependentPermissions": [],
+            "isBuiltIn": index % 10 == 0,
+            "roles": assigned,
+            "projectKey": project_key,
+            "createdDate": iso_date(rng)
+        })
+
+    schemas = {}
+    for index in range(options["schemas"]):
+        name = f"MockEntity{index}"
+        item_id = new_id(rng)
+        schemas[item_id] = {
+            "itemId": item_id,
+            "schemaName": name,
+            "collectionName": f"{name}s",
+            "schemaType": 1,
+            "projectKey": project_key,
+            "createdDate": iso_date(rng),
+            "fields": [
+                {"name": f"Field{field}", "type": FIELD_TYPES[field % len(FIELD_TYPES)], "isArray": False}
+                for field in range(options["fields_per_schema"])
+            ]
+        }
+
+    project = {
+        "schemas": schemas,
+        "roles": roles,
+        "permissions": permissions,
+        "captcha": [],
+        "sso": [],
+        "mfa": None,
+        "data_gateway": None,
+        "auth_config": {
+            "itemId": new_id(rng),
+            "projectKey": project_key,
+            "refreshTokenValidForNumberMinutes": 300,
+            "accessTokenValidForNumberMinutes": 15,
+            "rememberMeRefreshTokenValidForNumberMinutes": 43200,
+            "allowedGrantTypes": ["password", "refresh_token"],
+            "getNumberOfWrongAttemptsToLockTheAccount": 5,
+            "accountLockDurationInMinutes": 5
+        }
+    }
+    recount_roles(project)
+    return project
+
+
+def recount_roles(project: dict) -> None:
+    """Refresh each role's permission count, as the real GetRoles listing reports it."""
+    counts = {}
+    for permission in project["permissions"]:
+        for slug in permission["roles"]:
+            counts[slug] = counts.get(slug, 0) + 1
+    for role in project["roles"]:
+        role["count"] = counts.get(role["slug"], 0)
+
+
+def build_state(options: dict) -> dict:
+    """Generate the initial mock state: tenant groups with projects, and GitHub repositories."""
+    rng = random.Random(options["seed"])
+    projects = []
+    for index in range(max(1, options["projects"])):
+        name = DEFAULT_PROJECT_NAME if index == 0 else f"{DEFAULT_PROJECT_NAME}{index}"
+        tenant_id = DEFAULT_PROJECT_KEY if index == 0 else f"MOCKPROJECTKEY{index + 1:04d}"
+        projects.append({
+            "itemId": new_id(rng),
+            "name": name,
+            "tenantId": tenant_id,
+            "tenantGroupId": DEFAULT_TENANT_GROUP_ID,
+            "environment": "dev",
+            "applicationDomain": f"https://dev-{name}.seliseblocks.com",
+            "cookieDomain": "seliseblocks.com",
+            "applicationContexts": [{
+                "environment": "dev",
+                "domain": f"https://dev-{name}.seliseblocks.com",
+                "cookieDomain": "seliseblocks.com"
+            }],
+            "createdDate": iso_date(rng)
+        })
+
+    repos = []
+    for index in range(options["repos"]):
+        name = f"mock-repo-{index}"
+        repos.append({
+            "id": rng.randrange(10 ** 8, 10 ** 9),
+            "name": name,
+            "fullName": f"mock-org/{name}",
+            "url": f"https://github.com/mock-org/{name}",
+            "description": f"Mock repository {index}",
+            "language": rng.choice(["TypeScript", "Python", "C#"]),
+            "isPrivate": index % 2 == 0,
+            "defaultBranch": "main",
+            "stargazersCount": rng.randrange(100),
+            "forksCount": rng.randrange(20),
+            "size": rng.randrange(10000),
+            "createdAt": iso_date(rng),
+            "updatedAt": iso_date(rng)
+        })
+
+    return {
+        "options": options,
+        "rng": rng,
+        "tokens": set(),
+        "refresh_tokens": set(),
+        "projects": projects,
+        "project_data": {},
+        "repos": repos,
+        "stats": {"requests": 0, "errors_injected": 0, "rate_limited": 0, "by_path": {}}
+    }
+
+
+def get_project_data(state: dict, project_key: str) -> dict:
+    """Get the data for a project key, generating fixtures on first use."""
+    project = state["project_data"].get(project_key)
+    if project is None:
+        project = build_project_fixtures(project_key, state["options"], state["rng"])
+        state["project_data"][project_key] = project
+    return project
+
+
+def paginate(items: list, page: int, page_size: int) -> list:
+    """Return one zero-based page of items."""
+    page_size = max(1, page_size)
+    return items[page * page_size:(page + 1) * page_size]
+
+
+def sort_items(items: list, sort: dict) -> list:
+    """Sort listing items by a PascalCase property name, like the IAM listings do."""
+    prop = (sort or {}).get("property") or "Name"
+    key = prop[:1].lower() + prop[1:]
+    return sorted(items, key=lambda item: str(item.get(key, "")), reverse=bool((sort or {}).get("isDescending")))
+
+
+def create_app(**overrides) -> Starlette:
+    """
+    Build the mock Selise API application.
+
+    Args:
+        **overrides: Any key of DEFAULT_OPTIONS, e.g. permissions=10000, latency=0.05,
+            error_rate=0.01, rate_limit_rate=0.02
+
+    Returns:
+        Starlette app; its mock state (fixtures and request counters) is at app.state.mock
+    """
+    unknown = set(overrides) - set(DEFAULT_OPTIONS)
+    if unknown:
+        raise TypeError(f"Unknown mock option(s): {', '.join(sorted(unknown))}")
+    options = {**DEFAULT_OPTIONS, **overrides}
+    state = build_state(options)
+
+    def error(status: int, message: str, headers: dict = None) -> JSONResponse:
+        return JSONResponse({"isSuccess": False, "errors": {"message": message}}, status_code=status, headers=headers)
+
+    def endpoint(handler, authenticated: bool = True):
+        """Wrap a handler with request counting, auth checks and latency/fault injection."""
+        async def wrapped(request: Request):
+            stats = state["stats"]
+            stats["requests"] += 1
+            path = request.url.path
+            stats["by_path"][path] = stats["by_path"].get(path, 0) + 1
+
+            delay = options["latency"] + (state["rng"].uniform(0, options["jitter"]) if options["jitter"] else 0)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if options["rate_limit_rate"] and state["rng"].random() < options["rate_limit_rate"]:
+                stats["rate_limited"] += 1
+                return error(429, "Too many requests", {"Retry-After": str(options["retry_after"])})
+            if options["error_rate"] and state["rng"].random() < options["error_rate"]:
+                stats["errors_injected"] += 1
+                return error(503, "Service unavailable")
+
+            if authenticated:
+                token = request.headers.get("authorization", "")[len("Bearer "):]
+                if token not in state["tokens"]:
+                    return error(401, "Unauthorized")
+            return await handler(request)
+
+        return wrapped
+
+    async def read_json(request: Request) -> dict:
+        body = await request.body()
+        return await request.json() if body else {}
+
+    async def token(request: Request):
+        form = parse_qs((await request.body()).decode("utf-8"))
+        grant_type = form.get("grant_type", [""])[0]
+        if grant_type == "password":
+            if not form.get("username", [""])[0] or not form.get("password", [""])[0]:
+                return JSONResponse({"error": "invalid_grant"}, status_code=400)
+        elif grant_type == "refresh_token":
+            if form.get("refresh_token", [""])[0] not in state["refresh_tokens"]:
+                return JSONResponse({"error": "invalid_grant"}, status_code=400)
+        else:
+            return JSONResponse({"error": "unsupported_grant_type"}, status_code=400)
+
+        access_token = uuid.uuid4().hex
+        refresh_token = uuid.uuid4().hex
+        state["tokens"].add(access_token)
+        state["refresh_tokens"].add(refresh_token)
+        return JSONResponse({
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": options["token_expires_in"]
+        })
+
+    async def get_projects(request: Request):
+        tenant_group_id = request.query_params.get("tenantGroupId")
+        page = int(request.query_params.get("page", 0))
+        page_size = int(request.query_params.get("pageSize", 100))
+        groups = {}
+        for project in state["projects"]:
+            if tenant_group_id and project["tenantGroupId"] != tenant_group_id:
+                continue
+            groups.setdefault(project["tenantGroupId"], []).append(project)
+        return JSONResponse([
+            {"tenantGroupId": group_id, "projects": paginate(projects, page, page_size)}
+            for group_id, projects in groups.items()
+        ])
+
+    async def get_project(request: Request):
+        item_id = request.query_params.get("id")
+        for project in state["projects"]:
+            if project["itemId"] == item_id:
+                return JSONResponse(project)
+        return error(404, f"Project {item_id} not found")
+
+    async def create_project(request: Request):
+        payload = await read_json(request)
+        name = payload.get("name")
+        if not name:
+            return error(400, "Project name is required")
+        if any(project["name"] == name for project in state["projects"]):
+            return JSONResponse({"isSuccess": False, "errors": {"name": "Project name already exists"}})
+        tenant_group_id = str(uuid.UUID(int=state["rng"].getrandbits(128)))
+        contexts = payload.get("applicationContexts") or []
+        project = {
+            "itemId": new_id(state["rng"]),
+            "name": name,
+            "tenantId": uuid.UUID(int=state["rng"].getrandbits(128)).hex.upper(),
+            "tenantGroupId": tenant_group_id,
+            "environment": "dev",
+            "applicationDomain": f"https://dev-{name}.seliseblocks.com",
+            "cookieDomain": "seliseblocks.com",
+            "applicationContexts": contexts,
+            "resources": payload.get("resources", []),
+            "createdDate": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        }
+        state["projects"].append(project)
+        return JSONResponse({"isSuccess": True, "itemId": project["itemId"], "tenantGroupId": tenant_group_id, "errors": None})
+
+    async def create_schema(request: Request):
+        payload = await read_json(request)
+        project = get_project_data(state, payload.get("projectKey", ""))
+        name = payload.get("schemaName")
+        if not name:
+            return error(400, "schemaName is required")
+        if any(schema["schemaName"] == name for schema in project["schemas"].values()):
+            return error(400, f"Schema '{name}' already exists")
+        item_id = new_id(state["rng"])
+        project["schemas"][item_id] = {
+            "itemId": item_id,
+            "schemaName": name,
+            "collectionName": payload.get("collectionName") or f"{name}s",
+            "schemaType": payload.get("schemaType", 1),
+            "projectKey": payload.get("projectKey"),
+            "createdDate": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "fields": []
+        }
+        return JSONResponse({"isSuccess": True, "itemId": item_id, "errors": None})
+
+    async def list_schemas(request: Request):
+        params = request.query_params
+        project = get_project_data(state, params.get("ProjectKey", ""))
+        keyword = params.get("Keyword", "").lower()
+        items = [
+            {key: value for key, value in schema.items() if key != "fields"}
+            for schema in project["schemas"].values()
+            if keyword in schema["schemaName"].lower()
+        ]
+        items = sort_items(items, {"property": params.get("SortBy", "CreatedDate"), "isDescending": params.get("SortDescending", "true").lower() == "true"})
+        page_number = max(1, int(params.get("PageNumber", 1)))
+        return JSONResponse({
+            "data": paginate(items, page_number - 1, int(params.get("PageSize", 100))),
+            "totalCount": len(items)
+        })
+
+    def find_schema(item_id: str):
+        for project in state["project_data"].values():
+            if item_id in project["schemas"]:
+                return project["schemas"][item_id]
+        return None
+
+    async def get_schema(request: Request):
+        schema = find_schema(request.path_params["schema_id"])
+        if schema is None:
+            return error(404, "Schema not found")
+        return JSONResponse(schema)
+
+    async def save_schema_fields(request: Request):
+        payload = await read_json(request)
+        schema = find_schema(payload.get("schemaDefinitionItemId", ""))
+        if schema is None:
+            return error(404, "Schema not found")
+        deletable = set(payload.get("deletableFieldNames") or [])
+        schema["fields"] = [field for field in payload.get("fields") or [] if field.get("name") not in deletable]
+        return JSONResponse({"isSuccess": True, "errors": None})
+
+    async def data_gateway(request: Request):
+        payload = await read_json(request)
+        get_project_data(state, payload.get("projectKey", ""))["data_gateway"] = payload
+        return JSONResponse({"success": True, "errors": None})
+
+    async def update_auth_config(request: Request):
+        payload = await read_json(request)
+        project = get_project_data(state, payload.get("projectKey", ""))
+        project["auth_config"].update({key: value for key, value in payload.items() if value is not None})
+        return JSONResponse({"isSuccess": True, "errors": None})
+
+    async def get_auth_config(request: Request):
+        return JSONResponse(get_project_data(state, request.query_params.get("ProjectKey", ""))["auth_config"])
+
+    async def save_captcha(request: Request):
+        payload = await read_json(request)
+        project = get_project_data(state, payload.get("projectKey", ""))
+        config = {
+            "itemId": new_id(state["rng"]),
+            "provider": payload.get("provider"),
+            "captchaKey": payload.get("captchaKey"),
+            "isEnable": bool(payload.get("isEnable")),
+            "projectKey": payload.get("projectKey"),
+            "createdDate": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        }
+        project["captcha"].append(config)
+        return JSONResponse({"isSuccess": True, "itemId": config["itemId"], "errors": None})
+
+    async def list_captcha(request: Request):
+        project = get_project_data(state, request.query_params.get("ProjectKey", ""))
+        return JSONResponse({"configurations": project["captcha"]})
+
+    async def update_captcha_status(request: Request):
+        payload = await read_json(request)
+        project = get_project_data(state, payload.get("projectKey", ""))
+        for config in project["captcha"]:
+            if config["itemId"] == payload.get("itemId"):
+                config["isEnable"] = bool(payload.get("isEnable"))
+                return JSONResponse({"isSuccess": True, "errors": None})
+        return JSONResponse({"isSuccess": False, "errors": {"itemId": "Configuration not found"}})
+
+    async def get_roles(request: Request):
+        payload = await read_json(request)
+        project = get_project_data(state, payload.get("projectKey", ""))
+        search = ((payload.get("filter") or {}).get("search") or "").lower()
+        roles = [role for role in project["roles"] if search in role["name"].lower() or search in role["slug"]]
+        roles = sort_items(roles, payload.get("sort"))
+        return JSONResponse({
+            "data": paginate(roles, int(payload.get("page", 0)), int(payload.get("pageSize", 10))),
+            "totalCount": len(roles)
+        })
+
+    async def create_role(request: Request):
+        payload = await read_json(request)
+        project = get_project_data(state, payload.get("projectKey", ""))
+        if any(role["slug"] == payload.get("slug") for role in project["roles"]):
+            return JSONResponse({"isSuccess": False, "itemId": None, "errors": {"slug": "Slug already exists"}})
+        role = {
+            "itemId": new_id(state["rng"]),
+            "name": payload.get("name"),
+            "slug": payload.get("slug"),
+            "description": payload.get("description"),
+            "count": 0,
+            "projectKey": payload.get("projectKey"),
+            "createdDate": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        }
+        project["roles"].append(role)
+        return JSONResponse({"isSuccess": True, "itemId": role["itemId"], "errors": None})
+
+    async def get_permissions(request: Request):
+        payload = await read_json(request)
+        project = get_project_data(state, payload.get("projectKey", ""))
+        filters = payload.get("filter") or {}
+        search = (filters.get("search") or "").lower()
+        group = filters.get("resourceGroup") or ""
+        roles = set(payload.get("roles") or [])
+        permissions = [
+            permission for permission in project["permissions"]
+            if (not search or search in permission["name"].lower())
+            and (not group or permission["resourceGroup"] == group)
+            and (filters.get("isBuiltIn") in (None, "") or str(permission["isBuiltIn"]).lower() == str(filters["isBuiltIn"]).lower())
+            and (not roles or roles.intersection(permission["roles"]))
+        ]
+        permissions = sort_items(permissions, payload.get("sort"))
+        return JSONResponse({
+            "data": paginate(permissions, int(payload.get("page", 0)), int(payload.get("pageSize", 10))),
+            "totalCount": len(permissions)
+        })
+
+    permission_keys = ("name", "type", "resource", "resourceGroup", "tags", "description", "dependentPermissions")
+
+    async def create_permission(request: Request):
+        payload = await read_json(request)
+        project = get_project_data(state, payload.get("projectKey", ""))
+        if any(permission["name"] == payload.get("name") for permission in project["permissions"]):
+            return JSONResponse({"isSuccess": False, "itemId": None, "errors": {"name": "Permission already exists"}})
+        permission = {
+            "itemId": new_id(state["rng"]),
+            **{key: payload.get(key) for key in permission_keys},
+            "isBuiltIn": False,
+            "roles": [],
+            "projectKey": payload.get("projectKey"),
+            "createdDate": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        }
+        project["permissions"].append(permission)
+        return JSONResponse({"isSuccess": True, "itemId": permission["itemId"], "errors": None})
+
+    async def update_permission(request: Request):
+        payload = await read_json(request)
+        project = get_project_data(state, payload.get("projectKey", ""))
+        for permission in project["permissions"]:
+            if permission["itemId"] == payload.get("itemId"):
+                permission.update({key: payload[key] for key in permission_keys if key in payload})
+                return JSONResponse({"isSuccess": True, "errors": None})
+        return JSONResponse({"isSuccess": False, "errors": {"itemId": "Permission not found"}})
+
+    async def get_resource_groups(request: Request):
+        project = get_project_data(state, request.query_params.get("ProjectKey", ""))
+        counts = {}
+        for permission in project["permissions"]:
+            counts[permission["resourceGroup"]] = counts.get(permission["resourceGroup"], 0) + 1
+        return JSONResponse([{"resourceGroup": group, "count": count} for group, count in sorted(counts.items())])
+
+    async def set_roles(request: Request):
+        payload = await read_json(request)
+        project = get_project_data(state, payload.get("projectKey", ""))
+        slug = payload.get("slug")
+        if not any(role["slug"] == slug for role in project["roles"]):
+            return JSONResponse({"success": False, "errors": {"slug": "Role not found"}})
+        add = set(payload.get("addPermissions") or [])
+        remove = set(payload.get("removePermissions") or [])
+        for permission in project["permissions"]:
+            if permission["itemId"] in add and slug not in permission["roles"]:
+                permission["roles"].append(slug)
+            elif permission["itemId"] in remove and slug in permission["roles"]:
+                permission["roles"].remove(slug)
+        recount_roles(project)
+        return JSONResponse({"success": True, "errors": None})
+
+    async def save_sso(request: Request):
+        payload = await read_json(request)
+        project = get_project_data(state, payload.get("projectKey", ""))
+        project["sso"] = [item for item in project["sso"] if item.get("provider") != payload.get("provider")] + [payload]
+        return JSONResponse({"isSuccess": True, "errors": None})
+
+    async def save_mfa(request: Request):
+        payload = await read_json(request)
+        get_project_data(state, payload.get("projectKey", ""))["mfa"] = payload
+        return JSONResponse({"isSuccess": True, "errors": None})
+
+    async def github_repos(request: Request):
+        return JSONResponse(state["repos"])
+
+    async def run_build(request: Request):
+        return JSONResponse({"isSuccess": True, "buildId": new_id(state["rng"]), "errors": None})
+
+    routes = [
+        Route("/authentication/v1/OAuth/Token", endpoint(token, authenticated=False), methods=["POST"]),
+        Route("/identifier/v1/Project/Gets", endpoint(get_projects), methods=["GET"]),
+        Route("/identifier/v1/Project/Get", endpoint(get_project), methods=["GET"]),
+        Route("/identifier/v1/Project/Create", endpoint(create_project), methods=["POST"]),
+        Route("/graphql/v1/schemas/info", endpoint(create_schema), methods=["POST"]),
+        Route("/graphql/v1/schemas/fields", endpoint(save_schema_fields), methods=["POST"]),
+        Route("/graphql/v1/schemas", endpoint(list_schemas), methods=["GET"]),
+        Route("/graphql/v1/schemas/{schema_id}", endpoint(get_schema), methods=["GET"]),
+        Route("/graphql/v1/configurations", endpoint(data_gateway), methods=["POST"]),
+        Route("/authentication/v1/Configuration/Update", endpoint(update_auth_config), methods=["POST"]),
+        Route("/authentication/v1/Configuration/Get", endpoint(get_auth_config), methods=["GET"]),
+        Route("/authentication/v1/Social/SaveSsoCredential", endpoint(save_sso), methods=["POST"]),
+        Route("/captcha/v1/Configuration/Save", endpoint(save_captcha), methods=["POST"]),
+        Route("/captcha/v1/Configuration/Gets", endpoint(list_captcha), methods=["GET"]),
+        Route("/captcha/v1/Configuration/UpdateStatus", endpoint(update_captcha_status), methods=["POST"]),
+        Route("/iam/v1/Resource/GetRoles", endpoint(get_roles), methods=["POST"]),
+        Route("/iam/v1/Resource/CreateRole", endpoint(create_role), methods=["POST"]),
+        Route("/iam/v1/Resource/GetPermissions", endpoint(get_permissions), methods=["POST"]),
+        Route("/iam/v1/Resource/CreatePermission", endpoint(create_permission), methods=["POST"]),
+        Route("/iam/v1/Resource/UpdatePermission", endpoint(update_permission), methods=["POST"]),
+        Route("/iam/v1/Resource/GetResourceGroups", endpoint(get_resource_groups), methods=["GET"]),
+        Route("/iam/v1/Resource/SetRoles", endpoint(set_roles), methods=["POST"]),
+        Route("/mfa/v1/Configuration/Save", endpoint(save_mfa), methods=["POST"]),
+        Route("/cloudbuild/v1/github/repos", endpoint(github_repos), methods=["GET"]),
+        Route("/cloudbuild/v1/build/run-build", endpoint(run_build), methods=["POST"])
+    ]
+
+    app = Starlette(routes=routes)
+    app.state.mock = state
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=DEFAULT_OPTIONS["latency"], help="Base latency per request in seconds")
+    parser.add_argument("--jitter", type=float, default=DEFAULT_OPTIONS["jitter"], help="Extra random latency in seconds (uniform)")
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_OPTIONS["error_rate"], help="Fraction of requests answered with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=DEFAULT_OPTIONS["rate_limit_rate"], help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=DEFAULT_OPTIONS["retry_after"], help="Retry-After seconds sent with 429 responses")
+    parser.add_argument("--projects", type=int, default=DEFAULT_OPTIONS["projects"], help="Projects in the default tenant group")
+    parser.add_argument("--schemas", type=int, default=DEFAULT_OPTIONS["schemas"], help="Schemas per project")
+    parser.add_argument("--roles", type=int, default=DEFAULT_OPTIONS["roles"], help="Roles per project")
+    parser.add_argument("--permissions", type=int, default=DEFAULT_OPTIONS["permissions"], help="Permissions per project")
+    parser.add_argument("--repos", type=int, default=DEFAULT_OPTIONS["repos"], help="GitHub repositories")
+    parser.add_argument("--seed", type=int, default=DEFAULT_OPTIONS["seed"], help="Random seed for fixtures and fault injection")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_app(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        projects=args.projects,
+        schemas=args.schemas,
+        roles=args.roles,
+        permissions=args.permissions,
+        repos=args.repos,
+        seed=args.seed
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
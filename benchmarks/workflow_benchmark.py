@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of representative agent workflows.
+Drives the FastMCP server in-process (through fastmcp.Client) against the local
+Selise API stand-in in mock_selise_api.py, so no network or credentials are needed.
+
+Workflows:
+    bootstrap: login -> get_projects -> create_local_repository (with a stub `blocks` CLI)
+    data_model: 10 schemas, each created, listed and given its fields
+    rbac: 6 roles and 50 permissions, then a permission set per role
+    security: captcha + MFA + SSO setup
+
+The server's client-side rate limiter is off unless --client-rate-limit is given, since
+against a local API it would dominate the timings. For each workflow the median over
+--iterations runs is reported: wall time, upstream
+requests, bytes sent/received upstream, bytes serialized for the MCP client, and
+peak RSS of the process.
+
+Usage:
+    python benchmarks/workflow_benchmark.py --iterations 5 --output results.json
+    python benchmarks/workflow_benchmark.py --baseline results.json --threshold 0.2
+    python benchmarks/workflow_benchmark.py --workflow rbac --latency 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from fastmcp import Client
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import selise_mcp_server as server  # noqa: E402
+from mock_selise_api import create_app  # noqa: E402
+
+# Deterministic metrics; any increase over the baseline is a regression
+EXACT_METRICS = ("upstream_requests",)
+# Timing and size metrics; an increase beyond the threshold is a regression
+THRESHOLD_METRICS = ("wall_seconds", "serialized_bytes")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def install_stub_blocks_cli(directory: str) -> None:
+    """Put a `blocks` stub on PATH so create_local_repository runs without the real CLI."""
+    stub = os.path.join(directory, "blocks")
+    with open(stub, "w") as stub_file:
+        stub_file.write("#!/bin/sh\necho \"blocks stub $*\"\n")
+    os.chmod(stub, 0o755)
+    os.environ["PATH"] = directory + os.pathsep + os.environ.get("PATH", "")
+
+
+def reset_server_state() -> None:
+    """Forget auth, project, cache, breaker and metrics state between runs."""
+    server.STATE_STORE_CONFIG["enabled"] = False
+    server.auth_state.update({"access_token": None, "refresh_token": None, "expires_at": None})
+    for key in server.app_state:
+        server.app_state[key] = None
+    server.invalidate_cache()
+    server.circuit_state["circuits"].clear()
+    server.rate_limit_state["buckets"].clear()
+    server.plan_state["applied"].clear()
+    server.reset_metrics()
+
+
+async def call_tool(client: Client, name: str, arguments: dict) -> dict:
+    """Call a tool and fail the run if it does not succeed."""
+    result = await client.call_tool(name, arguments)
+    data = json.loads(result.content[0].text)
+    if data.get("status") not in ("success", "partial"):
+        raise RuntimeError(f"{name} failed: {data.get('message')}")
+    return data
+
+
+async def login(client: Client) -> None:
+    await call_tool(client, "login", {"username": "bench@example.com", "password": "bench"})
+    await call_tool(client, "get_projects", {})
+
+
+async def workflow_bootstrap(client: Client) -> None:
+    await call_tool(client, "login", {"username": "bench@example.com", "password": "bench"})
+    await call_tool(client, "get_projects", {})
+    await call_tool(client, "create_local_repository", {"repository_name": "bench-app"})
+
+
+async def workflow_data_model(client: Client) -> None:
+    await login(client)
+    for index in range(10):
+        name = f"BenchEntity{index}"
+        await call_tool(client, "create_schema", {"schema_name": name})
+        schemas = await call_tool(client, "list_schemas", {"keyword": name})
+        schema_id = schemas["schemas"]["data"][0]["itemId"]
+        fields = [
+            {"name": "Title", "type": "String", "isArray": False},
+            {"name": "Amount", "type": "Float", "isArray": False},
+            {"name": "CreatedOn", "type": "DateTime", "isArray": False},
+            {"name": "IsActive", "type": "Boolean", "isArray": False}
+        ]
+        await call_tool(client, "update_schema_fields", {"schema_id": schema_id, "fields": fields})
+
+
+async def workflow_rbac(client: Client) -> None:
+    await login(client)
+    roles = [f"bench-role-{index}" for index in range(6)]
+    for slug in roles:
+        await call_tool(client, "create_role", {"name": slug.title(), "description": f"Benchmark role {slug}", "slug": slug})
+
+    for index in range(50):
+        await call_tool(client, "create_permission", {
+            "name": f"bench-permission-{index}",
+            "description": f"Benchmark permission {index}",
+            "resource": f"bench-resource-{index % 10}",
+            "resource_group": "bench",
+            "tags": ["bench"]
+        })
+
+    permissions = await call_tool(client, "list_permissions", {"resource_group": "bench", "all_pages": True})
+    permission_ids = [permission["itemId"] for permission in permissions["permissions"]]
+    for index, slug in enumerate(roles):
+        await call_tool(client, "set_role_permissions", {"role_slug": slug, "add_permissions": permission_ids[index::len(roles)]})
+    await call_tool(client, "list_roles", {})
+
+
+async def workflow_security(client: Client) -> None:
+    await login(client)
+    await call_tool(client, "save_captcha_config", {"provider": "recaptcha", "site_key": "bench-site-key", "secret_key": "bench-secret", "is_enable": True})
+    await call_tool(client, "list_captcha_configs", {})
+    await call_tool(client, "enable_authenticator_mfa", {})
+    await call_tool(client, "add_sso_credential", {"provider": "google", "client_id": "bench-client", "client_secret": "bench-secret"})
+    await call_tool(client, "get_authentication_config", {})
+
+
+WORKFLOWS = {
+    "bootstrap": workflow_bootstrap,
+    "data_model": workflow_data_model,
+    "rbac": workflow_rbac,
+    "security": workflow_security
+}
+
+
+async def run_workflow(name: str, mock_options: dict) -> dict:
+    """Run one workflow against a fresh mock API and collect its measurements."""
+    reset_server_state()
+    app = create_app(**mock_options)
+    server.http_state["client"] = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), timeout=30.0)
+
+    async with Client(server.mcp) as client:
+        start = time.perf_counter()
+        await WORKFLOWS[name](client)
+        wall = time.perf_counter() - start
+
+    metrics = server.get_metrics_snapshot()
+    return {
+        "wall_seconds": wall,
+        "tool_calls": sum(tool["calls"] for tool in metrics["tools"].values()),
+        "upstream_requests": sum(endpoint["requests"] for endpoint in metrics["upstream"].values()),
+        "upstream_request_bytes": sum(endpoint["request_bytes"] for endpoint in metrics["upstream"].values()),
+        "upstream_response_bytes": sum(endpoint["response_bytes"] for endpoint in metrics["upstream"].values()),
+        "serialized_bytes": sum(tool["response_bytes"] for tool in metrics["tools"].values()),
+        "retries": sum(endpoint["retries"] for endpoint in metrics["upstream"].values()),
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+def summarize(name: str, runs: list) -> dict:
+    """Build the result row for one workflow from its runs (medians, plus min/max wall time)."""
+    walls = [run["wall_seconds"] for run in runs]
+    row = {"workflow": name, "iterations": len(runs)}
+    for key in runs[0]:
+        values = [run[key] for run in runs if run[key] is not None]
+        row[key] = statistics.median_low(values) if values else None
+    row["wall_seconds"] = round(statistics.median(walls), 4)
+    row["wall_seconds_min"] = round(min(walls), 4)
+    row["wall_seconds_max"] = round(max(walls), 4)
+    row["peak_rss_mb"] = max((run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None), default=None)
+    return row
+
+
+def git_commit() -> str:
+    """Current commit hash, so result files can be matched to the code they measured."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def check_regressions(results: list, baseline: dict, threshold: float, min_wall_delta: float = 0.0) -> list:
+    """
+    Compare results with a baseline result file.
+
+    Wall time only counts as regressed when it also grew by more than min_wall_delta seconds,
+    so millisecond-scale workflows do not fail on scheduler noise.
+
+    Returns:
+        A description of each regression (empty if none)
+    """
+    baseline_rows = {row["workflow"]: row for row in baseline.get("results", [])}
+    regressions = []
+    for row in results:
+        previous = baseline_rows.get(row["workflow"])
+        if previous is None:
+            continue
+        for key in EXACT_METRICS:
+            if previous.get(key) is not None and row[key] > previous[key]:
+                regressions.append(f"{row['workflow']}: {key} {previous[key]} -> {row[key]}")
+        for key in THRESHOLD_METRICS:
+            if key == "wall_seconds" and row[key] - (previous.get(key) or 0) <= min_wall_delta:
+                continue
+            if previous.get(key) and row[key] > previous[key] * (1 + threshold):
+                change = (row[key] / previous[key] - 1) * 100
+                regressions.append(f"{row['workflow']}: {key} {previous[key]} -> {row[key]} (+{change:.0f}%)")
+    return regressions
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workflow", action="append", choices=sorted(WORKFLOWS), help="Workflow to run (repeatable; default: all)")
+    parser.add_argument("--iterations", type=int, default=3, help="Runs per workflow; medians are reported")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock API latency per request in seconds")
+    parser.add_argument("--permissions", type=int, default=50, help="Existing permissions per mock project")
+    parser.add_argument("--min-wall-delta", type=float, default=0.05, help="Seconds wall time must grow by before it can count as a regression")
+    parser.add_argument("--client-rate-limit", action="store_true", help="Turn the server's client-side rate limiter on (it dominates wall time against a local API)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Result file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative increase in wall time and serialized bytes")
+    args = parser.parse_args()
+
+    mock_options = {"latency": args.latency, "permissions": args.permissions}
+    server.RATE_LIMIT_CONFIG["enabled"] = args.client_rate_limit
+    output_path = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    workflows = args.workflow or list(WORKFLOWS)
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        install_stub_blocks_cli(work_dir)
+        os.chdir(work_dir)
+        for name in workflows:
+            runs = [await run_workflow(name, mock_options) for _ in range(args.iterations)]
+            results.append(summarize(name, runs))
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "settings": {"iterations": args.iterations, "client_rate_limit": args.client_rate_limit, **mock_options},
+        "results": results
+    }
+    print(json.dumps(report, indent=2))
+
+    if output_path:
+        with open(output_path, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if baseline_path:
+        with open(baseline_path) as baseline_file:
+            regressions = check_regressions(results, json.load(baseline_file), args.threshold, args.min_wall_delta)
+        if regressions:
+            print("Regressions against baseline:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            sys.exit(1)
+        print("No regressions against baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,76 +1,1734 @@
+import atexit
+import copy
 import httpx
 import json
+import logging
+import logging.handlers
+import os
+import queue
 import subprocess
+import sys
 import asyncio
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from fastmcp import FastMCP
+import gzip
+import hashlib
+import importlib.util
+import math
+import random
+import re
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Tuple
+from fastmcp import FastMCP, Context
+from fastmcp.server.middleware import Middleware, MiddlewareContext
 
-# Initialize FastMCP server
-mcp = FastMCP("Selise Blocks API")
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # Optional: only needed for the persistent state store
+    Fernet = None
+    InvalidToken = Exception
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding for tool results
+    orjson = None
+
+# Global state for authentication
+auth_state = {
+    "access_token": None,
+    "refresh_token": None,
+    "expires_at": None,
+    "token_type": "bearer"
+}
+
+# Global state for application domain
+app_state = {
+    "application_domain": None,
+    "tenant_id": None,
+    "tenant_group_id": None,
+    "project_name": None
+}
+
+# Base URL of the Selise API; point it at a local stand-in (see benchmarks/mock_selise_api.py) to run offline
+API_BASE_URL = os.environ.get("SELISE_API_BASE_URL", "https://api.seliseblocks.com").rstrip("/")
+
+# API Configuration
+API_CONFIG = {
+    "LOGIN_URL": f"{API_BASE_URL}/authentication/v1/OAuth/Token",
+    "CREATE_URL": f"{API_BASE_URL}/identifier/v1/Project/Create",
+    "GET_PROJECTS_URL": f"{API_BASE_URL}/identifier/v1/Project/Gets",
+    "GET_ITEM_URL": f"{API_BASE_URL}/identifier/v1/Project/Get",
+    "CREATE_SCHEMA_URL": f"{API_BASE_URL}/graphql/v1/schemas/info",
+    "LIST_SCHEMAS_URL": f"{API_BASE_URL}/graphql/v1/schemas",
+    "SCHEMA_FIELDS_URL": f"{API_BASE_URL}/graphql/v1/schemas/fields",
+    "GET_SCHEMA_URL": f"{API_BASE_URL}/graphql/v1/schemas",
+    "UPDATE_CONFIG_URL": f"{API_BASE_URL}/authentication/v1/Configuration/Update",
+    "GET_CONFIG_URL": f"{API_BASE_URL}/authentication/v1/Configuration/Get",
+    "CAPTCHA_SAVE_URL": f"{API_BASE_URL}/captcha/v1/Configuration/Save",
+    "CAPTCHA_LIST_URL": f"{API_BASE_URL}/captcha/v1/Configuration/Gets",
+    "CAPTCHA_UPDATE_STATUS_URL": f"{API_BASE_URL}/captcha/v1/Configuration/UpdateStatus",
+    "IAM_GET_ROLES_URL": f"{API_BASE_URL}/iam/v1/Resource/GetRoles",
+    "IAM_CREATE_ROLE_URL": f"{API_BASE_URL}/iam/v1/Resource/CreateRole",
+    "IAM_GET_PERMISSIONS_URL": f"{API_BASE_URL}/iam/v1/Resource/GetPermissions",
+    "IAM_CREATE_PERMISSION_URL": f"{API_BASE_URL}/iam/v1/Resource/CreatePermission",
+    "IAM_UPDATE_PERMISSION_URL": f"{API_BASE_URL}/iam/v1/Resource/UpdatePermission",
+    "IAM_GET_RESOURCE_GROUPS_URL": f"{API_BASE_URL}/iam/v1/Resource/GetResourceGroups",
+    "IAM_SET_ROLES_URL": f"{API_BASE_URL}/iam/v1/Resource/SetRoles",
+    "DATA_GATEWAY_URL": f"{API_BASE_URL}/graphql/v1/configurations",
+    "SAVE_SSO_URL": f"{API_BASE_URL}/authentication/v1/Social/SaveSsoCredential",
+    "MFA_SAVE_URL": f"{API_BASE_URL}/mfa/v1/Configuration/Save",
+    "GITHUB_REPOS_URL": f"{API_BASE_URL}/cloudbuild/v1/github/repos",
+    "RUN_BUILD_URL": f"{API_BASE_URL}/cloudbuild/v1/build/run-build",
+    "HEADERS": {
+        "x-blocks-key": "d7e5554c758541db8a18694b64ef423d",
+        "Origin": "https://cloud.seliseblocks.com",
+        "Referer": "https://cloud.seliseblocks.com/",
+        "accept": "application/json",
+        "accept-language": "en-US,en;q=0.9",
+        "content-type": "application/json",
+        "dnt": "1",
+        "priority": "u=1, i",
+        "sec-ch-ua": '"Chromium";v="139", "Not;A=Brand";v="99"',
+        "sec-ch-ua-mobile": "?1",
+        "sec-ch-ua-platform": '"Android"',
+        "sec-fetch-dest": "empty",
+        "sec-fetch-mode": "cors",
+        "sec-fetch-site": "same-site",
+        "user-agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Mobile Safari/537.36"
+    }
+}
+
+# Structured logging: JSON lines written by a background thread (QueueHandler/QueueListener),
+# so logging never blocks the event loop and never touches stdout, which stdio MCP uses
+LOG_CONFIG = {
+    "level": os.environ.get("SELISE_LOG_LEVEL", "INFO").upper(),
+    "file": os.environ.get("SELISE_LOG_FILE", ""),
+    # Fraction of DEBUG events (e.g. one per upstream request) that are kept
+    "debug_sample_rate": float(os.environ.get("SELISE_LOG_DEBUG_SAMPLE_RATE", "1.0"))
+}
+
+logger = logging.getLogger("selise_mcp")
+
+# Request ID and tool name of the tool call in progress, added to every log line it produces
+log_context: ContextVar[Optional[dict]] = ContextVar("log_context", default=None)
+
+log_state = {
+    "listener": None
+}
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Formats a log record as one JSON object per line."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "event": record.getMessage()
+        }
+        for key in ("request_id", "tool"):
+            value = getattr(record, key, None)
+            if value:
+                entry[key] = value
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class LogContextFilter(logging.Filter):
+    """Adds the current tool call's context to a record and samples DEBUG records."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno <= logging.DEBUG and random.random() >= LOG_CONFIG["debug_sample_rate"]:
+            return False
+        context = log_context.get()
+        if context:
+            record.request_id = context["request_id"]
+            record.tool = context["tool"]
+        return True
+
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """Queues records for the listener thread, leaving JSON formatting to that thread."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging() -> None:
+    """Route the server logger through a queue to stderr or SELISE_LOG_FILE."""
+    if log_state["listener"] is not None:
+        return
+    
+    if LOG_CONFIG["file"]:
+        target = logging.FileHandler(LOG_CONFIG["file"], encoding="utf-8")
+    else:
+        target = logging.StreamHandler(sys.stderr)
+    target.setFormatter(JsonLogFormatter())
+    
+    log_queue = queue.SimpleQueue()
+    handler = LogQueueHandler(log_queue)
+    handler.addFilter(LogContextFilter())
+    logger.addHandler(handler)
+    logger.setLevel(getattr(logging, LOG_CONFIG["level"], logging.INFO))
+    logger.propagate = False
+    
+    listener = logging.handlers.QueueListener(log_queue, target)
+    listener.start()
+    log_state["listener"] = listener
+    # Drain the queue on interpreter exit
+    atexit.register(listener.stop)
+
+
+def log_event(level: int, event: str, **fields: Any) -> None:
+    """Log a structured event; fields become top-level keys of the JSON line."""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"fields": fields})
+
+
+configure_logging()
+
+# HTTP connection pool configuration (overridable through environment variables)
+HTTP_CONFIG = {
+    "timeout": float(os.environ.get("SELISE_HTTP_TIMEOUT", "30")),
+    "max_connections": int(os.environ.get("SELISE_HTTP_MAX_CONNECTIONS", "20")),
+    "max_keepalive_connections": int(os.environ.get("SELISE_HTTP_MAX_KEEPALIVE", "10")),
+    "keepalive_expiry": float(os.environ.get("SELISE_HTTP_KEEPALIVE_EXPIRY", "60")),
+    "max_connections_per_host": int(os.environ.get("SELISE_HTTP_MAX_PER_HOST", "10")),
+    "http2": os.environ.get("SELISE_HTTP2", "").lower() in ("1", "true", "yes"),
+    "fanout_limit": int(os.environ.get("SELISE_FANOUT_LIMIT", "8")),
+    "all_pages_page_size": int(os.environ.get("SELISE_ALL_PAGES_PAGE_SIZE", "100")),
+    "all_pages_max_pages": int(os.environ.get("SELISE_ALL_PAGES_MAX_PAGES", "200"))
+}
+
+# Shared HTTP client state
+http_state = {
+    "client": None,
+    "host_limits": {},
+    "http2": False
+}
+
+
+def http2_available() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+# Record/replay of Selise API traffic: SELISE_HTTP_RECORD writes every exchange to a cassette
+# (JSON lines, gzip-compressed when the path ends in .gz) and SELISE_HTTP_REPLAY serves a
+# cassette back without the network. Credentials and secrets are scrubbed before writing.
+CASSETTE_CONFIG = {
+    "record": os.environ.get("SELISE_HTTP_RECORD", ""),
+    "replay": os.environ.get("SELISE_HTTP_REPLAY", ""),
+    # 0 replays instantly, 1 at recorded timing, 2 at twice the recorded speed, ...
+    "replay_speed": float(os.environ.get("SELISE_HTTP_REPLAY_SPEED", "0"))
+}
+
+CASSETTE_VERSION = 1
+REDACTED = "[REDACTED]"
+
+# Keys whose values never reach a cassette (compared lowercase, ignoring "_" and "-")
+SCRUBBED_KEYS = {
+    "accesstoken", "refreshtoken", "idtoken", "token", "password", "username", "email",
+    "clientsecret", "captchasecret", "secret", "secretkey", "apikey", "authorization", "cookie"
+}
+JWT_PATTERN = re.compile(r"eyJ[\w-]+\.[\w-]+\.[\w-]+")
+
+# Response headers worth keeping; everything else (cookies, tracing IDs, ...) is dropped
+CASSETTE_RESPONSE_HEADERS = ("content-type", "retry-after")
+
+
+class CassetteMiss(httpx.TransportError):
+    """Raised in replay mode when the cassette has no response for a request."""
+
+
+def scrub_value(value: Any) -> Any:
+    """Redact secret keys and embedded JWTs in a parsed JSON value."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key.replace("_", "").replace("-", "").lower() in SCRUBBED_KEYS and value[key] else scrub_value(value[key])
+            for key in value
+        }
+    if isinstance(value, list):
+        return [scrub_value(item) for item in value]
+    if isinstance(value, str):
+        return JWT_PATTERN.sub(REDACTED, value)
+    return value
+
+
+def scrub_body(content: bytes, content_type: str) -> Optional[str]:
+    """Return a request or response body as scrubbed text (None when empty)."""
+    if not content:
+        return None
+    text = content.decode("utf-8", errors="replace")
+    if "json" in content_type:
+        try:
+            return json.dumps(scrub_value(json.loads(text)), separators=(",", ":"), sort_keys=True)
+        except ValueError:
+            pass
+    if "x-www-form-urlencoded" in content_type:
+        return str(httpx.QueryParams(scrub_value(dict(httpx.QueryParams(text)))))
+    return JWT_PATTERN.sub(REDACTED, text)
+
+
+def api_path(url: Any) -> str:
+    """Return a URL's path below API_BASE_URL, so cassettes replay against any base URL."""
+    path = httpx.URL(url).path
+    base_path = httpx.URL(API_BASE_URL).path.rstrip("/")
+    if base_path and path.startswith(base_path + "/"):
+        path = path[len(base_path):]
+    return path
+
+
+def cassette_key(request: httpx.Request) -> Tuple[str, str, str, Optional[str]]:
+    """Identify a request by method, API path, scrubbed query and scrubbed body."""
+    query = httpx.QueryParams(scrub_value(dict(request.url.params)))
+    body = scrub_body(request.content, request.headers.get("content-type", ""))
+    return (request.method, api_path(request.url), str(query), body)
+
+
+def open_cassette(path: str, mode: str):
+    """Open a cassette file as text, transparently gzip-compressed for .gz paths."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def load_cassette(path: str) -> list:
+    """Read the recorded exchanges from a cassette file."""
+    with open_cassette(path, "r") as cassette:
+        lines = [json.loads(line) for line in cassette if line.strip()]
+    return [line for line in lines if "method" in line]
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forwards requests to a real transport and appends each scrubbed exchange to a cassette."""
+    
+    def __init__(self, transport: httpx.AsyncBaseTransport, path: str):
+        self.transport = transport
+        self.path = path
+        self.started_at = time.monotonic()
+        with open_cassette(path, "a") as cassette:
+            cassette.write(json.dumps({"cassette": CASSETTE_VERSION, "recorded_at": datetime.now(timezone.utc).isoformat()}) + "\n")
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        offset = time.monotonic() - self.started_at
+        response = await self.transport.handle_async_request(request)
+        raw = await response.aread()
+        elapsed = time.monotonic() - self.started_at - offset
+        
+        # Store the decoded body; the client still receives the original (possibly compressed) bytes
+        decoded = httpx.Response(response.status_code, headers=response.headers, content=raw).content
+        method, path, query, body = cassette_key(request)
+        exchange = {
+            "offset": round(offset, 4),
+            "elapsed": round(elapsed, 4),
+            "method": method,
+            "path": path,
+            "query": query,
+            "body": body,
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in CASSETTE_RESPONSE_HEADERS if name in response.headers},
+            "response": scrub_body(decoded, response.headers.get("content-type", ""))
+        }
+        with open_cassette(self.path, "a") as cassette:
+            cassette.write(json.dumps(exchange, separators=(",", ":")) + "\n")
+        
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=httpx.ByteStream(raw),
+            extensions=response.extensions
+        )
+    
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serves responses from a cassette instead of the network.
+    
+    Requests are matched on method, path, query and body; identical requests are answered
+    in recorded order, and the last answer is repeated once they run out. A request with
+    no exact match falls back to a recorded request with the same method, path and query.
+    
+    At speed > 0 the recorded timing is reproduced (scaled by speed): a response is not sent
+    before its request's recorded offset from the start of the session plus its recorded latency.
+    """
+    
+    def __init__(self, exchanges: list, speed: float = 0.0):
+        self.speed = speed
+        self.started_at = time.monotonic()
+        self.exact = {}
+        self.loose = {}
+        for exchange in exchanges:
+            key = (exchange["method"], exchange["path"], exchange["query"])
+            self.exact.setdefault(key + (exchange["body"],), []).append(exchange)
+            self.loose.setdefault(key, []).append(exchange)
+        self.served = {}
+    
+    def next_exchange(self, key: tuple, candidates: dict) -> Optional[dict]:
+        recorded = candidates.get(key)
+        if not recorded:
+            return None
+        index = self.served.get(key, 0)
+        self.served[key] = index + 1
+        return recorded[min(index, len(recorded) - 1)]
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        key = cassette_key(request)
+        exchange = self.next_exchange(key, self.exact) or self.next_exchange(key[:3], self.loose)
+        if exchange is None:
+            raise CassetteMiss(f"No recorded response for {request.method} {key[1]}", request=request)
+        
+        if self.speed > 0:
+            # Wait out the recorded gap since the session started, then the recorded latency
+            gap = self.started_at + exchange["offset"] / self.speed - time.monotonic()
+            await asyncio.sleep(max(0.0, gap) + exchange["elapsed"] / self.speed)
+        
+        content = exchange["response"].encode("utf-8") if exchange["response"] is not None else b""
+        return httpx.Response(exchange["status"], headers=exchange["headers"], content=content)
+
+
+def create_http_client(http2: Optional[bool] = None) -> httpx.AsyncClient:
+    """
+    Create the pooled HTTP client used for all Selise API calls.
+    
+    Args:
+        http2: Negotiate HTTP/2 when the server supports it. Uses HTTP_CONFIG["http2"] if not provided.
+               Falls back to HTTP/1.1 when the h2 package is not installed.
+    
+    Returns:
+        A configured httpx.AsyncClient (recording or replaying a cassette if configured)
+    """
+    if http2 is None:
+        http2 = HTTP_CONFIG["http2"]
+    if http2 and not http2_available():
+        log_event(
+            logging.WARNING,
+            "http2_unavailable",
+            message="HTTP/2 requested but the 'h2' package is not installed; falling back to HTTP/1.1. "
+                    "Install it with: pip install 'httpx[http2]'"
+        )
+        http2 = False
+    
+    if CASSETTE_CONFIG["replay"]:
+        http_state["http2"] = False
+        transport = ReplayTransport(load_cassette(CASSETTE_CONFIG["replay"]), CASSETTE_CONFIG["replay_speed"])
+        return httpx.AsyncClient(transport=transport, timeout=HTTP_CONFIG["timeout"])
+    
+    limits = httpx.Limits(
+        max_connections=HTTP_CONFIG["max_connections"],
+        max_keepalive_connections=HTTP_CONFIG["max_keepalive_connections"],
+        keepalive_expiry=HTTP_CONFIG["keepalive_expiry"]
+    )
+    http_state["http2"] = http2
+    if CASSETTE_CONFIG["record"]:
+        transport = RecordingTransport(httpx.AsyncHTTPTransport(limits=limits, http2=http2), CASSETTE_CONFIG["record"])
+        return httpx.AsyncClient(transport=transport, timeout=HTTP_CONFIG["timeout"])
+    return httpx.AsyncClient(limits=limits, timeout=HTTP_CONFIG["timeout"], http2=http2)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    client = http_state["client"]
+    if client is None or client.is_closed:
+        client = create_http_client()
+        http_state["client"] = client
+        http_state["host_limits"] = {}
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release pooled connections."""
+    client = http_state["client"]
+    http_state["client"] = None
+    http_state["host_limits"] = {}
+    # Locks bind to the running event loop, so start fresh ones for the next server run
+    for bucket in rate_limit_state["buckets"].values():
+        bucket["lock"] = asyncio.Lock()
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+# Latency/size metrics per tool and per upstream endpoint, exposed by get_server_metrics and,
+# optionally, as Prometheus text written to a file or served on a local port
+METRICS_CONFIG = {
+    "file": os.environ.get("SELISE_METRICS_FILE", ""),
+    "file_interval": float(os.environ.get("SELISE_METRICS_FILE_INTERVAL", "15")),
+    "port": int(os.environ.get("SELISE_METRICS_PORT", "0")),
+    "host": os.environ.get("SELISE_METRICS_HOST", "127.0.0.1")
+}
+
+# Histogram bucket upper bounds in seconds (Prometheus-style, cumulative when exported)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+metrics_state = {
+    "started_at": time.monotonic(),
+    "tools": {},
+    "endpoints": {},
+    "cache": {},
+    "exporters": []
+}
+
+
+def new_histogram() -> dict:
+    """Create an empty latency histogram."""
+    return {"count": 0, "sum": 0.0, "max": 0.0, "buckets": [0] * (len(LATENCY_BUCKETS) + 1)}
+
+
+def observe_latency(histogram: dict, seconds: float) -> None:
+    """Add one observation to a latency histogram."""
+    histogram["count"] += 1
+    histogram["sum"] += seconds
+    histogram["max"] = max(histogram["max"], seconds)
+    for index, bound in enumerate(LATENCY_BUCKETS):
+        if seconds <= bound:
+            histogram["buckets"][index] += 1
+            return
+    histogram["buckets"][-1] += 1
+
+
+def histogram_quantile(histogram: dict, quantile: float) -> Optional[float]:
+    """Estimate a quantile from a histogram by interpolating within the matching bucket."""
+    if not histogram["count"]:
+        return None
+    rank = quantile * histogram["count"]
+    seen = 0
+    lower = 0.0
+    for index, count in enumerate(histogram["buckets"]):
+        upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else histogram["max"]
+        if count and seen + count >= rank:
+            return min(histogram["max"], lower + (upper - lower) * (rank - seen) / count)
+        seen += count
+        lower = upper
+    return histogram["max"]
+
+
+def summarize_histogram(histogram: dict) -> dict:
+    """Summarize a histogram as count, mean, p50/p95/p99 and max in milliseconds."""
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 2) if value is not None else None
+    
+    return {
+        "count": histogram["count"],
+        "mean_ms": ms(histogram["sum"] / histogram["count"]) if histogram["count"] else None,
+        "p50_ms": ms(histogram_quantile(histogram, 0.50)),
+        "p95_ms": ms(histogram_quantile(histogram, 0.95)),
+        "p99_ms": ms(histogram_quantile(histogram, 0.99)),
+        "max_ms": ms(histogram["max"]) if histogram["count"] else None
+    }
+
+
+def endpoint_name(method: str, url: str) -> str:
+    """Name an upstream request after its API_CONFIG entry, so IDs in paths do not multiply endpoints."""
+    base = url.split("?", 1)[0]
+    best = None
+    for key, value in API_CONFIG.items():
+        if not isinstance(value, str):
+            continue
+        if base == value:
+            return f"{method.upper()} {key}"
+        if base.startswith(value + "/") and (best is None or len(value) >= len(API_CONFIG[best])):
+            best = key
+    if best is not None:
+        return f"{method.upper()} {best}/{{id}}"
+    return f"{method.upper()} {httpx.URL(base).path}"
+
+
+def get_endpoint_metrics(method: str, url: str) -> dict:
+    """Get or create the metrics record for an upstream endpoint."""
+    name = endpoint_name(method, url)
+    endpoint = metrics_state["endpoints"].get(name)
+    if endpoint is None:
+        endpoint = {
+            "requests": 0,
+            "errors": 0,
+            "retries": 0,
+            "request_bytes": 0,
+            "response_bytes": 0,
+            "status_codes": {},
+            "latency": new_histogram()
+        }
+        metrics_state["endpoints"][name] = endpoint
+    return endpoint
+
+
+def record_upstream_request(method: str, url: str, seconds: float, response: Optional[httpx.Response], error: str = "") -> None:
+    """Record one upstream request attempt (response is None and error is set for transport errors)."""
+    endpoint = get_endpoint_metrics(method, url)
+    endpoint["requests"] += 1
+    observe_latency(endpoint["latency"], seconds)
+    if response is None:
+        endpoint["errors"] += 1
+        log_event(logging.WARNING, "upstream_error", endpoint=endpoint_name(method, url), latency_ms=round(seconds * 1000, 1), error=error)
+    else:
+        status = str(response.status_code)
+        request_bytes = len(response.request.content) if response.request is not None else 0
+        endpoint["status_codes"][status] = endpoint["status_codes"].get(status, 0) + 1
+        endpoint["request_bytes"] += request_bytes
+        endpoint["response_bytes"] += len(response.content)
+        log_event(
+            logging.DEBUG,
+            "upstream_request",
+            endpoint=endpoint_name(method, url),
+            status=response.status_code,
+            latency_ms=round(seconds * 1000, 1),
+            request_bytes=request_bytes,
+            response_bytes=len(response.content)
+        )
+    
+    stats = tool_call_stats.get()
+    if stats is not None:
+        stats["upstream_requests"] += 1
+        stats["upstream_seconds"] += seconds
+
+
+def record_cache_lookup(endpoint: str, hit: bool) -> None:
+    """Count a response cache hit or miss against its cache endpoint and the current tool call."""
+    counts = metrics_state["cache"].setdefault(endpoint, {"hits": 0, "misses": 0})
+    counts["hits" if hit else "misses"] += 1
+    count_tool_stat("cache_hits" if hit else "cache_misses")
+
+
+def record_tool_call(name: str, seconds: float, stats: dict, result: Any, failed: bool) -> int:
+    """Fold one finished tool call into the per-tool metrics and return its response size in bytes."""
+    tool = metrics_state["tools"].get(name)
+    if tool is None:
+        tool = {
+            "calls": 0,
+            "errors": 0,
+            "response_bytes": 0,
+            "upstream_requests": 0,
+            "upstream_seconds": 0.0,
+            "serialize_seconds": 0.0,
+            "retries": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "latency": new_histogram()
+        }
+        metrics_state["tools"][name] = tool
+    
+    tool["calls"] += 1
+    observe_latency(tool["latency"], seconds)
+    for key in ("upstream_requests", "upstream_seconds", "serialize_seconds", "retries", "cache_hits", "cache_misses"):
+        tool[key] += stats[key]
+    
+    text = "".join(getattr(block, "text", "") for block in getattr(result, "content", None) or [])
+    response_bytes = len(text.encode("utf-8"))
+    tool["response_bytes"] += response_bytes
+    # Tools report most failures as a {"status": "error"} result rather than raising
+    if failed or stats["errors"]:
+        tool["errors"] += 1
+    return response_bytes
+
+
+def reset_metrics() -> None:
+    """Clear the per-tool, per-endpoint and per-cache-endpoint metrics."""
+    metrics_state["started_at"] = time.monotonic()
+    metrics_state["tools"] = {}
+    metrics_state["endpoints"] = {}
+    metrics_state["cache"] = {}
+
+
+def get_metrics_snapshot() -> dict:
+    """Build the metrics report returned by get_server_metrics."""
+    tools = {}
+    for name, tool in sorted(metrics_state["tools"].items()):
+        tools[name] = {
+            **{key: value for key, value in tool.items() if key != "latency"},
+            "upstream_seconds": round(tool["upstream_seconds"], 3),
+            "serialize_seconds": round(tool["serialize_seconds"], 3),
+            "latency": summarize_histogram(tool["latency"])
+        }
+    
+    endpoints = {}
+    for name, endpoint in sorted(metrics_state["endpoints"].items()):
+        endpoints[name] = {
+            **{key: value for key, value in endpoint.items() if key != "latency"},
+            "latency": summarize_histogram(endpoint["latency"])
+        }
+    
+    return {
+        "uptime_seconds": round(time.monotonic() - metrics_state["started_at"], 1),
+        "tools": tools,
+        "upstream": endpoints,
+        "cache": {
+            "hits": cache_state["hits"],
+            "misses": cache_state["misses"],
+            "by_endpoint": dict(sorted(metrics_state["cache"].items()))
+        }
+    }
+
+
+def render_prometheus_metrics() -> str:
+    """Render the metrics in the Prometheus text exposition format."""
+    def label(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"')
+    
+    def histogram_lines(metric: str, labels: str, histogram: dict) -> list:
+        lines = []
+        cumulative = 0
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            cumulative += histogram["buckets"][index]
+            lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram["count"]}')
+        lines.append(f"{metric}_sum{{{labels}}} {histogram['sum']}")
+        lines.append(f"{metric}_count{{{labels}}} {histogram['count']}")
+        return lines
+    
+    lines = [
+        "# HELP selise_mcp_tool_duration_seconds Tool call latency",
+        "# TYPE selise_mcp_tool_duration_seconds histogram"
+    ]
+    for name, tool in sorted(metrics_state["tools"].items()):
+        lines.extend(histogram_lines("selise_mcp_tool_duration_seconds", f'tool="{label(name)}"', tool["latency"]))
+    
+    tool_counters = (
+        ("errors", "Tool calls that returned an error"),
+        ("response_bytes", "Bytes returned to the MCP client"),
+        ("upstream_requests", "Upstream requests made by tool calls"),
+        ("upstream_seconds", "Time tool calls spent waiting on upstream requests"),
+        ("serialize_seconds", "Time tool calls spent serializing results"),
+        ("retries", "Upstream retries made by tool calls"),
+        ("cache_hits", "Response cache hits during tool calls"),
+        ("cache_misses", "Response cache misses during tool calls")
+    )
+    for key, help_text in tool_counters:
+        metric = f"selise_mcp_tool_{key}_total"
+        lines.extend([f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"])
+        for name, tool in sorted(metrics_state["tools"].items()):
+            lines.append(f'{metric}{{tool="{label(name)}"}} {tool[key]}')
+    
+    lines.extend([
+        "# HELP selise_mcp_upstream_duration_seconds Upstream request latency",
+        "# TYPE selise_mcp_upstream_duration_seconds histogram"
+    ])
+    for name, endpoint in sorted(metrics_state["endpoints"].items()):
+        lines.extend(histogram_lines("selise_mcp_upstream_duration_seconds", f'endpoint="{label(name)}"', endpoint["latency"]))
+    
+    lines.extend([
+        "# HELP selise_mcp_upstream_responses_total Upstream responses by status code",
+        "# TYPE selise_mcp_upstream_responses_total counter"
+    ])
+    for name, endpoint in sorted(metrics_state["endpoints"].items()):
+        for status, count in sorted(endpoint["status_codes"].items()):
+            lines.append(f'selise_mcp_upstream_responses_total{{endpoint="{label(name)}",code="{status}"}} {count}')
+    
+    endpoint_counters = (
+        ("errors", "Upstream requests that failed without a response"),
+        ("retries", "Upstream retries"),
+        ("request_bytes", "Bytes sent upstream"),
+        ("response_bytes", "Bytes received from upstream")
+    )
+    for key, help_text in endpoint_counters:
+        metric = f"selise_mcp_upstream_{key}_total"
+        lines.extend([f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"])
+        for name, endpoint in sorted(metrics_state["endpoints"].items()):
+            lines.append(f'{metric}{{endpoint="{label(name)}"}} {endpoint[key]}')
+    
+    lines.extend([
+        "# HELP selise_mcp_cache_requests_total Response cache lookups",
+        "# TYPE selise_mcp_cache_requests_total counter"
+    ])
+    for name, counts in sorted(metrics_state["cache"].items()):
+        lines.append(f'selise_mcp_cache_requests_total{{endpoint="{label(name)}",result="hit"}} {counts["hits"]}')
+        lines.append(f'selise_mcp_cache_requests_total{{endpoint="{label(name)}",result="miss"}} {counts["misses"]}')
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file() -> None:
+    """Write the Prometheus text dump to SELISE_METRICS_FILE atomically."""
+    path = METRICS_CONFIG["file"]
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as metrics_file:
+        metrics_file.write(render_prometheus_metrics())
+    os.replace(temp_path, path)
+
+
+async def write_metrics_file_periodically() -> None:
+    """Refresh the metrics file every file_interval seconds until cancelled."""
+    while True:
+        try:
+            write_metrics_file()
+        except Exception as e:
+            log_event(logging.ERROR, "metrics_file_error", path=METRICS_CONFIG["file"], error=str(e))
+        await asyncio.sleep(METRICS_CONFIG["file_interval"])
+
+
+async def serve_metrics_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer any HTTP request on the metrics port with the Prometheus text dump."""
+    try:
+        await reader.readuntil(b"\r\n\r\n")
+        body = render_prometheus_metrics().encode("utf-8")
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            + f"Content-Length: {len(body)}\r\n".encode("ascii")
+            + b"Connection: close\r\n\r\n"
+            + body
+        )
+        await writer.drain()
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_metrics_exporters() -> None:
+    """Start the optional metrics file writer and metrics port."""
+    if METRICS_CONFIG["file"]:
+        metrics_state["exporters"].append(asyncio.ensure_future(write_metrics_file_periodically()))
+    if METRICS_CONFIG["port"]:
+        server = await asyncio.start_server(serve_metrics_request, METRICS_CONFIG["host"], METRICS_CONFIG["port"])
+        metrics_state["exporters"].append(server)
+
+
+async def stop_metrics_exporters() -> None:
+    """Stop the metrics exporters, writing the metrics file one last time."""
+    for exporter in metrics_state["exporters"]:
+        if isinstance(exporter, asyncio.Task):
+            exporter.cancel()
+        else:
+            exporter.close()
+            await exporter.wait_closed()
+    metrics_state["exporters"] = []
+    if METRICS_CONFIG["file"]:
+        try:
+            write_metrics_file()
+        except Exception as e:
+            log_event(logging.ERROR, "metrics_file_error", path=METRICS_CONFIG["file"], error=str(e))
+
+
+# Client-side rate limits per Selise service (first URL path segment, e.g. "iam"); opt-in with SELISE_RATE_LIMIT
+RATE_LIMIT_SERVICES = ("identifier", "graphql", "iam", "captcha", "mfa", "cloudbuild", "authentication")
+
+
+def parse_rate_limit(value: str) -> dict:
+    """Parse a "rate/burst" setting such as "5/10" (requests per second / bucket size)."""
+    rate, _, burst = value.partition("/")
+    return {"rate": float(rate), "burst": float(burst or rate)}
+
+
+RATE_LIMIT_CONFIG = {
+    "enabled": os.environ.get("SELISE_RATE_LIMIT", "").lower() in ("1", "true", "yes"),
+    "default": parse_rate_limit(os.environ.get("SELISE_RATE_LIMIT_DEFAULT", "10/20")),
+    "services": {
+        service: parse_rate_limit(os.environ[f"SELISE_RATE_LIMIT_{service.upper()}"])
+        for service in RATE_LIMIT_SERVICES
+        if os.environ.get(f"SELISE_RATE_LIMIT_{service.upper()}")
+    }
+}
+
+rate_limit_state = {
+    "buckets": {}
+}
+
+
+def service_for_url(url: str) -> str:
+    """Return the Selise service a URL belongs to (its first path segment below API_BASE_URL)."""
+    return api_path(url).strip("/").split("/", 1)[0]
+
+
+def get_rate_bucket(service: str) -> dict:
+    """Get or create the token bucket for a service."""
+    bucket = rate_limit_state["buckets"].get(service)
+    if bucket is None:
+        limits = RATE_LIMIT_CONFIG["services"].get(service, RATE_LIMIT_CONFIG["default"])
+        bucket = {
+            "rate": limits["rate"],
+            "burst": limits["burst"],
+            "tokens": limits["burst"],
+            "updated_at": time.monotonic(),
+            "lock": asyncio.Lock(),
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+            "requests": 0,
+            "delayed": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0
+        }
+        rate_limit_state["buckets"][service] = bucket
+    return bucket
+
+
+async def acquire_rate_limit(url: str) -> float:
+    """
+    Wait for a token from the service's bucket. Callers queue in arrival order instead of failing.
+    
+    Args:
+        url: Request URL, used to pick the service bucket
+    
+    Returns:
+        Seconds spent waiting
+    """
+    if not RATE_LIMIT_CONFIG["enabled"]:
+        return 0.0
+    
+    bucket = get_rate_bucket(service_for_url(url))
+    bucket["queue_depth"] += 1
+    bucket["max_queue_depth"] = max(bucket["max_queue_depth"], bucket["queue_depth"])
+    started_at = time.monotonic()
+    try:
+        # The lock is FIFO, so waiting callers take tokens in the order they arrived
+        async with bucket["lock"]:
+            while True:
+                now = time.monotonic()
+                bucket["tokens"] = min(bucket["burst"], bucket["tokens"] + (now - bucket["updated_at"]) * bucket["rate"])
+                bucket["updated_at"] = now
+                if bucket["tokens"] >= 1:
+                    bucket["tokens"] -= 1
+                    break
+                await asyncio.sleep((1 - bucket["tokens"]) / bucket["rate"])
+    finally:
+        bucket["queue_depth"] -= 1
+    
+    waited = time.monotonic() - started_at
+    bucket["requests"] += 1
+    if waited > 0.001:
+        bucket["delayed"] += 1
+        bucket["wait_seconds"] += waited
+        bucket["max_wait_seconds"] = max(bucket["max_wait_seconds"], waited)
+    return waited
+
+
+# Circuit breaker per Selise service: fail fast while a service is down
+CIRCUIT_CONFIG = {
+    "enabled": os.environ.get("SELISE_CIRCUIT_BREAKER", "1").lower() not in ("0", "false", "no"),
+    "failure_threshold": int(os.environ.get("SELISE_CIRCUIT_FAILURE_THRESHOLD", "5")),
+    "reset_timeout": float(os.environ.get("SELISE_CIRCUIT_RESET_TIMEOUT", "30"))
+}
+
+circuit_state = {
+    "circuits": {}
+}
+
+
+class CircuitOpenError(httpx.HTTPStatusError):
+    """Raised instead of sending a request while the target service's circuit is open."""
+
+
+def get_circuit(service: str) -> dict:
+    """Get or create the circuit breaker state for a service."""
+    circuit = circuit_state["circuits"].get(service)
+    if circuit is None:
+        circuit = {
+            "state": "closed",
+            "consecutive_failures": 0,
+            "opened_at": None,
+            "probe_in_flight": False,
+            "times_opened": 0,
+            "rejected": 0,
+            "last_failure": None
+        }
+        circuit_state["circuits"][service] = circuit
+    return circuit
+
+
+def check_circuit(method: str, url: str) -> None:
+    """
+    Let a request through, turn it into the half-open probe, or fail fast.
+    
+    Raises:
+        CircuitOpenError: If the service's circuit is open (or half-open with a probe in flight)
+    """
+    if not CIRCUIT_CONFIG["enabled"]:
+        return
+    
+    service = service_for_url(url)
+    circuit = get_circuit(service)
+    if circuit["state"] == "closed":
+        return
+    
+    retry_in = CIRCUIT_CONFIG["reset_timeout"] - (time.monotonic() - circuit["opened_at"])
+    if circuit["state"] == "open" and retry_in <= 0:
+        circuit["state"] = "half_open"
+    if circuit["state"] == "half_open" and not circuit["probe_in_flight"]:
+        circuit["probe_in_flight"] = True
+        return
+    
+    circuit["rejected"] += 1
+    request = httpx.Request(method, url)
+    response = httpx.Response(
+        503,
+        request=request,
+        json={
+            "error": "circuit_open",
+            "service": service,
+            "message": f"Selise service '{service}' is failing; requests are paused after {circuit['consecutive_failures']} consecutive failure(s)",
+            "last_failure": circuit["last_failure"],
+            "retry_in_seconds": round(max(0.0, retry_in), 1)
+        }
+    )
+    raise CircuitOpenError(f"Circuit open for Selise service '{service}'", request=request, response=response)
+
+
+def release_circuit_probe(url: str) -> None:
+    """Free a half-open probe slot without judging the service (the request never reached it)."""
+    circuit = circuit_state["circuits"].get(service_for_url(url))
+    if circuit is not None:
+        circuit["probe_in_flight"] = False
+
+
+def record_circuit_result(url: str, failure: Optional[str]) -> None:
+    """Record the outcome of a request; failure is a short description or None on success."""
+    if not CIRCUIT_CONFIG["enabled"]:
+        return
+    
+    circuit = get_circuit(service_for_url(url))
+    circuit["probe_in_flight"] = False
+    if failure is None:
+        circuit["state"] = "closed"
+        circuit["consecutive_failures"] = 0
+        circuit["opened_at"] = None
+        return
+    
+    circuit["consecutive_failures"] += 1
+    circuit["last_failure"] = failure
+    if circuit["state"] == "half_open" or circuit["consecutive_failures"] >= CIRCUIT_CONFIG["failure_threshold"]:
+        if circuit["state"] != "open":
+            circuit["times_opened"] += 1
+            log_event(logging.WARNING, "circuit_opened", service=service_for_url(url), failure=failure)
+        circuit["state"] = "open"
+        circuit["opened_at"] = time.monotonic()
+
+
+async def send_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a single request through the shared client.
+    
+    The request passes the service's circuit breaker and rate limit, then the per-host
+    connection cap. Transport errors and 5xx responses count as circuit failures; a replay
+    cassette miss does not.
+    """
+    check_circuit(method, url)
+    started_at = time.monotonic()
+    # Everything after check_circuit is guarded: it may have claimed the half-open probe slot
+    try:
+        await acquire_rate_limit(url)
+        client = get_http_client()
+        host = httpx.URL(url).host
+        host_limit = http_state["host_limits"].get(host)
+        if host_limit is None:
+            host_limit = asyncio.Semaphore(HTTP_CONFIG["max_connections_per_host"])
+            http_state["host_limits"][host] = host_limit
+        
+        async with host_limit:
+            started_at = time.monotonic()
+            response = await client.request(method, url, **kwargs)
+    except CassetteMiss:
+        # A gap in the cassette says nothing about the service
+        release_circuit_probe(url)
+        raise
+    except httpx.TransportError as e:
+        record_upstream_request(method, url, time.monotonic() - started_at, None, f"{type(e).__name__}: {e}")
+        record_circuit_result(url, f"{type(e).__name__}: {e}")
+        raise
+    except BaseException:
+        # Cancelled or failed before reaching the service
+        release_circuit_probe(url)
+        raise
+    
+    record_upstream_request(method, url, time.monotonic() - started_at, response)
+    record_circuit_result(url, f"HTTP {response.status_code}" if response.status_code >= 500 else None)
+    return response
+
+
+# Retry policy for idempotent upstream calls
+RETRY_CONFIG = {
+    "enabled": os.environ.get("SELISE_RETRY", "1").lower() not in ("0", "false", "no"),
+    "max_attempts": int(os.environ.get("SELISE_RETRY_MAX_ATTEMPTS", "4")),
+    "base_delay": float(os.environ.get("SELISE_RETRY_BASE_DELAY", "0.25")),
+    "max_delay": float(os.environ.get("SELISE_RETRY_MAX_DELAY", "8")),
+    "max_retry_after": float(os.environ.get("SELISE_RETRY_MAX_RETRY_AFTER", "30")),
+    # Every request deposits budget_ratio retry tokens (up to budget_max); every retry spends one
+    "budget_ratio": float(os.environ.get("SELISE_RETRY_BUDGET_RATIO", "0.2")),
+    "budget_max": float(os.environ.get("SELISE_RETRY_BUDGET_MAX", "10"))
+}
+
+RETRYABLE_STATUS_CODES = (429, 502, 503, 504)
+RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+retry_state = {
+    "budget": RETRY_CONFIG["budget_max"],
+    "retries": 0,
+    "retry_wait_seconds": 0.0,
+    "budget_exhausted": 0,
+    "tools": {}
+}
+
+# Per-tool-call counters, set by ToolCallMiddleware for the duration of one tool call
+tool_call_stats: ContextVar[Optional[dict]] = ContextVar("tool_call_stats", default=None)
+
+
+def new_tool_call_stats() -> dict:
+    """Counters collected while one tool call runs."""
+    return {
+        "retries": 0,
+        "retry_wait_seconds": 0.0,
+        "upstream_requests": 0,
+        "upstream_seconds": 0.0,
+        "serialize_seconds": 0.0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "errors": 0
+    }
+
+
+def count_tool_stat(key: str, amount: float = 1) -> None:
+    """Add to a counter of the tool call in progress, if any."""
+    stats = tool_call_stats.get()
+    if stats is not None:
+        stats[key] += amount
+
+
+def is_idempotent_request(method: str, url: str) -> bool:
+    """Return True for requests that are safe to send more than once."""
+    if method.upper() in ("GET", "HEAD", "OPTIONS"):
+        return True
+    # The IAM listings are POST queries that do not change anything
+    return url in (API_CONFIG["IAM_GET_ROLES_URL"], API_CONFIG["IAM_GET_PERMISSIONS_URL"])
+
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into a delay in seconds."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Capped exponential backoff with full jitter; Retry-After sets a floor."""
+    delay = random.uniform(0, min(RETRY_CONFIG["max_delay"], RETRY_CONFIG["base_delay"] * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def spend_retry_budget() -> bool:
+    """Take one retry token from the shared budget. Returns False once the budget is exhausted."""
+    if retry_state["budget"] < 1:
+        retry_state["budget_exhausted"] += 1
+        return False
+    retry_state["budget"] -= 1
+    return True
+
+
+def record_retry(method: str, url: str, delay: float) -> None:
+    """Count one retry globally, against its endpoint and against the current tool call."""
+    retry_state["retries"] += 1
+    get_endpoint_metrics(method, url)["retries"] += 1
+    retry_state["retry_wait_seconds"] += delay
+    log_event(logging.INFO, "upstream_retry", endpoint=endpoint_name(method, url), delay_ms=round(delay * 1000, 1))
+    stats = tool_call_stats.get()
+    if stats is not None:
+        stats["retries"] += 1
+        stats["retry_wait_seconds"] += delay
+
+
+async def send_with_retry(method: str, url: str, retry: Optional[bool] = None, **kwargs) -> httpx.Response:
+    """
+    Send a request, retrying transient failures of idempotent requests.
+    
+    Connect/read errors and 429/502/503/504 responses are retried with capped exponential
+    backoff and jitter, honoring Retry-After. Retries draw on a shared budget that is
+    refilled by ordinary requests, so a failing upstream cannot multiply our traffic.
+    
+    Args:
+        method: HTTP method
+        url: Absolute request URL
+        retry: Force retries on or off; by default only idempotent requests are retried
+        **kwargs: Extra arguments passed to httpx
+    
+    Returns:
+        The httpx response of the last attempt
+    """
+    if retry is None:
+        retry = is_idempotent_request(method, url)
+    retry = retry and RETRY_CONFIG["enabled"]
+    retry_state["budget"] = min(RETRY_CONFIG["budget_max"], retry_state["budget"] + RETRY_CONFIG["budget_ratio"])
+    
+    attempt = 0
+    while True:
+        try:
+            response = await send_request(method, url, **kwargs)
+        except RETRYABLE_ERRORS:
+            if not retry or attempt + 1 >= RETRY_CONFIG["max_attempts"] or not spend_retry_budget():
+                raise
+            delay = retry_delay(attempt)
+        else:
+            if not retry or response.status_code not in RETRYABLE_STATUS_CODES or attempt + 1 >= RETRY_CONFIG["max_attempts"]:
+                return response
+            retry_after = parse_retry_after(response)
+            if retry_after is not None and retry_after > RETRY_CONFIG["max_retry_after"]:
+                return response
+            if not spend_retry_budget():
+                return response
+            delay = retry_delay(attempt, retry_after)
+        
+        record_retry(method, url, delay)
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+async def api_request(method: str, url: str, refresh_on_401: bool = True, retry: Optional[bool] = None, **kwargs) -> httpx.Response:
+    """
+    Send a request to the Selise API through the shared HTTP client.
+    
+    Requests to the same host are capped at max_connections_per_host so one
+    busy service cannot take over the whole connection pool. A 401 on an
+    authenticated request triggers a token refresh and one retry. Transient
+    failures of idempotent requests are retried (see send_with_retry).
+    
+    Args:
+        method: HTTP method (GET, POST, ...)
+        url: Absolute request URL
+        refresh_on_401: Refresh the access token and retry once on a 401 (default: True)
+        retry: Force transient-failure retries on or off (default: only idempotent requests)
+        **kwargs: Extra arguments passed to httpx (headers, params, json, data, timeout)
+    
+    Returns:
+        The httpx response
+    """
+    sent_token = auth_state["access_token"]
+    response = await send_with_retry(method, url, retry=retry, **kwargs)
+    
+    headers = kwargs.get("headers") or {}
+    has_auth = any(key.lower() == "authorization" for key in headers)
+    if response.status_code == 401 and refresh_on_401 and has_auth:
+        # Another request may already have refreshed the token while this one was in flight
+        if auth_state["access_token"] != sent_token and is_token_valid():
+            refreshed = True
+        else:
+            refreshed = await refresh_access_token()
+        
+        if refreshed:
+            kwargs["headers"] = {
+                key: (f"Bearer {auth_state['access_token']}" if key.lower() == "authorization" else value)
+                for key, value in headers.items()
+            }
+            response = await send_with_retry(method, url, retry=retry, **kwargs)
+    
+    return response
+
+
+# Response cache for read-only endpoints: per-endpoint TTLs in seconds, LRU eviction and a memory cap
+CACHE_CONFIG = {
+    "enabled": os.environ.get("SELISE_CACHE", "1").lower() not in ("0", "false", "no"),
+    "max_entries": int(os.environ.get("SELISE_CACHE_MAX_ENTRIES", "512")),
+    "max_bytes": int(os.environ.get("SELISE_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+    "ttls": {
+        "list_schemas": 30,
+        "get_schema": 30,
+        "list_roles": 60,
+        "list_permissions": 60,
+        "get_role_permissions": 30,
+        "get_resource_groups": 120,
+        "get_authentication_config": 60,
+        "list_captcha_configs": 60,
+        "list_github_repos": 300
+    }
+}
+
+cache_state = {
+    "entries": OrderedDict(),
+    "bytes": 0,
+    "hits": 0,
+    "misses": 0,
+    "evictions": 0,
+    "invalidations": 0
+}
+
+# Identical concurrent reads share one upstream request (single-flight)
+coalesce_state = {
+    "in_flight": {},
+    "requests": 0,
+    "hits": 0,
+    "by_endpoint": {}
+}
+
+
+def make_cache_key(endpoint: str, project_key: str, cache_params: Optional[dict]) -> Tuple[str, str, str]:
+    """Build a cache key from the endpoint name, project key and request parameters."""
+    return (endpoint, project_key or "", json.dumps(cache_params or {}, sort_keys=True, default=str))
+
+
+def cache_get(key: Tuple[str, str, str]) -> Tuple[bool, Any]:
+    """Look up a cache entry, dropping it if expired. Returns (hit, data)."""
+    entry = cache_state["entries"].get(key)
+    if entry is None:
+        return False, None
+    
+    expires_at, data, size = entry
+    if time.monotonic() >= expires_at:
+        del cache_state["entries"][key]
+        cache_state["bytes"] -= size
+        return False, None
+    
+    cache_state["entries"].move_to_end(key)
+    return True, data
+
+
+def cache_put(key: Tuple[str, str, str], data: Any, size: int) -> None:
+    """Store a response in the cache, evicting least recently used entries to stay within limits."""
+    ttl = CACHE_CONFIG["ttls"].get(key[0], 0)
+    if not CACHE_CONFIG["enabled"] or ttl <= 0 or size > CACHE_CONFIG["max_bytes"]:
+        return
+    
+    previous = cache_state["entries"].pop(key, None)
+    if previous is not None:
+        cache_state["bytes"] -= previous[2]
+    
+    cache_state["entries"][key] = (time.monotonic() + ttl, data, size)
+    cache_state["bytes"] += size
+    
+    while cache_state["entries"] and (
+        len(cache_state["entries"]) > CACHE_CONFIG["max_entries"]
+        or cache_state["bytes"] > CACHE_CONFIG["max_bytes"]
+    ):
+        _, (_, _, evicted_size) = cache_state["entries"].popitem(last=False)
+        cache_state["bytes"] -= evicted_size
+        cache_state["evictions"] += 1
+
+
+def invalidate_cache(endpoint: Optional[str] = None, project_key: Optional[str] = None, match: Optional[dict] = None) -> int:
+    """
+    Drop cached responses after a write.
+    
+    Args:
+        endpoint: Only drop entries for this endpoint (all endpoints if None)
+        project_key: Only drop entries for this project (all projects if None)
+        match: Only drop entries whose request parameters contain these values
+    
+    Returns:
+        Number of entries removed
+    """
+    removed = 0
+    for key in list(cache_state["entries"]):
+        key_endpoint, key_project, key_params = key
+        if endpoint is not None and key_endpoint != endpoint:
+            continue
+        if project_key is not None and key_project != project_key:
+            continue
+        if match:
+            params = json.loads(key_params)
+            if any(params.get(name) != value for name, value in match.items()):
+                continue
+        _, _, size = cache_state["entries"].pop(key)
+        cache_state["bytes"] -= size
+        removed += 1
+    
+    cache_state["invalidations"] += removed
+    
+    # Reads already in flight may predate the write: later callers must not join them,
+    # and their results must not be cached
+    for flight_key in list(coalesce_state["in_flight"]):
+        key_endpoint, key_project, key_params = flight_key[2:]
+        if endpoint is not None and key_endpoint != endpoint:
+            continue
+        if project_key is not None and key_project != project_key:
+            continue
+        if match:
+            params = json.loads(key_params)
+            if any(params.get(name) != value for name, value in match.items()):
+                continue
+        del coalesce_state["in_flight"][flight_key]
+    
+    return removed
+
+
+async def fetch_json(
+    endpoint: str,
+    project_key: str,
+    method: str,
+    url: str,
+    cache_params: Optional[dict] = None,
+    bypass_cache: bool = False,
+    **kwargs
+) -> Any:
+    """
+    Fetch a read-only endpoint and return its parsed JSON, serving from the response cache when fresh.
+    
+    Args:
+        endpoint: Cache endpoint name (a key of CACHE_CONFIG["ttls"])
+        project_key: Project key the request is scoped to
+        method: HTTP method
+        url: Absolute request URL
+        cache_params: Request parameters that identify the response (query params or payload)
+        bypass_cache: Skip the cache lookup and fetch fresh data (the fresh result is still cached)
+        **kwargs: Extra arguments passed to api_request
+    
+    Returns:
+        Parsed JSON response. Cached and coalesced objects are shared, so callers must not modify them.
+    """
+    key = make_cache_key(endpoint, project_key, cache_params)
+    if CACHE_CONFIG["enabled"] and not bypass_cache:
+        hit, data = cache_get(key)
+        if hit:
+            cache_state["hits"] += 1
+            record_cache_lookup(endpoint, True)
+            return data
+    cache_state["misses"] += 1
+    record_cache_lookup(endpoint, False)
+    
+    # Join an identical request that is already in flight instead of sending another one
+    flight_key = (method.upper(), url) + key
+    endpoint_stats = coalesce_state["by_endpoint"].setdefault(endpoint, {"requests": 0, "hits": 0})
+    flight = coalesce_state["in_flight"].get(flight_key)
+    if flight is not None:
+        coalesce_state["hits"] += 1
+        endpoint_stats["hits"] += 1
+        return await asyncio.shield(flight)
+    
+    async def fetch_upstream() -> Any:
+        response = await api_request(method, url, **kwargs)
+        response.raise_for_status()
+        data = response.json()
+        # Skip caching if a write invalidated this request while it was in flight
+        if coalesce_state["in_flight"].get(flight_key) is asyncio.current_task():
+            cache_put(key, data, len(response.content))
+        return data
+    
+    def finish_flight(task: asyncio.Task) -> None:
+        if coalesce_state["in_flight"].get(flight_key) is task:
+            del coalesce_state["in_flight"][flight_key]
+        if not task.cancelled():
+            task.exception()  # Mark the error as retrieved even if every caller was cancelled
+    
+    coalesce_state["requests"] += 1
+    endpoint_stats["requests"] += 1
+    flight = asyncio.ensure_future(fetch_upstream())
+    coalesce_state["in_flight"][flight_key] = flight
+    flight.add_done_callback(finish_flight)
+    # Shield the shared request so one cancelled caller does not cancel it for the others
+    return await asyncio.shield(flight)
 
-# Global state for authentication
-auth_state = {
-    "access_token": None,
-    "refresh_token": None,
-    "expires_at": None,
-    "token_type": "bearer"
-}
 
-# Global state for application domain
-app_state = {
-    "application_domain": None,
-    "tenant_id": None,
-    "tenant_group_id": None,
-    "project_name": None
+# Post-write read-back: "full" re-reads the affected listing, "delta" returns only the locally
+# built change, "deferred" refreshes the listing in a background task and "none" skips it
+READBACK_CONFIG = {
+    "mode": os.environ.get("SELISE_READBACK_MODE", "full").lower()
 }
 
-# API Configuration
-API_CONFIG = {
-    "LOGIN_URL": "https://api.seliseblocks.com/authentication/v1/OAuth/Token",
-    "CREATE_URL": "https://api.seliseblocks.com/identifier/v1/Project/Create",
-    "GET_PROJECTS_URL": "https://api.seliseblocks.com/identifier/v1/Project/Gets",
-    "GET_ITEM_URL": "https://api.seliseblocks.com/identifier/v1/Project/Get",
-    "CREATE_SCHEMA_URL": "https://api.seliseblocks.com/graphql/v1/schemas/info",
-    "LIST_SCHEMAS_URL": "https://api.seliseblocks.com/graphql/v1/schemas",
-    "SCHEMA_FIELDS_URL": "https://api.seliseblocks.com/graphql/v1/schemas/fields",
-    "GET_SCHEMA_URL": "https://api.seliseblocks.com/graphql/v1/schemas",
-    "UPDATE_CONFIG_URL": "https://api.seliseblocks.com/authentication/v1/Configuration/Update",
-    "GET_CONFIG_URL": "https://api.seliseblocks.com/authentication/v1/Configuration/Get",
-    "CAPTCHA_SAVE_URL": "https://api.seliseblocks.com/captcha/v1/Configuration/Save",
-    "CAPTCHA_LIST_URL": "https://api.seliseblocks.com/captcha/v1/Configuration/Gets",
-    "CAPTCHA_UPDATE_STATUS_URL": "https://api.seliseblocks.com/captcha/v1/Configuration/UpdateStatus",
-    "IAM_GET_ROLES_URL": "https://api.seliseblocks.com/iam/v1/Resource/GetRoles",
-    "IAM_CREATE_ROLE_URL": "https://api.seliseblocks.com/iam/v1/Resource/CreateRole",
-    "IAM_GET_PERMISSIONS_URL": "https://api.seliseblocks.com/iam/v1/Resource/GetPermissions",
-    "IAM_CREATE_PERMISSION_URL": "https://api.seliseblocks.com/iam/v1/Resource/CreatePermission",
-    "IAM_UPDATE_PERMISSION_URL": "https://api.seliseblocks.com/iam/v1/Resource/UpdatePermission",
-    "IAM_GET_RESOURCE_GROUPS_URL": "https://api.seliseblocks.com/iam/v1/Resource/GetResourceGroups",
-    "IAM_SET_ROLES_URL": "https://api.seliseblocks.com/iam/v1/Resource/SetRoles",
-    "DATA_GATEWAY_URL": "https://api.seliseblocks.com/graphql/v1/configurations",
-    "SAVE_SSO_URL": "https://api.seliseblocks.com/authentication/v1/Social/SaveSsoCredential",
-    "MFA_SAVE_URL": "https://api.seliseblocks.com/mfa/v1/Configuration/Save",
-    "GITHUB_REPOS_URL": "https://api.seliseblocks.com/cloudbuild/v1/github/repos",
-    "RUN_BUILD_URL": "https://api.seliseblocks.com/cloudbuild/v1/build/run-build",
-    "HEADERS": {
-        "x-blocks-key": "d7e5554c758541db8a18694b64ef423d",
-        "Origin": "https://cloud.seliseblocks.com",
-        "Referer": "https://cloud.seliseblocks.com/",
-        "accept": "application/json",
-        "accept-language": "en-US,en;q=0.9",
-        "content-type": "application/json",
-        "dnt": "1",
-        "priority": "u=1, i",
-        "sec-ch-ua": '"Chromium";v="139", "Not;A=Brand";v="99"',
-        "sec-ch-ua-mobile": "?1",
-        "sec-ch-ua-platform": '"Android"',
-        "sec-fetch-dest": "empty",
-        "sec-fetch-mode": "cors",
-        "sec-fetch-site": "same-site",
-        "user-agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Mobile Safari/537.36"
-    }
+READBACK_MODES = ("full", "delta", "deferred", "none")
+
+# Strong references to fire-and-forget tasks so they are not garbage collected mid-flight
+background_tasks = set()
+
+
+def run_in_background(coroutine) -> asyncio.Task:
+    """Schedule a coroutine as a background task and keep a reference until it finishes."""
+    task = asyncio.ensure_future(coroutine)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+
+def resolve_readback_mode(readback: str) -> Optional[str]:
+    """Resolve a per-call read-back mode against the server default. Returns None if invalid."""
+    mode = (readback or READBACK_CONFIG["mode"]).lower()
+    return mode if mode in READBACK_MODES else None
+
+
+def apply_readback_mode(result: dict, mode: str, delta: dict, read_back) -> None:
+    """
+    Apply a "delta", "deferred" or "none" read-back mode to a write tool's result.
+    
+    Args:
+        result: Result dictionary of the write tool
+        mode: Resolved read-back mode
+        delta: Locally built description of the change
+        read_back: Zero-argument callable returning the read tool coroutine (used for "deferred")
+    """
+    if mode == "delta":
+        result["delta"] = delta
+    elif mode == "deferred":
+        run_in_background(read_back())
+        result["readback"] = "deferred"
+
+
+# Tool result serialization
+OUTPUT_CONFIG = {
+    "mode": os.environ.get("SELISE_OUTPUT_MODE", "pretty").lower()
 }
 
+OUTPUT_MODES = ("pretty", "compact", "summary", "raw")
+
+# Result keys holding the raw upstream items that a "summary" list is derived from
+RAW_RESULT_KEYS = ("configurations", "roles", "permissions", "resource_groups", "repositories")
+
+
+def resolve_output_mode(output: str) -> Optional[str]:
+    """Resolve a per-call output mode against the server default. Returns None if invalid."""
+    mode = (output or OUTPUT_CONFIG["mode"]).lower()
+    return mode if mode in OUTPUT_MODES else None
+
+
+def dump_result(result: Any, output: str = "", fields: list = None) -> str:
+    """
+    Serialize a tool result according to the output mode.
+    
+    Modes:
+        pretty: indented JSON (default)
+        compact: JSON without whitespace
+        summary: compact, keeping only the derived "summary" list and dropping the raw items
+        raw: compact, keeping only the raw items and dropping the derived "summary" list
+    
+    Args:
+        result: Result to serialize
+        output: Output mode; falls back to SELISE_OUTPUT_MODE, then "pretty"
+        fields: Keep only these keys in each raw item (optional)
+    
+    Returns:
+        JSON string
+    """
+    mode = resolve_output_mode(output) or "pretty"
+    if isinstance(result, dict) and result.get("status") == "error":
+        count_tool_stat("errors")
+    started_at = time.monotonic()
+    try:
+        return serialize_result(result, mode, fields)
+    finally:
+        count_tool_stat("serialize_seconds", time.monotonic() - started_at)
+
+
+def serialize_result(result: Any, mode: str, fields: list = None) -> str:
+    """Apply an output mode and field projection to a result and encode it (see dump_result)."""
+    if isinstance(result, dict) and (mode in ("summary", "raw") or fields):
+        result = dict(result)
+        has_summary = isinstance(result.get("summary"), list)
+        for key in RAW_RESULT_KEYS:
+            if key not in result:
+                continue
+            if mode == "summary" and has_summary:
+                del result[key]
+            elif fields and isinstance(result[key], list):
+                result[key] = [
+                    {field: item[field] for field in fields if field in item} if isinstance(item, dict) else item
+                    for item in result[key]
+                ]
+        if mode == "raw" and has_summary and any(key in result for key in RAW_RESULT_KEYS):
+            del result["summary"]
+    
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if mode == "pretty" else 0)
+        try:
+            return orjson.dumps(result, option=option).decode("utf-8")
+        except TypeError:
+            pass
+    
+    if mode == "pretty":
+        return json.dumps(result, indent=2)
+    return json.dumps(result, separators=(",", ":"))
+
+
+async def gather_limited(coroutines: list, limit: int, return_exceptions: bool = False) -> list:
+    """
+    Await coroutines concurrently with at most `limit` running at once.
+    
+    Args:
+        coroutines: Coroutines to run
+        limit: Maximum number running concurrently
+        return_exceptions: Return exceptions in the result list instead of raising
+    
+    Returns:
+        Results in the same order as the input coroutines
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+    
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+    
+    return await asyncio.gather(*(run(c) for c in coroutines), return_exceptions=return_exceptions)
+
+
+async def fetch_all_pages(
+    endpoint: str,
+    project_key: str,
+    url: str,
+    payload: dict,
+    headers: dict,
+    bypass_cache: bool = False,
+    ctx: Optional[Context] = None,
+    method: str = "POST",
+    page_keys: Tuple[str, str] = ("page", "pageSize"),
+    first_page_number: int = 0,
+    extract_items: Optional[Callable[[Any], list]] = None
+) -> Tuple[list, int, int]:
+    """
+    Fetch every page of a paginated listing and merge them into one de-duplicated list.
+    
+    The first page is fetched first to read totalCount; the remaining pages are then fetched
+    concurrently (bounded by fanout_limit). Without a totalCount, pages are fetched one at a
+    time until a short page. When ctx is given, each page is streamed to the MCP client as a
+    progress notification as soon as it arrives.
+    
+    The defaults fit the IAM listings; other listings pass method, page_keys,
+    first_page_number and extract_items.
+    
+    Args:
+        endpoint: Cache endpoint name
+        project_key: Project key the listing is scoped to
+        url: Listing URL
+        payload: Request payload (query parameters for GET); the page keys are overridden per page
+        headers: Request headers
+        bypass_cache: Skip the response cache for every page
+        ctx: MCP context to stream pages to (optional)
+        method: "POST" (payload sent as JSON) or "GET" (payload sent as query parameters)
+        page_keys: Names of the page number and page size keys
+        first_page_number: Number of the first page (0 or 1)
+        extract_items: Returns the items of a page response (default: its "data" list)
+    
+    Returns:
+        Tuple of (merged items, totalCount reported by the API, number of pages fetched)
+    """
+    page_key, size_key = page_keys
+    page_size = max(payload.get(size_key, 10), HTTP_CONFIG["all_pages_page_size"])
+    max_pages = HTTP_CONFIG["all_pages_max_pages"]
+    items_of = extract_items or (lambda data: data.get("data", []))
+    pages_done = 0
+    
+    async def fetch_page(page: int, total_pages: Optional[int]) -> Any:
+        nonlocal pages_done
+        page_payload = {**payload, page_key: page, size_key: page_size}
+        body = {"params": page_payload} if method == "GET" else {"json": page_payload}
+        data = await fetch_json(
+            endpoint,
+            project_key,
+            method,
+            url,
+            cache_params=page_payload,
+            bypass_cache=bypass_cache,
+            headers=headers,
+            **body
+        )
+        pages_done += 1
+        if ctx is not None:
+            await ctx.report_progress(
+                pages_done,
+                total_pages,
+                json.dumps({"page": page, "items": items_of(data)}, separators=(",", ":"))
+            )
+        return data
+    
+    first_page = await fetch_page(first_page_number, None)
+    total_count = first_page.get("totalCount") if isinstance(first_page, dict) else None
+    if total_count is None:
+        remaining_pages = []
+        last_page = first_page
+        while len(items_of(last_page)) >= page_size and len(remaining_pages) + 1 < max_pages:
+            last_page = await fetch_page(first_page_number + len(remaining_pages) + 1, None)
+            remaining_pages.append(last_page)
+    else:
+        total_pages = min(max(1, math.ceil(total_count / page_size)), max_pages)
+        remaining_pages = await gather_limited(
+            [fetch_page(first_page_number + page, total_pages) for page in range(1, total_pages)],
+            HTTP_CONFIG["fanout_limit"]
+        )
+    
+    # Merge pages, dropping items that shifted between pages while they were fetched
+    merged = []
+    seen_ids = set()
+    for page_data in [first_page] + remaining_pages:
+        for item in items_of(page_data):
+            item_id = item.get("itemId")
+            if item_id is not None:
+                if item_id in seen_ids:
+                    continue
+                seen_ids.add(item_id)
+            merged.append(item)
+    
+    return merged, len(merged) if total_count is None else total_count, len(remaining_pages) + 1
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
+    """Open the shared HTTP client (and optional metrics exporters) at server startup and close them at shutdown."""
+    get_http_client()
+    if load_persistent_state():
+        schedule_token_refresh()
+    await start_metrics_exporters()
+    try:
+        yield {}
+    finally:
+        cancel_token_refresh()
+        await stop_metrics_exporters()
+        await close_http_client()
+
+
+# Initialize FastMCP server
+mcp = FastMCP("Selise Blocks API", lifespan=server_lifespan)
+
+class ToolCallMiddleware(Middleware):
+    """Times every tool call, collects its per-call counters and logs one tool_call event per call."""
+    
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        name = context.message.name
+        stats = new_tool_call_stats()
+        token = tool_call_stats.set(stats)
+        log_token = log_context.set({"request_id": uuid.uuid4().hex[:16], "tool": name})
+        started_at = time.monotonic()
+        result = None
+        failed = True
+        try:
+            result = await call_next(context)
+            failed = False
+            return result
+        finally:
+            seconds = time.monotonic() - started_at
+            response_bytes = record_tool_call(name, seconds, stats, result, failed)
+            tool_totals = retry_state["tools"].setdefault(
+                name,
+                {"calls": 0, "retries": 0, "retry_wait_seconds": 0.0}
+            )
+            tool_totals["calls"] += 1
+            tool_totals["retries"] += stats["retries"]
+            tool_totals["retry_wait_seconds"] += stats["retry_wait_seconds"]
+            
+            outcome = "exception" if failed else ("error" if stats["errors"] else "success")
+            log_event(
+                logging.WARNING if failed else logging.INFO,
+                "tool_call",
+                outcome=outcome,
+                latency_ms=round(seconds * 1000, 1),
+                upstream_requests=stats["upstream_requests"],
+                upstream_ms=round(stats["upstream_seconds"] * 1000, 1),
+                retries=stats["retries"],
+                cache_hits=stats["cache_hits"],
+                response_bytes=response_bytes
+            )
+            log_context.reset(log_token)
+            tool_call_stats.reset(token)
+
+
+mcp.add_middleware(ToolCallMiddleware())
+
 
 def is_token_valid() -> bool:
     """Check if the current access token is valid and not expired."""
@@ -87,6 +1745,284 @@ def get_auth_headers() -> dict:
     return headers
 
 
+# Access token refresh configuration and state
+TOKEN_REFRESH_CONFIG = {
+    "enabled": os.environ.get("SELISE_TOKEN_AUTO_REFRESH", "1").lower() not in ("0", "false", "no"),
+    "lead_seconds": float(os.environ.get("SELISE_TOKEN_REFRESH_LEAD", "60"))
+}
+
+refresh_state = {
+    "in_flight": None,
+    "scheduler": None,
+    "refresh_count": 0,
+    "last_refreshed_at": None,
+    "last_error": None
+}
+
+
+def store_token_response(token_data: dict, keep_refresh_token: bool = False) -> datetime:
+    """
+    Update auth_state from an OAuth token response and schedule the next background refresh.
+    
+    Args:
+        token_data: Parsed OAuth token response containing at least access_token
+        keep_refresh_token: Keep the current refresh token if the response does not include a new one
+    
+    Returns:
+        The new expiration time (with a 5-minute safety buffer)
+    """
+    expires_in = token_data.get("expires_in", 8000)
+    refresh_token = token_data.get("refresh_token")
+    if keep_refresh_token and not refresh_token:
+        refresh_token = auth_state["refresh_token"]
+    
+    # Calculate expiration time with 5-minute buffer
+    expires_at = datetime.now() + timedelta(seconds=expires_in - 300)
+    
+    auth_state.update({
+        "access_token": token_data.get("access_token"),
+        "refresh_token": refresh_token,
+        "expires_at": expires_at,
+        "token_type": token_data.get("token_type", "bearer")
+    })
+    schedule_token_refresh()
+    save_persistent_state()
+    return expires_at
+
+
+async def perform_token_refresh() -> bool:
+    """Exchange the stored refresh token for a new access token."""
+    payload = {
+        "grant_type": "refresh_token",
+        "refresh_token": auth_state["refresh_token"]
+    }
+    
+    # Create headers without content-type for form data
+    refresh_headers = {k: v for k, v in API_CONFIG["HEADERS"].items() if k != "content-type"}
+    
+    try:
+        response = await api_request(
+            "POST",
+            API_CONFIG["LOGIN_URL"],
+            refresh_on_401=False,
+            headers=refresh_headers,
+            data=payload
+        )
+        response.raise_for_status()
+        token_data = response.json()
+    except Exception as e:
+        refresh_state["last_error"] = str(e)
+        log_event(logging.ERROR, "token_refresh_error", error=str(e))
+        return False
+    
+    if not token_data.get("access_token"):
+        refresh_state["last_error"] = "No access token received from refresh"
+        return False
+    
+    store_token_response(token_data, keep_refresh_token=True)
+    refresh_state["refresh_count"] += 1
+    refresh_state["last_refreshed_at"] = datetime.now()
+    refresh_state["last_error"] = None
+    return True
+
+
+async def refresh_access_token() -> bool:
+    """
+    Refresh the access token using the stored refresh token.
+    
+    Concurrent callers share a single in-flight refresh, so only one token
+    request is sent no matter how many tools hit an expired token at once.
+    
+    Returns:
+        True if a new access token was obtained
+    """
+    if not TOKEN_REFRESH_CONFIG["enabled"] or not auth_state["refresh_token"]:
+        return False
+    
+    in_flight = refresh_state["in_flight"]
+    if in_flight is None or in_flight.done():
+        in_flight = asyncio.ensure_future(perform_token_refresh())
+        refresh_state["in_flight"] = in_flight
+    
+    return await asyncio.shield(in_flight)
+
+
+async def ensure_authenticated() -> bool:
+    """Check the access token, refreshing it first if it expired and a refresh token is available."""
+    if is_token_valid():
+        return True
+    if auth_state["refresh_token"]:
+        await refresh_access_token()
+    return is_token_valid()
+
+
+async def refresh_token_when_due(delay: float) -> None:
+    """Background task that refreshes the access token shortly before it expires."""
+    await asyncio.sleep(delay)
+    await refresh_access_token()
+
+
+def schedule_token_refresh() -> None:
+    """(Re)schedule the proactive background refresh for the current token."""
+    scheduler = refresh_state["scheduler"]
+    if scheduler is not None and not scheduler.done() and scheduler is not asyncio.current_task():
+        scheduler.cancel()
+    refresh_state["scheduler"] = None
+    
+    if not TOKEN_REFRESH_CONFIG["enabled"] or not auth_state["refresh_token"] or not auth_state["expires_at"]:
+        return
+    
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No event loop (e.g. state restored at import time); refresh on demand instead
+        return
+    
+    delay = (auth_state["expires_at"] - datetime.now()).total_seconds() - TOKEN_REFRESH_CONFIG["lead_seconds"]
+    refresh_state["scheduler"] = loop.create_task(refresh_token_when_due(max(delay, 0)))
+
+
+def cancel_token_refresh() -> None:
+    """Cancel the proactive background refresh, if one is scheduled."""
+    scheduler = refresh_state["scheduler"]
+    if scheduler is not None and not scheduler.done():
+        scheduler.cancel()
+    refresh_state["scheduler"] = None
+
+
+def default_state_file() -> str:
+    """Get the default location of the persistent state file in the user's config directory."""
+    if os.name == "nt":
+        config_dir = os.environ.get("APPDATA") or os.path.expanduser("~")
+    else:
+        config_dir = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(config_dir, "selise-mcp", "state.enc")
+
+
+# Persistent state store configuration (opt-in, encrypted at rest)
+STATE_STORE_CONFIG = {
+    "enabled": os.environ.get("SELISE_PERSIST_STATE", "").lower() in ("1", "true", "yes"),
+    "path": os.environ.get("SELISE_STATE_FILE") or default_state_file(),
+    "key": os.environ.get("SELISE_STATE_KEY")
+}
+
+store_state = {
+    "restored_at": None,
+    "last_saved_at": None,
+    "last_error": None
+}
+
+
+def get_state_cipher() -> Optional[Any]:
+    """
+    Get the Fernet cipher used to encrypt the state file.
+    
+    Uses SELISE_STATE_KEY if set, otherwise a key file stored next to the
+    state file (created with owner-only permissions on first use).
+    """
+    if Fernet is None:
+        store_state["last_error"] = "Persistent state requires the 'cryptography' package"
+        return None
+    
+    key = STATE_STORE_CONFIG["key"]
+    if not key:
+        key_path = f"{STATE_STORE_CONFIG['path']}.key"
+        if os.path.exists(key_path):
+            with open(key_path, "rb") as key_file:
+                key = key_file.read().strip()
+        else:
+            os.makedirs(os.path.dirname(key_path), exist_ok=True)
+            key = Fernet.generate_key()
+            fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as key_file:
+                key_file.write(key)
+    
+    return Fernet(key)
+
+
+def save_persistent_state() -> bool:
+    """Snapshot the token and application state to the encrypted state file."""
+    if not STATE_STORE_CONFIG["enabled"]:
+        return False
+    
+    try:
+        cipher = get_state_cipher()
+        if cipher is None:
+            return False
+        
+        snapshot = {
+            "auth_state": {
+                "access_token": auth_state["access_token"],
+                "refresh_token": auth_state["refresh_token"],
+                "expires_at": auth_state["expires_at"].isoformat() if auth_state["expires_at"] else None,
+                "token_type": auth_state["token_type"]
+            },
+            "app_state": dict(app_state),
+            "plan_state": dict(plan_state["applied"]),
+            "saved_at": datetime.now().isoformat()
+        }
+        
+        path = STATE_STORE_CONFIG["path"]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as state_file:
+            state_file.write(cipher.encrypt(json.dumps(snapshot).encode("utf-8")))
+        os.replace(temp_path, path)
+        
+        store_state["last_saved_at"] = datetime.now()
+        store_state["last_error"] = None
+        return True
+        
+    except Exception as e:
+        store_state["last_error"] = str(e)
+        log_event(logging.ERROR, "state_save_error", path=STATE_STORE_CONFIG["path"], error=str(e))
+        return False
+
+
+def load_persistent_state() -> bool:
+    """Restore the token and application state from the encrypted state file, if present."""
+    if not STATE_STORE_CONFIG["enabled"] or not os.path.exists(STATE_STORE_CONFIG["path"]):
+        return False
+    
+    try:
+        cipher = get_state_cipher()
+        if cipher is None:
+            return False
+        
+        with open(STATE_STORE_CONFIG["path"], "rb") as state_file:
+            snapshot = json.loads(cipher.decrypt(state_file.read()))
+        
+        saved_auth = snapshot.get("auth_state", {})
+        expires_at = saved_auth.get("expires_at")
+        auth_state.update({
+            "access_token": saved_auth.get("access_token"),
+            "refresh_token": saved_auth.get("refresh_token"),
+            "expires_at": datetime.fromisoformat(expires_at) if expires_at else None,
+            "token_type": saved_auth.get("token_type", "bearer")
+        })
+        
+        saved_app = snapshot.get("app_state", {})
+        for key in app_state:
+            if key in saved_app:
+                app_state[key] = saved_app[key]
+        plan_state["applied"].update(snapshot.get("plan_state", {}))
+        
+        store_state["restored_at"] = datetime.now()
+        store_state["last_error"] = None
+        return True
+        
+    except InvalidToken:
+        store_state["last_error"] = "State file could not be decrypted with the configured key"
+        log_event(logging.ERROR, "state_load_error", path=STATE_STORE_CONFIG["path"], error=store_state["last_error"])
+        return False
+    
+    except Exception as e:
+        store_state["last_error"] = str(e)
+        log_event(logging.ERROR, "state_load_error", path=STATE_STORE_CONFIG["path"], error=str(e))
+        return False
+
+
 async def run_command(command: str) -> Dict[str, Any]:
     """Run a shell command asynchronously and return the result."""
     try:
@@ -134,15 +2070,14 @@ async def login(username: str, password: str) -> str:
         # Create headers without content-type for form data
         login_headers = {k: v for k, v in API_CONFIG["HEADERS"].items() if k != "content-type"}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["LOGIN_URL"],
-                headers=login_headers,
-                data=login_payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            login_data = response.json()
+        response = await api_request(
+            "POST",
+            API_CONFIG["LOGIN_URL"],
+            headers=login_headers,
+            data=login_payload
+        )
+        response.raise_for_status()
+        login_data = response.json()
         
         # Extract token information
         access_token = login_data.get("access_token")
@@ -151,22 +2086,17 @@ async def login(username: str, password: str) -> str:
         token_type = login_data.get("token_type", "bearer")
         
         if not access_token:
-            return json.dumps({
+            return dump_result({
                 "status": "error",
                 "message": "Login failed. No access token received.",
                 "response": login_data
-            }, indent=2)
+            })
         
-        # Calculate expiration time with 5-minute buffer
-        expires_at = datetime.now() + timedelta(seconds=expires_in - 300)
+        # Cached responses belong to the previous session
+        invalidate_cache()
         
-        # Update global auth state
-        auth_state.update({
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "expires_at": expires_at,
-            "token_type": token_type
-        })
+        # Update global auth state and schedule the background token refresh
+        expires_at = store_token_response(login_data)
         
         result = {
             "status": "success",
@@ -179,20 +2109,20 @@ async def login(username: str, password: str) -> str:
             }
         }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error during login: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error during login: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -210,11 +2140,11 @@ async def get_projects(tenant_group_id: str = "", page: int = 0, page_size: int
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         headers = get_auth_headers()
         params = {
@@ -225,15 +2155,28 @@ async def get_projects(tenant_group_id: str = "", page: int = 0, page_size: int
         if tenant_group_id:
             params["tenantGroupId"] = tenant_group_id
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                API_CONFIG["GET_PROJECTS_URL"],
-                headers=headers,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            projects_data = response.json()
+        response = await api_request(
+            "GET",
+            API_CONFIG["GET_PROJECTS_URL"],
+            headers=headers,
+            params=params
+        )
+        response.raise_for_status()
+        projects_data = response.json()
+        
+        # Resolve missing application domains concurrently instead of one project at a time
+        pending_item_ids = list(dict.fromkeys(
+            project.get("itemId")
+            for group in projects_data
+            for project in group.get("projects", [])
+            if not project.get("applicationDomain") and project.get("itemId")
+        ))
+        domain_lookups = await gather_limited(
+            [get_application_domain(item_id) for item_id in pending_item_ids],
+            HTTP_CONFIG["fanout_limit"],
+            return_exceptions=True
+        )
+        resolved_domains = dict(zip(pending_item_ids, domain_lookups))
         
         # Extract application domains and tenant information
         extracted_data = []
@@ -269,7 +2212,9 @@ async def get_projects(tenant_group_id: str = "", page: int = 0, page_size: int
                 # Fallback: If we have an itemId but no applicationDomain, try to get it via the old method
                 elif item_id:
                     try:
-                        app_domain = await get_application_domain(item_id)
+                        app_domain = resolved_domains.get(item_id)
+                        if isinstance(app_domain, Exception):
+                            raise app_domain
                         if app_domain:
                             project_info["application_contexts"] = [{
                                 "environment": "dev",
@@ -284,7 +2229,7 @@ async def get_projects(tenant_group_id: str = "", page: int = 0, page_size: int
                                 app_state["tenant_id"] = project.get("tenantId")
                                 app_state["project_name"] = project.get("name")
                     except Exception as domain_error:
-                        print(f"Error getting domain for project {project.get('name')}: {domain_error}")
+                        log_event(logging.WARNING, "project_domain_error", project=project.get("name"), item_id=item_id, error=str(domain_error))
                         # Fallback to placeholder if domain extraction fails
                         placeholder_domain = f"https://dev-{project.get('name', 'unknown')}-placeholder.seliseblocks.com"
                         project_info["application_contexts"] = [{
@@ -310,6 +2255,8 @@ async def get_projects(tenant_group_id: str = "", page: int = 0, page_size: int
                 
                 extracted_data.append(project_info)
         
+        save_persistent_state()
+        
         result = {
             "status": "success",
             "message": "Projects retrieved successfully",
@@ -321,51 +2268,59 @@ async def get_projects(tenant_group_id: str = "", page: int = 0, page_size: int
             }
         }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error during project retrieval: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error during project retrieval: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
-async def create_schema(schema_name: str, project_key: str = "") -> str:
+async def create_schema(schema_name: str, project_key: str = "", readback: str = "") -> str:
     """
     Create a new schema in Selise Blocks GraphQL API.
     
     Args:
         schema_name: Name of the schema to create
         project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        readback: Post-write read-back mode: "full", "delta", "deferred" or "none" (default: server setting)
     
     Returns:
         JSON string with schema creation result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
+        readback_mode = resolve_readback_mode(readback)
+        if not readback_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid readback mode '{readback}'. Must be one of: full, delta, deferred, none."
+            })
+        
         # Prepare headers matching the curl example
         headers = {
             "accept": "application/json",
@@ -395,30 +2350,32 @@ async def create_schema(schema_name: str, project_key: str = "") -> str:
             "projectKey": project_key
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["CREATE_SCHEMA_URL"],
-                headers=headers,
-                json=schema_payload,
-                timeout=30.0
-            )
+        response = await api_request(
+            "POST",
+            API_CONFIG["CREATE_SCHEMA_URL"],
+            headers=headers,
+            json=schema_payload
+        )
+        
+        # Check if response is successful
+        if response.status_code == 200:
+            invalidate_cache("list_schemas", project_key)
             
-            # Check if response is successful
-            if response.status_code == 200:
-                try:
-                    schema_data = response.json()
-                    result = {
-                        "status": "success",
-                        "message": f"Schema '{schema_name}' created successfully",
-                        "schema_details": {
-                            "schema_name": schema_name,
-                            "collection_name": collection_name,
-                            "schema_type": 1,
-                            "project_key": project_key
-                        },
-                        "response": schema_data
-                    }
-                    
+            try:
+                schema_data = response.json()
+                result = {
+                    "status": "success",
+                    "message": f"Schema '{schema_name}' created successfully",
+                    "schema_details": {
+                        "schema_name": schema_name,
+                        "collection_name": collection_name,
+                        "schema_type": 1,
+                        "project_key": project_key
+                    },
+                    "response": schema_data
+                }
+                
+                if readback_mode == "full":
                     # Automatically fetch updated schema list
                     try:
                         schemas_list_result = await list_schemas(project_key)
@@ -427,22 +2384,30 @@ async def create_schema(schema_name: str, project_key: str = "") -> str:
                             result["updated_schemas_list"] = schemas_list_data.get("schemas")
                     except Exception as list_error:
                         result["schemas_list_error"] = f"Could not fetch updated schema list: {str(list_error)}"
-                    
-                    return json.dumps(result, indent=2)
-                except json.JSONDecodeError:
-                    # If response is not JSON, it might be plain text success
-                    result = {
-                        "status": "success",
-                        "message": f"Schema '{schema_name}' created successfully",
-                        "schema_details": {
-                            "schema_name": schema_name,
-                            "collection_name": collection_name,
-                            "schema_type": 1,
-                            "project_key": project_key
-                        },
-                        "response": response.text
-                    }
-                    
+                else:
+                    apply_readback_mode(
+                        result,
+                        readback_mode,
+                        {"action": "created", "schema_name": schema_name, "collection_name": collection_name},
+                        lambda: list_schemas(project_key)
+                    )
+                
+                return dump_result(result)
+            except json.JSONDecodeError:
+                # If response is not JSON, it might be plain text success
+                result = {
+                    "status": "success",
+                    "message": f"Schema '{schema_name}' created successfully",
+                    "schema_details": {
+                        "schema_name": schema_name,
+                        "collection_name": collection_name,
+                        "schema_type": 1,
+                        "project_key": project_key
+                    },
+                    "response": response.text
+                }
+                
+                if readback_mode == "full":
                     # Automatically fetch updated schema list
                     try:
                         schemas_list_result = await list_schemas(project_key)
@@ -451,35 +2416,218 @@ async def create_schema(schema_name: str, project_key: str = "") -> str:
                             result["updated_schemas_list"] = schemas_list_data.get("schemas")
                     except Exception as list_error:
                         result["schemas_list_error"] = f"Could not fetch updated schema list: {str(list_error)}"
-                    
-                    return json.dumps(result, indent=2)
-            else:
-                # Handle non-200 responses
-                return json.dumps({
-                    "status": "error",
-                    "message": f"HTTP error during schema creation: {response.status_code}",
-                    "details": response.text,
-                    "request_payload": schema_payload
-                }, indent=2)
+                else:
+                    apply_readback_mode(
+                        result,
+                        readback_mode,
+                        {"action": "created", "schema_name": schema_name, "collection_name": collection_name},
+                        lambda: list_schemas(project_key)
+                    )
+                
+                return dump_result(result)
+        else:
+            # Handle non-200 responses
+            return dump_result({
+                "status": "error",
+                "message": f"HTTP error during schema creation: {response.status_code}",
+                "details": response.text,
+                "request_payload": schema_payload
+            })
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error during schema creation: {e.response.status_code}",
             "details": e.response.text,
             "request_payload": schema_payload if 'schema_payload' in locals() else None
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error during schema creation: {str(e)}",
             "request_payload": schema_payload if 'schema_payload' in locals() else None
-        }, indent=2)
+        })
+
+
+@mcp.tool()
+async def create_schemas_bulk(schemas: list, project_key: str = "", readback: str = "") -> str:
+    """
+    Create several schemas in one call, optionally with their initial fields.
+    
+    Schemas whose name already exists are skipped. The rest are created concurrently, their
+    initial fields are saved in the same run, and the schema list is read once at the end.
+    
+    Args:
+        schemas: List of schemas, each {"name": ..., "fields": [field definitions] (optional)}
+        project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        readback: Post-write read-back mode: "full", "delta", "deferred" or "none" (default: server setting)
+    
+    Returns:
+        JSON string with a per-schema result table
+    """
+    try:
+        # Check if authenticated
+        if not await ensure_authenticated():
+            return dump_result({
+                "status": "error",
+                "message": "Authentication required. Please login first using the login tool."
+            })
+        
+        # Use global tenant_id if project_key is not provided
+        if not project_key:
+            if not app_state["tenant_id"]:
+                return dump_result({
+                    "status": "error",
+                    "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
+                })
+            project_key = app_state["tenant_id"]
+        
+        readback_mode = resolve_readback_mode(readback)
+        if not readback_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid readback mode '{readback}'. Must be one of: full, delta, deferred, none."
+            })
+        
+        invalid = [index for index, schema in enumerate(schemas) if not isinstance(schema, dict) or not schema.get("name")]
+        if invalid:
+            return dump_result({
+                "status": "error",
+                "message": f"Every schema needs a name. Invalid entries at index: {invalid}"
+            })
+        
+        headers = get_auth_headers()
+        existing = await list_project_schemas(project_key, headers)
+        
+        table = []
+        to_create = []
+        requested_names = set()
+        for schema in schemas:
+            row = {"name": schema["name"]}
+            if schema["name"] in existing:
+                row.update({"status": "skipped", "reason": "schema already exists", "item_id": existing[schema["name"]]})
+            elif schema["name"] in requested_names:
+                row.update({"status": "skipped", "reason": "duplicate name in request"})
+            else:
+                requested_names.add(schema["name"])
+                to_create.append((row, schema))
+            table.append(row)
+        
+        async def create_one(row: dict, schema: dict) -> None:
+            payload = {
+                "schemaName": schema["name"],
+                "collectionName": f"{schema['name']}s",
+                "schemaType": 1,
+                "projectKey": project_key
+            }
+            try:
+                response = await api_request(
+                    "POST",
+                    API_CONFIG["CREATE_SCHEMA_URL"],
+                    headers=headers,
+                    json=payload
+                )
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                row.update({"status": "failed", "error": f"HTTP {e.response.status_code}: {e.response.text[:200]}"})
+                return
+            except Exception as e:
+                row.update({"status": "failed", "error": str(e)})
+                return
+            
+            row["status"] = "created"
+            try:
+                create_data = response.json()
+            except json.JSONDecodeError:
+                create_data = None
+            if isinstance(create_data, dict):
+                nested = create_data.get("data") if isinstance(create_data.get("data"), dict) else {}
+                row["item_id"] = create_data.get("itemId") or nested.get("itemId")
+        
+        await gather_limited([create_one(row, schema) for row, schema in to_create], HTTP_CONFIG["fanout_limit"])
+        
+        created = [(row, schema) for row, schema in to_create if row["status"] == "created"]
+        if created:
+            invalidate_cache("list_schemas", project_key)
+        
+        # The single trailing listing, also used to resolve IDs the create responses did not include
+        final_schemas = None
+        if created and (readback_mode == "full" or any(schema.get("fields") and not row.get("item_id") for row, schema in created)):
+            final_schemas = await list_project_schemas(project_key, headers)
+            for row, _ in created:
+                row["item_id"] = row.get("item_id") or final_schemas.get(row["name"])
+        
+        async def save_fields(row: dict, fields: list) -> None:
+            if not row.get("item_id"):
+                row["fields"] = "failed: schema ID not found"
+                return
+            payload = {
+                "fields": fields,
+                "schemaDefinitionItemId": row["item_id"],
+                "deletableFieldNames": []
+            }
+            try:
+                response = await api_request(
+                    "POST",
+                    API_CONFIG["SCHEMA_FIELDS_URL"],
+                    headers=headers,
+                    json=payload
+                )
+                response.raise_for_status()
+                row["fields"] = f"saved {len(fields)} field(s)"
+            except httpx.HTTPStatusError as e:
+                row["fields"] = f"failed: HTTP {e.response.status_code}"
+            except Exception as e:
+                row["fields"] = f"failed: {str(e)}"
+        
+        await gather_limited(
+            [save_fields(row, schema["fields"]) for row, schema in created if schema.get("fields")],
+            HTTP_CONFIG["fanout_limit"]
+        )
+        
+        counts = {status: sum(1 for row in table if row["status"] == status) for status in ("created", "skipped", "failed")}
+        field_failures = sum(1 for row in table if str(row.get("fields", "")).startswith("failed"))
+        
+        result = {
+            "status": "success" if not counts["failed"] and not field_failures else ("partial" if counts["created"] else "error"),
+            "message": f"Created {counts['created']}, skipped {counts['skipped']}, failed {counts['failed']} schema(s)",
+            "project_key": project_key,
+            "counts": counts,
+            "results": table
+        }
+        
+        if readback_mode == "full":
+            # Nothing was created, so the listing read up front is still current
+            if final_schemas is None:
+                final_schemas = existing
+            result["updated_schemas"] = [{"name": name, "item_id": item_id} for name, item_id in final_schemas.items()]
+        elif created:
+            apply_readback_mode(
+                result,
+                readback_mode,
+                {"action": "created", "schemas": [row for row, _ in created]},
+                lambda: list_schemas(project_key)
+            )
+        
+        return dump_result(result)
+        
+    except httpx.HTTPStatusError as e:
+        return dump_result({
+            "status": "error",
+            "message": f"HTTP error creating schemas: {e.response.status_code}",
+            "details": e.response.text
+        })
+    
+    except Exception as e:
+        return dump_result({
+            "status": "error",
+            "message": f"Error creating schemas: {str(e)}"
+        })
 
 
 @mcp.tool()
-async def list_schemas(project_key: str = "", keyword: str = "", page_size: int = 100, page_number: int = 1, sort_descending: bool = True, sort_by: str = "CreatedDate") -> str:
+async def list_schemas(project_key: str = "", keyword: str = "", page_size: int = 100, page_number: int = 1, sort_descending: bool = True, sort_by: str = "CreatedDate", bypass_cache: bool = False) -> str:
     """
     List schemas from Selise Blocks GraphQL API.
     
@@ -490,25 +2638,26 @@ async def list_schemas(project_key: str = "", keyword: str = "", page_size: int
         page_number: Page number for pagination (default: 1) 
         sort_descending: Sort in descending order (default: True)
         sort_by: Field to sort by (default: "CreatedDate")
+        bypass_cache: Skip the response cache and fetch fresh data (default: False)
     
     Returns:
         JSON string with schemas listing result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
         # Prepare headers matching the curl example
@@ -541,15 +2690,16 @@ async def list_schemas(project_key: str = "", keyword: str = "", page_size: int
             "ProjectKey": project_key
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                API_CONFIG["LIST_SCHEMAS_URL"],
-                headers=headers,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            schemas_data = response.json()
+        schemas_data = await fetch_json(
+            "list_schemas",
+            project_key,
+            "GET",
+            API_CONFIG["LIST_SCHEMAS_URL"],
+            cache_params=params,
+            bypass_cache=bypass_cache,
+            headers=headers,
+            params=params
+        )
         
         result = {
             "status": "success",
@@ -558,49 +2708,50 @@ async def list_schemas(project_key: str = "", keyword: str = "", page_size: int
             "schemas": schemas_data
         }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error during schema listing: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error during schema listing: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
-async def get_schema(schema_id: str, project_key: str = "") -> str:
+async def get_schema(schema_id: str, project_key: str = "", bypass_cache: bool = False) -> str:
     """
     Get a schema's current fields using its ID (step 1 of schema field management).
     
     Args:
         schema_id: The ID of the schema to retrieve
         project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        bypass_cache: Skip the response cache and fetch fresh data (default: False)
     
     Returns:
         JSON string with schema fields and metadata
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
         # Prepare headers matching the curl example
@@ -626,14 +2777,15 @@ async def get_schema(schema_id: str, project_key: str = "") -> str:
         # Get schema details using schema ID
         url = f"{API_CONFIG['GET_SCHEMA_URL']}/{schema_id}"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            schema_data = response.json()
+        schema_data = await fetch_json(
+            "get_schema",
+            project_key,
+            "GET",
+            url,
+            cache_params={"schema_id": schema_id},
+            bypass_cache=bypass_cache,
+            headers=headers
+        )
         
         result = {
             "status": "success",
@@ -641,50 +2793,164 @@ async def get_schema(schema_id: str, project_key: str = "") -> str:
             "schema": schema_data
         }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error getting schema: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
         
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error getting schema: {str(e)}"
-        }, indent=2)
+        })
+
+
+def extract_schema_items(schemas_data: Any) -> list:
+    """Return the schema entries of a list_schemas response."""
+    if isinstance(schemas_data, list):
+        return schemas_data
+    if isinstance(schemas_data, dict):
+        for key in ("data", "items", "schemas"):
+            if isinstance(schemas_data.get(key), list):
+                return schemas_data[key]
+    return []
+
+
+def extract_schema_fields(schema_data: Any) -> list:
+    """Return the field definitions of a get_schema response."""
+    if isinstance(schema_data, dict):
+        if isinstance(schema_data.get("fields"), list):
+            return schema_data["fields"]
+        if isinstance(schema_data.get("data"), dict):
+            return extract_schema_fields(schema_data["data"])
+    return []
+
+
+async def list_project_schemas(project_key: str, headers: dict) -> dict:
+    """Map schema names to schema IDs from every page of the (cached) schema listing."""
+    params = {
+        "Keyword": "",
+        "PageSize": 100,
+        "SortDescending": True,
+        "SortBy": "CreatedDate",
+        "ProjectKey": project_key
+    }
+    schemas, _, _ = await fetch_all_pages(
+        "list_schemas",
+        project_key,
+        API_CONFIG["LIST_SCHEMAS_URL"],
+        params,
+        headers,
+        method="GET",
+        page_keys=("PageNumber", "PageSize"),
+        first_page_number=1,
+        extract_items=extract_schema_items
+    )
+    return {
+        item.get("schemaName") or item.get("name"): item.get("itemId") or item.get("id")
+        for item in schemas
+    }
+
+
+def merge_schema_fields(current: list, add: list = None, modify: list = None, remove: list = None) -> Tuple[list, list, list, list]:
+    """
+    Apply field additions, modifications and removals to a schema's current field list.
+    
+    Args:
+        current: Current field definitions
+        add: New fields; a field whose name already exists is reported as an error
+        modify: Partial field definitions merged into the existing field of the same name
+        remove: Names of fields to delete
+    
+    Returns:
+        Tuple of (merged field list, deletable field names, change descriptions, errors)
+    """
+    merged = [dict(field) for field in current]
+    by_name = {field.get("name"): field for field in merged}
+    changes = []
+    errors = []
+    
+    for field in add or []:
+        name = field.get("name")
+        if not name:
+            errors.append("Every added field needs a name")
+        elif name in by_name:
+            errors.append(f"Field '{name}' already exists")
+        else:
+            merged.append(dict(field))
+            by_name[name] = merged[-1]
+            changes.append(f"add {name}")
+    
+    for field in modify or []:
+        name = field.get("name")
+        existing = by_name.get(name)
+        if existing is None:
+            errors.append(f"Field '{name}' does not exist")
+            continue
+        changed_keys = sorted(key for key, value in field.items() if existing.get(key) != value)
+        if changed_keys:
+            existing.update(field)
+            changes.append(f"modify {name} ({', '.join(changed_keys)})")
+    
+    deletable = []
+    for name in remove or []:
+        if name not in by_name:
+            errors.append(f"Field '{name}' does not exist")
+            continue
+        deletable.append(name)
+        changes.append(f"remove {name}")
+    merged = [field for field in merged if field.get("name") not in deletable]
+    
+    return merged, deletable, changes, errors
 
 
 @mcp.tool()
-async def update_schema_fields(schema_id: str, fields: list, project_key: str = "") -> str:
+async def update_schema_fields(
+    schema_id: str,
+    fields: list = None,
+    project_key: str = "",
+    add: list = None,
+    modify: list = None,
+    remove: list = None
+) -> str:
     """
     Update schema fields (step 2 of schema field management).
     
+    Either pass the complete field list in `fields`, or describe only the change with `add`,
+    `modify` and `remove`. In the second mode the current schema is fetched (from the cache
+    when fresh), merged with the change and deleted fields are sent as deletableFieldNames;
+    nothing is sent if the schema already matches.
+    
     Args:
         schema_id: The ID of the schema to update
         fields: Complete list of fields for the schema (existing + new)
         project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        add: New field definitions to append
+        modify: Partial field definitions (matched by name) to merge into existing fields
+        remove: Names of fields to delete
     
     Returns:
         JSON string with update result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
         # Prepare headers matching the curl example
@@ -707,22 +2973,63 @@ async def update_schema_fields(schema_id: str, fields: list, project_key: str =
             "x-blocks-key": "d7e5554c758541db8a18694b64ef423d"
         }
         
+        diff_mode = add is not None or modify is not None or remove is not None
+        if diff_mode == (fields is not None):
+            return dump_result({
+                "status": "error",
+                "message": "Provide either the complete 'fields' list or 'add'/'modify'/'remove', not both."
+            })
+        
+        deletable_field_names = []
+        changes = []
+        if diff_mode:
+            schema_data = await fetch_json(
+                "get_schema",
+                project_key,
+                "GET",
+                f"{API_CONFIG['GET_SCHEMA_URL']}/{schema_id}",
+                cache_params={"schema_id": schema_id},
+                headers=headers
+            )
+            fields, deletable_field_names, changes, errors = merge_schema_fields(
+                extract_schema_fields(schema_data),
+                add=add,
+                modify=modify,
+                remove=remove
+            )
+            if errors:
+                return dump_result({
+                    "status": "error",
+                    "message": f"Invalid field changes for schema {schema_id}",
+                    "errors": errors
+                })
+            if not changes:
+                return dump_result({
+                    "status": "success",
+                    "message": f"Schema {schema_id} already has the requested fields; nothing was sent",
+                    "schema_id": schema_id,
+                    "changes": []
+                })
+        
         # Prepare payload matching the curl example
         payload = {
             "fields": fields,
             "schemaDefinitionItemId": schema_id,
-            "deletableFieldNames": []
+            "deletableFieldNames": deletable_field_names
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["SCHEMA_FIELDS_URL"],
-                headers=headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            update_data = response.json()
+        response = await api_request(
+            "POST",
+            API_CONFIG["SCHEMA_FIELDS_URL"],
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        update_data = response.json()
+        
+        # Drop cached reads of this schema so the next get_schema sees the new fields
+        invalidate_cache("get_schema", match={"schema_id": schema_id})
+        invalidate_cache("list_schemas", project_key)
         
         result = {
             "status": "success", 
@@ -731,21 +3038,24 @@ async def update_schema_fields(schema_id: str, fields: list, project_key: str =
             "updated_fields": fields,
             "response": update_data
         }
+        if diff_mode:
+            result["changes"] = changes
+            result["deleted_fields"] = deletable_field_names
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error updating schema fields: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
         
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error updating schema fields: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -762,19 +3072,19 @@ async def finalize_schema(schema_id: str, project_key: str = "") -> str:
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
         # Prepare headers matching the curl example
@@ -800,14 +3110,13 @@ async def finalize_schema(schema_id: str, project_key: str = "") -> str:
         # Get finalized schema data
         url = f"{API_CONFIG['GET_SCHEMA_URL']}/{schema_id}"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            schema_data = response.json()
+        response = await api_request(
+            "GET",
+            url,
+            headers=headers
+        )
+        response.raise_for_status()
+        schema_data = response.json()
         
         result = {
             "status": "success",
@@ -815,20 +3124,47 @@ async def finalize_schema(schema_id: str, project_key: str = "") -> str:
             "schema": schema_data
         }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error finalizing schema: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
         
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error finalizing schema: {str(e)}"
-        }, indent=2)
+        })
+
+
+def social_login_payload(
+    project_key: str,
+    item_id: str = "682c40c3872fab1bc2cc8988",
+    refresh_token_minutes: int = 300,
+    access_token_minutes: int = 15,
+    remember_me_minutes: int = 43200,
+    allowed_grant_types: list = None,
+    wrong_attempts_lock: int = 5,
+    lock_duration_minutes: int = 5
+) -> dict:
+    """Build the authentication configuration payload (shared by activate_social_login and apply_project_plan)."""
+    # Set default allowed grant types if not provided
+    if allowed_grant_types is None:
+        allowed_grant_types = ["password", "refresh_token", "social"]
+    
+    return {
+        "itemId": item_id,
+        "refreshTokenValidForNumberMinutes": refresh_token_minutes,
+        "accessTokenValidForNumberMinutes": access_token_minutes,
+        "rememberMeRefreshTokenValidForNumberMinutes": remember_me_minutes,
+        "allowedGrantTypes": allowed_grant_types,
+        "getNumberOfWrongAttemptsToLockTheAccount": wrong_attempts_lock,
+        "accountLockDurationInMinutes": lock_duration_minutes,
+        "projectKey": project_key
+    }
 
 
 @mcp.tool()
@@ -840,7 +3176,8 @@ async def activate_social_login(
     remember_me_minutes: int = 43200,
     allowed_grant_types: list = None,
     wrong_attempts_lock: int = 5,
-    lock_duration_minutes: int = 5
+    lock_duration_minutes: int = 5,
+    readback: str = ""
 ) -> str:
     """
     Activate social login for the project by updating authentication configuration.
@@ -854,30 +3191,34 @@ async def activate_social_login(
         allowed_grant_types: List of allowed grant types (default: ["password", "refresh_token", "social"])
         wrong_attempts_lock: Number of wrong attempts to lock account (default: 5)
         lock_duration_minutes: Account lock duration in minutes (default: 5)
+        readback: Post-write read-back mode: "full", "delta", "deferred" or "none" (default: server setting)
     
     Returns:
         JSON string with social login activation result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
-        # Set default allowed grant types if not provided
-        if allowed_grant_types is None:
-            allowed_grant_types = ["password", "refresh_token", "social"]
+        readback_mode = resolve_readback_mode(readback)
+        if not readback_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid readback mode '{readback}'. Must be one of: full, delta, deferred, none."
+            })
         
         # Prepare headers matching the curl example
         headers = {
@@ -900,35 +3241,29 @@ async def activate_social_login(
         }
         
         # Prepare payload for social login activation
-        config_payload = {
-            "itemId": item_id,
-            "refreshTokenValidForNumberMinutes": refresh_token_minutes,
-            "accessTokenValidForNumberMinutes": access_token_minutes,
-            "rememberMeRefreshTokenValidForNumberMinutes": remember_me_minutes,
-            "allowedGrantTypes": allowed_grant_types,
-            "getNumberOfWrongAttemptsToLockTheAccount": wrong_attempts_lock,
-            "accountLockDurationInMinutes": lock_duration_minutes,
-            "projectKey": project_key
-        }
+        config_payload = social_login_payload(
+            project_key,
+            item_id,
+            refresh_token_minutes,
+            access_token_minutes,
+            remember_me_minutes,
+            allowed_grant_types,
+            wrong_attempts_lock,
+            lock_duration_minutes
+        )
+        allowed_grant_types = config_payload["allowedGrantTypes"]
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["UPDATE_CONFIG_URL"],
-                headers=headers,
-                json=config_payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            response_data = response.json()
+        response = await api_request(
+            "POST",
+            API_CONFIG["UPDATE_CONFIG_URL"],
+            headers=headers,
+            json=config_payload
+        )
+        response.raise_for_status()
+        response_data = response.json()
+        
+        invalidate_cache("get_authentication_config", project_key)
         
-        # Get the updated configuration to confirm changes
-        try:
-            config_result = await get_authentication_config(project_key)
-            config_result_data = json.loads(config_result)
-            updated_config = config_result_data.get("configuration") if config_result_data.get("status") == "success" else None
-        except Exception as config_error:
-            updated_config = f"Could not fetch updated config: {str(config_error)}"
-
         result = {
             "status": "success",
             "message": f"Social login activated successfully for project {project_key}",
@@ -940,54 +3275,71 @@ async def activate_social_login(
                 "access_token_minutes": access_token_minutes,
                 "remember_me_minutes": remember_me_minutes
             },
-            "response": response_data,
-            "updated_configuration": updated_config
+            "response": response_data
         }
         
-        return json.dumps(result, indent=2)
+        if readback_mode == "full":
+            # Get the updated configuration to confirm changes
+            try:
+                config_result = await get_authentication_config(project_key)
+                config_result_data = json.loads(config_result)
+                updated_config = config_result_data.get("configuration") if config_result_data.get("status") == "success" else None
+            except Exception as config_error:
+                updated_config = f"Could not fetch updated config: {str(config_error)}"
+            result["updated_configuration"] = updated_config
+        else:
+            apply_readback_mode(
+                result,
+                readback_mode,
+                {"action": "updated", "item_id": item_id, "allowed_grant_types": allowed_grant_types},
+                lambda: get_authentication_config(project_key)
+            )
+        
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error during social login activation: {e.response.status_code}",
             "details": e.response.text,
             "config_payload": config_payload if 'config_payload' in locals() else None
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error activating social login: {str(e)}",
             "config_payload": config_payload if 'config_payload' in locals() else None
-        }, indent=2)
+        })
 
 
 @mcp.tool()
-async def get_authentication_config(project_key: str = "") -> str:
+async def get_authentication_config(project_key: str = "", bypass_cache: bool = False) -> str:
     """
     Get the current authentication configuration for the project.
     
     Args:
         project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        bypass_cache: Skip the response cache and fetch fresh data (default: False)
     
     Returns:
         JSON string with current authentication configuration
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
         # Prepare headers matching the curl example
@@ -1015,15 +3367,16 @@ async def get_authentication_config(project_key: str = "") -> str:
             "ProjectKey": project_key
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                API_CONFIG["GET_CONFIG_URL"],
-                headers=headers,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            config_data = response.json()
+        config_data = await fetch_json(
+            "get_authentication_config",
+            project_key,
+            "GET",
+            API_CONFIG["GET_CONFIG_URL"],
+            cache_params=params,
+            bypass_cache=bypass_cache,
+            headers=headers,
+            params=params
+        )
         
         result = {
             "status": "success",
@@ -1032,20 +3385,20 @@ async def get_authentication_config(project_key: str = "") -> str:
             "configuration": config_data
         }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error getting authentication config: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error getting authentication config: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -1067,8 +3420,9 @@ async def set_application_domain(domain: str, tenant_id: str, project_name: str
     app_state["project_name"] = project_name
     if tenant_group_id:
         app_state["tenant_group_id"] = tenant_group_id
+    save_persistent_state()
     
-    return json.dumps({
+    return dump_result({
         "status": "success",
         "message": "Application domain and tenant ID set successfully",
         "global_state": {
@@ -1076,7 +3430,7 @@ async def set_application_domain(domain: str, tenant_id: str, project_name: str
             "tenant_id": app_state["tenant_id"],
             "project_name": app_state["project_name"]
         }
-    }, indent=2)
+    })
 
 
 @mcp.tool()
@@ -1091,17 +3445,17 @@ async def check_blocks_cli() -> str:
     result = await run_command("blocks --version")
     
     if result["success"]:
-        return json.dumps({
+        return dump_result({
             "status": "success",
             "message": "Blocks CLI is installed and available",
             "version": result["stdout"]
-        }, indent=2)
+        })
     else:
-        return json.dumps({
+        return dump_result({
             "status": "not_installed",
             "message": "Blocks CLI is not installed",
             "error": result["stderr"]
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -1118,19 +3472,19 @@ async def install_blocks_cli() -> str:
         # Verify installation
         verify_result = await run_command("blocks --version")
         
-        return json.dumps({
+        return dump_result({
             "status": "success",
             "message": "Blocks CLI installed successfully",
             "installation_output": result["stdout"],
             "version": verify_result["stdout"] if verify_result["success"] else "Unknown"
-        }, indent=2)
+        })
     else:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": "Failed to install Blocks CLI",
             "error": result["stderr"],
             "output": result["stdout"]
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -1151,10 +3505,10 @@ async def create_local_repository(repository_name: str = "",
     try:
         # Check if we have the required information
         if not app_state["tenant_id"] or not app_state["application_domain"]:
-            return json.dumps({
+            return dump_result({
                 "status": "error",
                 "message": "Missing tenant ID or application domain. Please run get_projects or set_application_domain first."
-            }, indent=2)
+            })
         
         # Use project name from global state if repository_name is not provided
         if not repository_name:
@@ -1166,11 +3520,11 @@ async def create_local_repository(repository_name: str = "",
         # Check if Blocks CLI is available
         cli_check = await run_command("blocks --version")
         if not cli_check["success"]:
-            return json.dumps({
+            return dump_result({
                 "status": "error",
                 "message": "Blocks CLI is not installed. Please run install_blocks_cli first.",
                 "details": cli_check["stderr"]
-            }, indent=2)
+            })
         
         # Build the command
         cli_flag = "--cli" if use_cli else ""
@@ -1180,7 +3534,7 @@ async def create_local_repository(repository_name: str = "",
         result = await run_command(command)
         
         if result["success"]:
-            return json.dumps({
+            return dump_result({
                 "status": "success",
                 "message": f"Local repository '{repository_name}' created successfully",
                 "command_used": command,
@@ -1188,21 +3542,21 @@ async def create_local_repository(repository_name: str = "",
                 "tenant_id": app_state["tenant_id"],
                 "application_domain": app_state["application_domain"],
                 "git_prompt": "Git initialization is mandatory for deployment to Selise Cloud. Use the 'init_git_repository' tool to initialize git with your GitHub repository."
-            }, indent=2)
+            })
         else:
-            return json.dumps({
+            return dump_result({
                 "status": "error",
                 "message": "Failed to create local repository",
                 "command_used": command,
                 "error": result["stderr"],
                 "output": result["stdout"]
-            }, indent=2)
+            })
         
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error during repository creation: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -1224,10 +3578,10 @@ async def init_git_repository(github_name: str, repo_name: str, directory_path:
         # Change to the specified directory if provided
         if directory_path != ".":
             if not os.path.exists(directory_path):
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": f"Directory '{directory_path}' does not exist"
-                }, indent=2)
+                })
             os.chdir(directory_path)
         
         commands = [
@@ -1251,25 +3605,25 @@ async def init_git_repository(github_name: str, repo_name: str, directory_path:
             
             # If any command fails, return the error
             if not result["success"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": f"Git initialization failed at command: {command}",
                     "error": result["stderr"],
                     "commands_executed": results
-                }, indent=2)
+                })
         
-        return json.dumps({
+        return dump_result({
             "status": "success",
             "message": f"Git repository initialized successfully with remote origin: https://github.com/{github_name}/{repo_name}",
             "branch": "dev",
             "commands_executed": results
-        }, indent=2)
+        })
         
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error during git initialization: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -1295,11 +3649,11 @@ async def create_project(
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Prepare headers with authorization
         headers = get_auth_headers()
@@ -1323,27 +3677,32 @@ async def create_project(
             }]
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["CREATE_URL"],
-                headers=headers,
-                json=create_payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            create_data = response.json()
+        response = await api_request(
+            "POST",
+            API_CONFIG["CREATE_URL"],
+            headers=headers,
+            json=create_payload
+        )
+        response.raise_for_status()
+        create_data = response.json()
         
         tenant_group_id = create_data.get("tenantGroupId")
         
         if not tenant_group_id:
-            return json.dumps({
+            return dump_result({
                 "status": "error",
                 "message": "Project creation failed. No tenantGroupId received.",
                 "response": create_data
-            }, indent=2)
+            })
         
-        # Try to get the tenant ID and real application domain
-        tenant_id = await get_tenant_id(tenant_group_id, project_name)
+        # Fetch the tenant group's project listing once and read tenant ID, domain and item ID from it
+        try:
+            project = await wait_for_project(tenant_group_id, project_name)
+        except Exception as index_error:
+            log_event(logging.WARNING, "tenant_id_error", tenant_group_id=tenant_group_id, project=project_name, error=str(index_error))
+            project = None
+        
+        tenant_id = project.get("tenantId") if project else None
         application_domain = None
         
         if tenant_id:
@@ -1351,34 +3710,31 @@ async def create_project(
             app_state["tenant_group_id"] = tenant_group_id
             app_state["project_name"] = project_name
             
-            # Try to get the real application domain using the new method
+            # Try to get the real application domain from the listing entry
             try:
-                application_domain = await get_application_domain_by_tenant_group(tenant_group_id, project_name)
+                application_domain = project.get("applicationDomain")
+                
+                if not application_domain and project.get("itemId"):
+                    # Fallback: look up the project details by itemId
+                    application_domain = await get_application_domain(project["itemId"])
+                
+                if not application_domain:
+                    # Fallback: use applicationContexts from the listing if present
+                    contexts = project.get("applicationContexts", [])
+                    if contexts and contexts[0].get("domain"):
+                        application_domain = contexts[0]["domain"]
                 
+                # If we still couldn't get the real domain, keep placeholder
                 if application_domain:
                     app_state["application_domain"] = application_domain
                 else:
-                    # Fallback: try the old method with get_projects
-                    projects_result = await get_projects(tenant_group_id)
-                    projects_data = json.loads(projects_result)
-                    
-                    if projects_data.get("status") == "success":
-                        # Find the project and extract its real domain
-                        for project_info in projects_data.get("projects", []):
-                            if project_info.get("project_name") == project_name:
-                                contexts = project_info.get("application_contexts", [])
-                                if contexts and contexts[0].get("domain"):
-                                    application_domain = contexts[0]["domain"]
-                                    app_state["application_domain"] = application_domain
-                                    break
-                    
-                    # If we still couldn't get the real domain, keep placeholder
-                    if not application_domain:
-                        app_state["application_domain"] = f"https://dev-{project_name}-placeholder.seliseblocks.com"
+                    app_state["application_domain"] = f"https://dev-{project_name}-placeholder.seliseblocks.com"
                     
             except Exception as domain_error:
-                print(f"Error fetching real domain: {domain_error}")
+                log_event(logging.WARNING, "project_domain_error", project=project_name, error=str(domain_error))
                 app_state["application_domain"] = f"https://dev-{project_name}-placeholder.seliseblocks.com"
+            
+            save_persistent_state()
         
         result = {
             "status": "success",
@@ -1397,20 +3753,20 @@ async def create_project(
             }
         }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error during project creation: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error during project creation: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -1438,10 +3794,20 @@ async def get_auth_status() -> str:
         status = {
             "authenticated": False,
             "message": "Authentication token has expired",
-            "expired_at": auth_state["expires_at"].isoformat() if auth_state["expires_at"] else None
+            "expired_at": auth_state["expires_at"].isoformat() if auth_state["expires_at"] else None,
+            "has_refresh_token": auth_state["refresh_token"] is not None
+        }
+    
+    if auth_state["access_token"]:
+        status["auto_refresh"] = {
+            "enabled": TOKEN_REFRESH_CONFIG["enabled"],
+            "scheduled": refresh_state["scheduler"] is not None and not refresh_state["scheduler"].done(),
+            "refresh_count": refresh_state["refresh_count"],
+            "last_refreshed_at": refresh_state["last_refreshed_at"].isoformat() if refresh_state["last_refreshed_at"] else None,
+            "last_error": refresh_state["last_error"]
         }
     
-    return json.dumps(status, indent=2)
+    return dump_result(status)
 
 
 @mcp.tool()
@@ -1452,7 +3818,7 @@ async def get_global_state() -> str:
     Returns:
         JSON string with current global state
     """
-    return json.dumps({
+    return dump_result({
         "auth_state": {
             "authenticated": is_token_valid(),
             "token_type": auth_state.get("token_type"),
@@ -1462,8 +3828,105 @@ async def get_global_state() -> str:
             "application_domain": app_state["application_domain"],
             "tenant_id": app_state["tenant_id"],
             "project_name": app_state["project_name"]
+        },
+        "http_client": {
+            "http2_requested": HTTP_CONFIG["http2"],
+            "http2_enabled": http_state["http2"],
+            "max_connections": HTTP_CONFIG["max_connections"],
+            "max_connections_per_host": HTTP_CONFIG["max_connections_per_host"]
+        },
+        "rate_limits": {
+            "enabled": RATE_LIMIT_CONFIG["enabled"],
+            "services": {
+                service: {
+                    "rate": bucket["rate"],
+                    "burst": bucket["burst"],
+                    "tokens": round(bucket["tokens"], 2),
+                    "queue_depth": bucket["queue_depth"],
+                    "max_queue_depth": bucket["max_queue_depth"],
+                    "requests": bucket["requests"],
+                    "delayed": bucket["delayed"],
+                    "wait_seconds": round(bucket["wait_seconds"], 3),
+                    "max_wait_seconds": round(bucket["max_wait_seconds"], 3)
+                }
+                for service, bucket in rate_limit_state["buckets"].items()
+            }
+        },
+        "circuit_breakers": {
+            "enabled": CIRCUIT_CONFIG["enabled"],
+            "failure_threshold": CIRCUIT_CONFIG["failure_threshold"],
+            "reset_timeout": CIRCUIT_CONFIG["reset_timeout"],
+            "services": {
+                service: {key: value for key, value in circuit.items() if key != "opened_at"}
+                for service, circuit in circuit_state["circuits"].items()
+            }
+        },
+        "retries": {
+            "enabled": RETRY_CONFIG["enabled"],
+            "total": retry_state["retries"],
+            "retry_wait_seconds": round(retry_state["retry_wait_seconds"], 3),
+            "budget_remaining": round(retry_state["budget"], 2),
+            "budget_exhausted": retry_state["budget_exhausted"],
+            "by_tool": {
+                name: {**totals, "retry_wait_seconds": round(totals["retry_wait_seconds"], 3)}
+                for name, totals in retry_state["tools"].items()
+            }
+        },
+        "cache": {
+            "enabled": CACHE_CONFIG["enabled"],
+            "entries": len(cache_state["entries"]),
+            "bytes": cache_state["bytes"],
+            "hits": cache_state["hits"],
+            "misses": cache_state["misses"],
+            "evictions": cache_state["evictions"],
+            "invalidations": cache_state["invalidations"]
+        },
+        "coalescing": {
+            "upstream_requests": coalesce_state["requests"],
+            "coalesced": coalesce_state["hits"],
+            "in_flight": len(coalesce_state["in_flight"]),
+            "by_endpoint": coalesce_state["by_endpoint"]
+        },
+        "state_store": {
+            "enabled": STATE_STORE_CONFIG["enabled"],
+            "path": STATE_STORE_CONFIG["path"] if STATE_STORE_CONFIG["enabled"] else None,
+            "restored_at": store_state["restored_at"].isoformat() if store_state["restored_at"] else None,
+            "last_saved_at": store_state["last_saved_at"].isoformat() if store_state["last_saved_at"] else None,
+            "last_error": store_state["last_error"]
+        },
+        "output": {
+            "mode": resolve_output_mode("") or "pretty",
+            "encoder": "orjson" if orjson is not None else "json"
+        }
+    })
+
+
+@mcp.tool()
+async def get_server_metrics(reset: bool = False) -> str:
+    """
+    Get latency and traffic metrics per tool and per upstream endpoint.
+    
+    Latencies are reported as count, mean, p50/p95/p99 and max in milliseconds, estimated from
+    fixed histogram buckets. Upstream endpoints are named after their API_CONFIG entry.
+    
+    Args:
+        reset: Clear the metrics after reading them (default: False)
+    
+    Returns:
+        JSON string with tool, upstream and cache metrics
+    """
+    metrics = get_metrics_snapshot()
+    if reset:
+        reset_metrics()
+    
+    return dump_result({
+        "status": "success",
+        "metrics": metrics,
+        "exporters": {
+            "file": METRICS_CONFIG["file"] or None,
+            "port": METRICS_CONFIG["port"] or None
         }
-    }, indent=2)
+    })
 
 
 @mcp.tool()
@@ -1472,7 +3935,8 @@ async def save_captcha_config(
     site_key: str,
     secret_key: str,
     project_key: str = "",
-    is_enable: bool = False
+    is_enable: bool = False,
+    readback: str = ""
 ) -> str:
     """
     Save CAPTCHA configuration for Google reCAPTCHA or hCaptcha.
@@ -1483,33 +3947,41 @@ async def save_captcha_config(
         secret_key: Private secret key from CAPTCHA provider console
         project_key: Project key (tenant ID). Uses global tenant_id if not provided
         is_enable: Whether to enable the configuration immediately (default: False)
+        readback: Post-write read-back mode: "full", "delta", "deferred" or "none" (default: server setting)
     
     Returns:
         JSON string with CAPTCHA configuration save result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
+        readback_mode = resolve_readback_mode(readback)
+        if not readback_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid readback mode '{readback}'. Must be one of: full, delta, deferred, none."
+            })
+        
         # Validate provider
         if provider not in ["recaptcha", "hcaptcha"]:
-            return json.dumps({
+            return dump_result({
                 "status": "error",
                 "message": "Invalid provider. Must be 'recaptcha' for Google reCAPTCHA or 'hcaptcha' for hCaptcha."
-            }, indent=2)
+            })
         
         headers = get_auth_headers()
         
@@ -1522,25 +3994,18 @@ async def save_captcha_config(
             "captchaGenerator": ""
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["CAPTCHA_SAVE_URL"],
-                headers=headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            save_data = response.json()
+        response = await api_request(
+            "POST",
+            API_CONFIG["CAPTCHA_SAVE_URL"],
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        save_data = response.json()
+        
+        invalidate_cache("list_captcha_configs", project_key)
         
         if save_data.get("isSuccess"):
-            # Get updated configurations to show the result
-            try:
-                list_result = await list_captcha_configs(project_key)
-                list_data = json.loads(list_result)
-                updated_configs = list_data.get("configurations", []) if list_data.get("status") == "success" else []
-            except Exception:
-                updated_configs = []
-            
             result = {
                 "status": "success",
                 "message": f"{provider.capitalize()} CAPTCHA configuration saved successfully",
@@ -1550,9 +4015,25 @@ async def save_captcha_config(
                     "is_enabled": is_enable,
                     "site_key": site_key[:20] + "..." if len(site_key) > 20 else site_key
                 },
-                "response": save_data,
-                "updated_configurations": updated_configs
+                "response": save_data
             }
+            
+            if readback_mode == "full":
+                # Get updated configurations to show the result
+                try:
+                    list_result = await list_captcha_configs(project_key, output="raw")
+                    list_data = json.loads(list_result)
+                    updated_configs = list_data.get("configurations", []) if list_data.get("status") == "success" else []
+                except Exception:
+                    updated_configs = []
+                result["updated_configurations"] = updated_configs
+            else:
+                apply_readback_mode(
+                    result,
+                    readback_mode,
+                    {"action": "saved", "provider": provider, "is_enable": is_enable},
+                    lambda: list_captcha_configs(project_key)
+                )
         else:
             result = {
                 "status": "error", 
@@ -1561,62 +4042,73 @@ async def save_captcha_config(
                 "response": save_data
             }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error saving CAPTCHA config: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error saving CAPTCHA config: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
-async def list_captcha_configs(project_key: str = "") -> str:
+async def list_captcha_configs(project_key: str = "", bypass_cache: bool = False, output: str = "", fields: list = None) -> str:
     """
     List all CAPTCHA configurations for a project.
     
     Args:
         project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        bypass_cache: Skip the response cache and fetch fresh data (default: False)
+        output: Output mode: pretty, compact, summary or raw (default: SELISE_OUTPUT_MODE)
+        fields: Keep only these keys in each raw item, e.g. ["itemId", "name"] (optional)
     
     Returns:
         JSON string with list of CAPTCHA configurations
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
+        output_mode = resolve_output_mode(output)
+        if not output_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid output mode '{output}'. Must be one of: pretty, compact, summary, raw."
+            })
+        
         headers = get_auth_headers()
         params = {"ProjectKey": project_key}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                API_CONFIG["CAPTCHA_LIST_URL"],
-                headers=headers,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            configs_data = response.json()
+        configs_data = await fetch_json(
+            "list_captcha_configs",
+            project_key,
+            "GET",
+            API_CONFIG["CAPTCHA_LIST_URL"],
+            cache_params=params,
+            bypass_cache=bypass_cache,
+            headers=headers,
+            params=params
+        )
         
         configurations = configs_data.get("configurations", [])
         
@@ -1638,24 +4130,24 @@ async def list_captcha_configs(project_key: str = "") -> str:
                 "created_date": config.get("createdDate")
             })
         
-        return json.dumps(result, indent=2)
+        return dump_result(result, output_mode, fields)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error listing CAPTCHA configs: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error listing CAPTCHA configs: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
-async def update_captcha_status(item_id: str, is_enable: bool, project_key: str = "") -> str:
+async def update_captcha_status(item_id: str, is_enable: bool, project_key: str = "", readback: str = "") -> str:
     """
     Enable or disable a CAPTCHA configuration.
     
@@ -1663,27 +4155,35 @@ async def update_captcha_status(item_id: str, is_enable: bool, project_key: str
         item_id: The ID of the CAPTCHA configuration to update
         is_enable: True to enable, False to disable the configuration
         project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        readback: Post-write read-back mode: "full", "delta", "deferred" or "none" (default: server setting)
     
     Returns:
         JSON string with status update result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
+        readback_mode = resolve_readback_mode(readback)
+        if not readback_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid readback mode '{readback}'. Must be one of: full, delta, deferred, none."
+            })
+        
         headers = get_auth_headers()
         
         payload = {
@@ -1692,27 +4192,20 @@ async def update_captcha_status(item_id: str, is_enable: bool, project_key: str
             "itemId": item_id
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["CAPTCHA_UPDATE_STATUS_URL"],
-                headers=headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            update_data = response.json()
+        response = await api_request(
+            "POST",
+            API_CONFIG["CAPTCHA_UPDATE_STATUS_URL"],
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        update_data = response.json()
+        
+        invalidate_cache("list_captcha_configs", project_key)
         
         if update_data.get("isSuccess"):
             status_text = "enabled" if is_enable else "disabled"
             
-            # Get updated configurations to confirm the change
-            try:
-                list_result = await list_captcha_configs(project_key)
-                list_data = json.loads(list_result)
-                updated_configs = list_data.get("configurations", []) if list_data.get("status") == "success" else []
-            except Exception:
-                updated_configs = []
-            
             result = {
                 "status": "success",
                 "message": f"CAPTCHA configuration {status_text} successfully",
@@ -1721,9 +4214,25 @@ async def update_captcha_status(item_id: str, is_enable: bool, project_key: str
                     "project_key": project_key,
                     "is_enabled": is_enable
                 },
-                "response": update_data,
-                "updated_configurations": updated_configs
+                "response": update_data
             }
+            
+            if readback_mode == "full":
+                # Get updated configurations to confirm the change
+                try:
+                    list_result = await list_captcha_configs(project_key, output="raw")
+                    list_data = json.loads(list_result)
+                    updated_configs = list_data.get("configurations", []) if list_data.get("status") == "success" else []
+                except Exception:
+                    updated_configs = []
+                result["updated_configurations"] = updated_configs
+            else:
+                apply_readback_mode(
+                    result,
+                    readback_mode,
+                    {"action": "status_changed", "item_id": item_id, "is_enable": is_enable},
+                    lambda: list_captcha_configs(project_key)
+                )
         else:
             result = {
                 "status": "error",
@@ -1732,20 +4241,20 @@ async def update_captcha_status(item_id: str, is_enable: bool, project_key: str
                 "response": update_data
             }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error updating CAPTCHA status: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error updating CAPTCHA status: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -1755,7 +4264,13 @@ async def list_roles(
     page_size: int = 10,
     search: str = "",
     sort_by: str = "Name",
-    sort_descending: bool = False
+    sort_descending: bool = False,
+    bypass_cache: bool = False,
+    all_pages: bool = False,
+    stream: bool = False,
+    ctx: Optional[Context] = None,
+    output: str = "",
+    fields: list = None
 ) -> str:
     """
     List all roles for a project.
@@ -1767,27 +4282,39 @@ async def list_roles(
         search: Search filter (default: "")
         sort_by: Field to sort by (default: "Name")
         sort_descending: Sort order (default: false)
+        bypass_cache: Skip the response cache and fetch fresh data (default: False)
+        all_pages: Fetch every page concurrently and merge them into one de-duplicated result (default: False)
+        stream: With all_pages, stream each page to the client as a progress notification as it arrives (default: False)
+        output: Output mode: pretty, compact, summary or raw (default: SELISE_OUTPUT_MODE)
+        fields: Keep only these keys in each raw item, e.g. ["itemId", "name"] (optional)
     
     Returns:
         JSON string with role list result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
+        output_mode = resolve_output_mode(output)
+        if not output_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid output mode '{output}'. Must be one of: pretty, compact, summary, raw."
+            })
+        
         headers = get_auth_headers()
         
         payload = {
@@ -1803,18 +4330,30 @@ async def list_roles(
             }
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        if all_pages:
+            roles, total_count, pages_fetched = await fetch_all_pages(
+                "list_roles",
+                project_key,
+                API_CONFIG["IAM_GET_ROLES_URL"],
+                payload,
+                headers,
+                bypass_cache=bypass_cache,
+                ctx=ctx if stream else None
+            )
+        else:
+            roles_data = await fetch_json(
+                "list_roles",
+                project_key,
+                "POST",
                 API_CONFIG["IAM_GET_ROLES_URL"],
+                cache_params=payload,
+                bypass_cache=bypass_cache,
                 headers=headers,
-                json=payload,
-                timeout=30.0
+                json=payload
             )
-            response.raise_for_status()
-            roles_data = response.json()
-        
-        roles = roles_data.get("data", [])
-        total_count = roles_data.get("totalCount", 0)
+            
+            roles = roles_data.get("data", [])
+            total_count = roles_data.get("totalCount", 0)
         
         result = {
             "status": "success",
@@ -1824,6 +4363,8 @@ async def list_roles(
             "roles": roles,
             "summary": []
         }
+        if all_pages:
+            result["pages_fetched"] = pages_fetched
         
         # Add summary for easier reading
         for role in roles:
@@ -1836,20 +4377,20 @@ async def list_roles(
                 "created_date": role.get("createdDate")
             })
         
-        return json.dumps(result, indent=2)
+        return dump_result(result, output_mode, fields)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error listing roles: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error listing roles: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -1857,7 +4398,8 @@ async def create_role(
     name: str,
     description: str,
     slug: str,
-    project_key: str = ""
+    project_key: str = "",
+    readback: str = ""
 ) -> str:
     """
     Create a new role.
@@ -1867,27 +4409,35 @@ async def create_role(
         description: Role description
         slug: Role slug (URL-friendly identifier)
         project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        readback: Post-write read-back mode: "full", "delta", "deferred" or "none" (default: server setting)
     
     Returns:
         JSON string with role creation result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
+        readback_mode = resolve_readback_mode(readback)
+        if not readback_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid readback mode '{readback}'. Must be one of: full, delta, deferred, none."
+            })
+        
         headers = get_auth_headers()
         
         payload = {
@@ -1897,25 +4447,18 @@ async def create_role(
             "projectKey": project_key
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["IAM_CREATE_ROLE_URL"],
-                headers=headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            create_data = response.json()
+        response = await api_request(
+            "POST",
+            API_CONFIG["IAM_CREATE_ROLE_URL"],
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        create_data = response.json()
+        
+        invalidate_cache("list_roles", project_key)
         
         if create_data.get("isSuccess"):
-            # Get updated role list to show the result
-            try:
-                list_result = await list_roles(project_key)
-                list_data = json.loads(list_result)
-                updated_roles = list_data.get("roles", []) if list_data.get("status") == "success" else []
-            except Exception:
-                updated_roles = []
-            
             result = {
                 "status": "success",
                 "message": f"Role '{name}' created successfully",
@@ -1926,9 +4469,25 @@ async def create_role(
                     "project_key": project_key,
                     "item_id": create_data.get("itemId")
                 },
-                "response": create_data,
-                "updated_roles": updated_roles
+                "response": create_data
             }
+            
+            if readback_mode == "full":
+                # Get updated role list to show the result
+                try:
+                    list_result = await list_roles(project_key, output="raw")
+                    list_data = json.loads(list_result)
+                    updated_roles = list_data.get("roles", []) if list_data.get("status") == "success" else []
+                except Exception:
+                    updated_roles = []
+                result["updated_roles"] = updated_roles
+            else:
+                apply_readback_mode(
+                    result,
+                    readback_mode,
+                    {"action": "created", "role": {"slug": slug, "name": name, "item_id": create_data.get("itemId")}},
+                    lambda: list_roles(project_key)
+                )
         else:
             result = {
                 "status": "error",
@@ -1937,20 +4496,211 @@ async def create_role(
                 "response": create_data
             }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error creating role: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error creating role: {str(e)}"
-        }, indent=2)
+        })
+
+
+@mcp.tool()
+async def create_roles_bulk(
+    roles: list,
+    project_key: str = "",
+    readback: str = "",
+    dry_run: bool = False
+) -> str:
+    """
+    Create several roles in one call.
+    
+    Existing roles are read once (all pages) and roles whose slug already exists are skipped.
+    The remaining roles are created concurrently, and the role list is read once at the end.
+    
+    Args:
+        roles: List of roles, each {"name": ..., "description": ..., "slug": ...}
+        project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        readback: Post-write read-back mode: "full", "delta", "deferred" or "none" (default: server setting)
+        dry_run: Only report which roles would be created, without writing anything (default: False)
+    
+    Returns:
+        JSON string with a per-role result table
+    """
+    try:
+        # Check if authenticated
+        if not await ensure_authenticated():
+            return dump_result({
+                "status": "error",
+                "message": "Authentication required. Please login first using the login tool."
+            })
+        
+        # Use global tenant_id if project_key is not provided
+        if not project_key:
+            if not app_state["tenant_id"]:
+                return dump_result({
+                    "status": "error",
+                    "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
+                })
+            project_key = app_state["tenant_id"]
+        
+        readback_mode = resolve_readback_mode(readback)
+        if not readback_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid readback mode '{readback}'. Must be one of: full, delta, deferred, none."
+            })
+        
+        invalid = [index for index, role in enumerate(roles) if not isinstance(role, dict) or not role.get("name") or not role.get("slug")]
+        if invalid:
+            return dump_result({
+                "status": "error",
+                "message": f"Every role needs a name and a slug. Invalid entries at index: {invalid}"
+            })
+        
+        headers = get_auth_headers()
+        
+        list_payload = {
+            "projectKey": project_key,
+            "page": 0,
+            "pageSize": 10,
+            "filter": {
+                "search": ""
+            },
+            "sort": {
+                "property": "Name",
+                "isDescending": False
+            }
+        }
+        
+        existing_roles, _, _ = await fetch_all_pages(
+            "list_roles",
+            project_key,
+            API_CONFIG["IAM_GET_ROLES_URL"],
+            list_payload,
+            headers
+        )
+        existing_slugs = {role.get("slug") for role in existing_roles}
+        requested_slugs = set()
+        
+        table = []
+        to_create = []
+        for role in roles:
+            row = {"slug": role["slug"], "name": role["name"]}
+            if role["slug"] in existing_slugs:
+                row["status"] = "skipped"
+                row["reason"] = "slug already exists"
+            elif role["slug"] in requested_slugs:
+                row["status"] = "skipped"
+                row["reason"] = "duplicate slug in request"
+            else:
+                requested_slugs.add(role["slug"])
+                to_create.append((row, role))
+            table.append(row)
+        
+        async def create_one(row: dict, role: dict) -> None:
+            payload = {
+                "name": role["name"],
+                "description": role.get("description", ""),
+                "slug": role["slug"],
+                "projectKey": project_key
+            }
+            try:
+                response = await api_request(
+                    "POST",
+                    API_CONFIG["IAM_CREATE_ROLE_URL"],
+                    headers=headers,
+                    json=payload
+                )
+                response.raise_for_status()
+                create_data = response.json()
+            except httpx.HTTPStatusError as e:
+                row["status"] = "failed"
+                row["error"] = f"HTTP {e.response.status_code}: {e.response.text[:200]}"
+                return
+            except Exception as e:
+                row["status"] = "failed"
+                row["error"] = str(e)
+                return
+            
+            if create_data.get("isSuccess"):
+                row["status"] = "created"
+                row["item_id"] = create_data.get("itemId")
+            else:
+                row["status"] = "failed"
+                row["error"] = create_data.get("errors")
+        
+        if dry_run:
+            for row, _ in to_create:
+                row["status"] = "to_create"
+            return dump_result({
+                "status": "success",
+                "message": f"Would create {len(to_create)} role(s), skip {len(table) - len(to_create)}",
+                "project_key": project_key,
+                "dry_run": True,
+                "counts": {"to_create": len(to_create), "skipped": len(table) - len(to_create)},
+                "results": table
+            })
+        
+        await gather_limited([create_one(row, role) for row, role in to_create], HTTP_CONFIG["fanout_limit"])
+        
+        counts = {status: sum(1 for row in table if row["status"] == status) for status in ("created", "skipped", "failed")}
+        if counts["created"]:
+            invalidate_cache("list_roles", project_key)
+        
+        result = {
+            "status": "success" if not counts["failed"] else ("partial" if counts["created"] else "error"),
+            "message": f"Created {counts['created']}, skipped {counts['skipped']}, failed {counts['failed']} role(s)",
+            "project_key": project_key,
+            "counts": counts,
+            "results": table
+        }
+        
+        if readback_mode == "full":
+            # One final listing instead of one per created role
+            try:
+                updated_roles, _, _ = await fetch_all_pages(
+                    "list_roles",
+                    project_key,
+                    API_CONFIG["IAM_GET_ROLES_URL"],
+                    list_payload,
+                    headers
+                )
+                result["updated_roles"] = [
+                    {"name": role.get("name"), "slug": role.get("slug"), "item_id": role.get("itemId")}
+                    for role in updated_roles
+                ]
+            except Exception:
+                result["updated_roles"] = []
+        else:
+            apply_readback_mode(
+                result,
+                readback_mode,
+                {"action": "created", "roles": [row for row in table if row["status"] == "created"]},
+                lambda: list_roles(project_key, all_pages=True)
+            )
+        
+        return dump_result(result)
+        
+    except httpx.HTTPStatusError as e:
+        return dump_result({
+            "status": "error",
+            "message": f"HTTP error creating roles: {e.response.status_code}",
+            "details": e.response.text
+        })
+    
+    except Exception as e:
+        return dump_result({
+            "status": "error",
+            "message": f"Error creating roles: {str(e)}"
+        })
 
 
 @mcp.tool()
@@ -1962,7 +4712,13 @@ async def list_permissions(
     sort_by: str = "Name",
     sort_descending: bool = False,
     is_built_in: str = "",
-    resource_group: str = ""
+    resource_group: str = "",
+    bypass_cache: bool = False,
+    all_pages: bool = False,
+    stream: bool = False,
+    ctx: Optional[Context] = None,
+    output: str = "",
+    fields: list = None
 ) -> str:
     """
     List all permissions for a project.
@@ -1976,27 +4732,39 @@ async def list_permissions(
         sort_descending: Sort order (default: false)
         is_built_in: Filter by built-in status (default: "")
         resource_group: Filter by resource group (default: "")
+        bypass_cache: Skip the response cache and fetch fresh data (default: False)
+        all_pages: Fetch every page concurrently and merge them into one de-duplicated result (default: False)
+        stream: With all_pages, stream each page to the client as a progress notification as it arrives (default: False)
+        output: Output mode: pretty, compact, summary or raw (default: SELISE_OUTPUT_MODE)
+        fields: Keep only these keys in each raw item, e.g. ["itemId", "name"] (optional)
     
     Returns:
         JSON string with permission list result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
+        output_mode = resolve_output_mode(output)
+        if not output_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid output mode '{output}'. Must be one of: pretty, compact, summary, raw."
+            })
+        
         headers = get_auth_headers()
         
         payload = {
@@ -2015,18 +4783,30 @@ async def list_permissions(
             }
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        if all_pages:
+            permissions, total_count, pages_fetched = await fetch_all_pages(
+                "list_permissions",
+                project_key,
                 API_CONFIG["IAM_GET_PERMISSIONS_URL"],
+                payload,
+                headers,
+                bypass_cache=bypass_cache,
+                ctx=ctx if stream else None
+            )
+        else:
+            permissions_data = await fetch_json(
+                "list_permissions",
+                project_key,
+                "POST",
+                API_CONFIG["IAM_GET_PERMISSIONS_URL"],
+                cache_params=payload,
+                bypass_cache=bypass_cache,
                 headers=headers,
-                json=payload,
-                timeout=30.0
+                json=payload
             )
-            response.raise_for_status()
-            permissions_data = response.json()
-        
-        permissions = permissions_data.get("data", [])
-        total_count = permissions_data.get("totalCount", 0)
+            
+            permissions = permissions_data.get("data", [])
+            total_count = permissions_data.get("totalCount", 0)
         
         result = {
             "status": "success",
@@ -2036,6 +4816,8 @@ async def list_permissions(
             "permissions": permissions,
             "summary": []
         }
+        if all_pages:
+            result["pages_fetched"] = pages_fetched
         
         # Add summary for easier reading
         for perm in permissions:
@@ -2050,20 +4832,20 @@ async def list_permissions(
                 "created_date": perm.get("createdDate")
             })
         
-        return json.dumps(result, indent=2)
+        return dump_result(result, output_mode, fields)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error listing permissions: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error listing permissions: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -2076,7 +4858,8 @@ async def create_permission(
     project_key: str = "",
     type: int = 3,
     dependent_permissions: list = None,
-    is_built_in: bool = False
+    is_built_in: bool = False,
+    readback: str = ""
 ) -> str:
     """
     Create a new permission.
@@ -2091,27 +4874,35 @@ async def create_permission(
         type: Permission type (default: 3 for "Data protection")
         dependent_permissions: List of dependent permission IDs (default: [])
         is_built_in: Whether it's a built-in permission (default: false)
+        readback: Post-write read-back mode: "full", "delta", "deferred" or "none" (default: server setting)
     
     Returns:
         JSON string with permission creation result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
+        readback_mode = resolve_readback_mode(readback)
+        if not readback_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid readback mode '{readback}'. Must be one of: full, delta, deferred, none."
+            })
+        
         if dependent_permissions is None:
             dependent_permissions = []
         
@@ -2129,25 +4920,20 @@ async def create_permission(
             "isBuiltIn": is_built_in
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["IAM_CREATE_PERMISSION_URL"],
-                headers=headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            create_data = response.json()
+        response = await api_request(
+            "POST",
+            API_CONFIG["IAM_CREATE_PERMISSION_URL"],
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        create_data = response.json()
+        
+        # Permission changes affect permission listings, role assignments and resource group counts
+        for endpoint in ("list_permissions", "get_role_permissions", "get_resource_groups"):
+            invalidate_cache(endpoint, project_key)
         
         if create_data.get("isSuccess"):
-            # Get updated permission list to show the result
-            try:
-                list_result = await list_permissions(project_key)
-                list_data = json.loads(list_result)
-                updated_permissions = list_data.get("permissions", []) if list_data.get("status") == "success" else []
-            except Exception:
-                updated_permissions = []
-            
             result = {
                 "status": "success",
                 "message": f"Permission '{name}' created successfully",
@@ -2161,9 +4947,25 @@ async def create_permission(
                     "project_key": project_key,
                     "item_id": create_data.get("itemId")
                 },
-                "response": create_data,
-                "updated_permissions": updated_permissions
+                "response": create_data
             }
+            
+            if readback_mode == "full":
+                # Get updated permission list to show the result
+                try:
+                    list_result = await list_permissions(project_key, output="raw")
+                    list_data = json.loads(list_result)
+                    updated_permissions = list_data.get("permissions", []) if list_data.get("status") == "success" else []
+                except Exception:
+                    updated_permissions = []
+                result["updated_permissions"] = updated_permissions
+            else:
+                apply_readback_mode(
+                    result,
+                    readback_mode,
+                    {"action": "created", "permission": {"name": name, "item_id": create_data.get("itemId")}},
+                    lambda: list_permissions(project_key)
+                )
         else:
             result = {
                 "status": "error",
@@ -2172,20 +4974,20 @@ async def create_permission(
                 "response": create_data
             }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error creating permission: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error creating permission: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -2197,160 +4999,461 @@ async def update_permission(
     resource_group: str,
     tags: list,
     project_key: str = "",
-    type: int = 3,
-    dependent_permissions: list = None,
-    is_built_in: bool = False
+    type: int = 3,
+    dependent_permissions: list = None,
+    is_built_in: bool = False,
+    readback: str = ""
+) -> str:
+    """
+    Update an existing permission.
+    
+    Args:
+        item_id: The ID of the permission to update
+        name: Permission name
+        description: Permission description
+        resource: Resource name (arbitrary string)
+        resource_group: Resource group name (arbitrary string)
+        tags: List of action tags (e.g., ["create", "read", "update", "delete"])
+        project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        type: Permission type (default: 3 for "Data protection")
+        dependent_permissions: List of dependent permission IDs (default: [])
+        is_built_in: Whether it's a built-in permission (default: false)
+        readback: Post-write read-back mode: "full", "delta", "deferred" or "none" (default: server setting)
+    
+    Returns:
+        JSON string with permission update result
+    """
+    try:
+        # Check if authenticated
+        if not await ensure_authenticated():
+            return dump_result({
+                "status": "error",
+                "message": "Authentication required. Please login first using the login tool."
+            })
+        
+        # Use global tenant_id if project_key is not provided
+        if not project_key:
+            if not app_state["tenant_id"]:
+                return dump_result({
+                    "status": "error",
+                    "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
+                })
+            project_key = app_state["tenant_id"]
+        
+        readback_mode = resolve_readback_mode(readback)
+        if not readback_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid readback mode '{readback}'. Must be one of: full, delta, deferred, none."
+            })
+        
+        if dependent_permissions is None:
+            dependent_permissions = []
+        
+        headers = get_auth_headers()
+        
+        payload = {
+            "name": name,
+            "type": type,
+            "resource": resource,
+            "resourceGroup": resource_group,
+            "tags": tags,
+            "description": description,
+            "dependentPermissions": dependent_permissions,
+            "projectKey": project_key,
+            "isBuiltIn": is_built_in,
+            "itemId": item_id
+        }
+        
+        response = await api_request(
+            "POST",
+            API_CONFIG["IAM_UPDATE_PERMISSION_URL"],
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        update_data = response.json()
+        
+        # Permission changes affect permission listings, role assignments and resource group counts
+        for endpoint in ("list_permissions", "get_role_permissions", "get_resource_groups"):
+            invalidate_cache(endpoint, project_key)
+        
+        if update_data.get("isSuccess"):
+            result = {
+                "status": "success",
+                "message": f"Permission '{name}' updated successfully",
+                "permission_details": {
+                    "item_id": item_id,
+                    "name": name,
+                    "description": description,
+                    "resource": resource,
+                    "resource_group": resource_group,
+                    "tags": tags,
+                    "type": type,
+                    "project_key": project_key
+                },
+                "response": update_data
+            }
+            
+            if readback_mode == "full":
+                # Get updated permission list to confirm the change
+                try:
+                    list_result = await list_permissions(project_key, output="raw")
+                    list_data = json.loads(list_result)
+                    updated_permissions = list_data.get("permissions", []) if list_data.get("status") == "success" else []
+                except Exception:
+                    updated_permissions = []
+                result["updated_permissions"] = updated_permissions
+            else:
+                apply_readback_mode(
+                    result,
+                    readback_mode,
+                    {"action": "updated", "permission": {"name": name, "item_id": item_id}},
+                    lambda: list_permissions(project_key)
+                )
+        else:
+            result = {
+                "status": "error",
+                "message": "Failed to update permission",
+                "errors": update_data.get("errors"),
+                "response": update_data
+            }
+        
+        return dump_result(result)
+        
+    except httpx.HTTPStatusError as e:
+        return dump_result({
+            "status": "error",
+            "message": f"HTTP error updating permission: {e.response.status_code}",
+            "details": e.response.text
+        })
+    
+    except Exception as e:
+        return dump_result({
+            "status": "error",
+            "message": f"Error updating permission: {str(e)}"
+        })
+
+
+@mcp.tool()
+async def upsert_permissions_bulk(
+    permissions: list,
+    project_key: str = "",
+    allow_new_resource_groups: bool = True,
+    readback: str = "",
+    dry_run: bool = False
 ) -> str:
     """
-    Update an existing permission.
+    Create or update many permissions in one call.
+    
+    Entries are validated against one resource group listing and compared with the full
+    existing permission set. Only new or changed permissions are written, concurrently.
+    An entry matches an existing permission by item_id if given, otherwise by name.
     
     Args:
-        item_id: The ID of the permission to update
-        name: Permission name
-        description: Permission description
-        resource: Resource name (arbitrary string)
-        resource_group: Resource group name (arbitrary string)
-        tags: List of action tags (e.g., ["create", "read", "update", "delete"])
+        permissions: List of permissions, each {"name", "description", "resource", "resource_group", "tags",
+            and optionally "type" (default 3), "dependent_permissions", "is_built_in", "item_id"}
         project_key: Project key (tenant ID). Uses global tenant_id if not provided
-        type: Permission type (default: 3 for "Data protection")
-        dependent_permissions: List of dependent permission IDs (default: [])
-        is_built_in: Whether it's a built-in permission (default: false)
+        allow_new_resource_groups: Accept resource groups that have no permissions yet (default: True).
+            Set to False to reject them, e.g. to catch typos
+        readback: Post-write read-back mode: "full", "delta", "deferred" or "none" (default: server setting)
+        dry_run: Only report what would be created or updated, without writing anything (default: False)
     
     Returns:
-        JSON string with permission update result
+        JSON string with created, updated, unchanged and failed counts and a per-permission result table
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
-        if dependent_permissions is None:
-            dependent_permissions = []
+        readback_mode = resolve_readback_mode(readback)
+        if not readback_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid readback mode '{readback}'. Must be one of: full, delta, deferred, none."
+            })
         
         headers = get_auth_headers()
         
-        payload = {
-            "name": name,
-            "type": type,
-            "resource": resource,
-            "resourceGroup": resource_group,
-            "tags": tags,
-            "description": description,
-            "dependentPermissions": dependent_permissions,
+        list_payload = {
+            "page": 0,
+            "pageSize": 10,
             "projectKey": project_key,
-            "isBuiltIn": is_built_in,
-            "itemId": item_id
+            "roles": [],
+            "sort": {
+                "property": "Name",
+                "isDescending": False
+            },
+            "filter": {
+                "search": "",
+                "isBuiltIn": "",
+                "resourceGroup": ""
+            }
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["IAM_UPDATE_PERMISSION_URL"],
-                headers=headers,
-                json=payload,
-                timeout=30.0
+        groups_data, (existing_permissions, _, _) = await asyncio.gather(
+            fetch_json(
+                "get_resource_groups",
+                project_key,
+                "GET",
+                f"{API_CONFIG['IAM_GET_RESOURCE_GROUPS_URL']}?ProjectKey={project_key}",
+                cache_params=None,
+                headers=headers
+            ),
+            fetch_all_pages(
+                "list_permissions",
+                project_key,
+                API_CONFIG["IAM_GET_PERMISSIONS_URL"],
+                list_payload,
+                headers
             )
-            response.raise_for_status()
-            update_data = response.json()
+        )
+        known_groups = {group.get("resourceGroup") for group in groups_data}
+        by_id = {permission.get("itemId"): permission for permission in existing_permissions}
+        by_name = {permission.get("name"): permission for permission in existing_permissions}
+        
+        table = []
+        writes = []
+        seen_names = set()
+        new_groups = set()
+        for index, entry in enumerate(permissions):
+            row = {"index": index}
+            table.append(row)
+            
+            if not isinstance(entry, dict):
+                row.update({"status": "failed", "error": "Entry must be an object"})
+                continue
+            row["name"] = entry.get("name")
+            
+            missing = [field for field in ("name", "resource", "resource_group") if not entry.get(field)]
+            if missing:
+                row.update({"status": "failed", "error": f"Missing required field(s): {', '.join(missing)}"})
+                continue
+            if not isinstance(entry.get("tags", []), list):
+                row.update({"status": "failed", "error": "tags must be a list"})
+                continue
+            if entry["name"] in seen_names:
+                row.update({"status": "failed", "error": "Duplicate name in request"})
+                continue
+            seen_names.add(entry["name"])
+            
+            if entry["resource_group"] not in known_groups:
+                if not allow_new_resource_groups:
+                    row.update({"status": "failed", "error": f"Unknown resource group '{entry['resource_group']}'"})
+                    continue
+                new_groups.add(entry["resource_group"])
+            
+            if entry.get("item_id"):
+                existing = by_id.get(entry["item_id"])
+                if existing is None:
+                    row.update({"status": "failed", "error": f"No permission with item_id '{entry['item_id']}'"})
+                    continue
+            else:
+                existing = by_name.get(entry["name"])
+            
+            payload = {
+                "name": entry["name"],
+                "type": entry.get("type", 3),
+                "resource": entry["resource"],
+                "resourceGroup": entry["resource_group"],
+                "tags": entry.get("tags", []),
+                "description": entry.get("description", ""),
+                "dependentPermissions": entry.get("dependent_permissions") or [],
+                "projectKey": project_key,
+                "isBuiltIn": entry.get("is_built_in", False)
+            }
+            
+            if existing is None:
+                writes.append((row, "created", API_CONFIG["IAM_CREATE_PERMISSION_URL"], payload))
+                continue
+            
+            row["item_id"] = existing.get("itemId")
+            changed = [
+                field for field in ("name", "type", "resource", "resourceGroup", "isBuiltIn")
+                if existing.get(field) != payload[field]
+            ]
+            if (existing.get("description") or "") != payload["description"]:
+                changed.append("description")
+            if sorted(existing.get("tags") or []) != sorted(payload["tags"]):
+                changed.append("tags")
+            if sorted(existing.get("dependentPermissions") or []) != sorted(payload["dependentPermissions"]):
+                changed.append("dependentPermissions")
+            
+            if not changed:
+                row["status"] = "unchanged"
+            else:
+                row["changed_fields"] = changed
+                writes.append((row, "updated", API_CONFIG["IAM_UPDATE_PERMISSION_URL"], {**payload, "itemId": existing.get("itemId")}))
         
-        if update_data.get("isSuccess"):
-            # Get updated permission list to confirm the change
+        async def write_one(row: dict, action: str, url: str, payload: dict) -> None:
             try:
-                list_result = await list_permissions(project_key)
-                list_data = json.loads(list_result)
-                updated_permissions = list_data.get("permissions", []) if list_data.get("status") == "success" else []
-            except Exception:
-                updated_permissions = []
+                response = await api_request("POST", url, headers=headers, json=payload)
+                response.raise_for_status()
+                write_data = response.json()
+            except httpx.HTTPStatusError as e:
+                row.update({"status": "failed", "error": f"HTTP {e.response.status_code}: {e.response.text[:200]}"})
+                return
+            except Exception as e:
+                row.update({"status": "failed", "error": str(e)})
+                return
             
-            result = {
-                "status": "success",
-                "message": f"Permission '{name}' updated successfully",
-                "permission_details": {
-                    "item_id": item_id,
-                    "name": name,
-                    "description": description,
-                    "resource": resource,
-                    "resource_group": resource_group,
-                    "tags": tags,
-                    "type": type,
-                    "project_key": project_key
-                },
-                "response": update_data,
-                "updated_permissions": updated_permissions
+            if write_data.get("isSuccess"):
+                row["status"] = action
+                if write_data.get("itemId"):
+                    row["item_id"] = write_data.get("itemId")
+            else:
+                row.update({"status": "failed", "error": write_data.get("errors")})
+        
+        if dry_run:
+            for row, action, _, _ in writes:
+                row["status"] = "to_create" if action == "created" else "to_update"
+            counts = {
+                status: sum(1 for row in table if row.get("status") == status)
+                for status in ("to_create", "to_update", "unchanged", "failed")
             }
-        else:
             result = {
-                "status": "error",
-                "message": "Failed to update permission",
-                "errors": update_data.get("errors"),
-                "response": update_data
+                "status": "success" if not counts["failed"] else "error",
+                "message": (
+                    f"Would create {counts['to_create']}, update {counts['to_update']}; "
+                    f"unchanged {counts['unchanged']}, invalid {counts['failed']} permission(s)"
+                ),
+                "project_key": project_key,
+                "dry_run": True,
+                "counts": counts,
+                "results": table
             }
+            if new_groups:
+                result["new_resource_groups"] = sorted(new_groups)
+            return dump_result(result)
         
-        return json.dumps(result, indent=2)
+        await gather_limited([write_one(*write) for write in writes], HTTP_CONFIG["fanout_limit"])
+        
+        counts = {
+            status: sum(1 for row in table if row.get("status") == status)
+            for status in ("created", "updated", "unchanged", "failed")
+        }
+        if counts["created"] or counts["updated"]:
+            invalidate_cache("list_permissions", project_key)
+            invalidate_cache("get_role_permissions", project_key)
+            invalidate_cache("get_resource_groups", project_key)
+        
+        written = counts["created"] + counts["updated"]
+        result = {
+            "status": "success" if not counts["failed"] else ("partial" if written or counts["unchanged"] else "error"),
+            "message": (
+                f"Created {counts['created']}, updated {counts['updated']}, "
+                f"unchanged {counts['unchanged']}, failed {counts['failed']} permission(s)"
+            ),
+            "project_key": project_key,
+            "counts": counts,
+            "results": table
+        }
+        if new_groups:
+            result["new_resource_groups"] = sorted(new_groups)
+        
+        if written:
+            if readback_mode == "full":
+                # One final listing instead of one per written permission
+                try:
+                    updated_permissions, _, _ = await fetch_all_pages(
+                        "list_permissions",
+                        project_key,
+                        API_CONFIG["IAM_GET_PERMISSIONS_URL"],
+                        list_payload,
+                        headers
+                    )
+                    result["updated_permissions"] = [
+                        {"name": permission.get("name"), "resource_group": permission.get("resourceGroup"), "item_id": permission.get("itemId")}
+                        for permission in updated_permissions
+                    ]
+                except Exception:
+                    result["updated_permissions"] = []
+            else:
+                apply_readback_mode(
+                    result,
+                    readback_mode,
+                    {"action": "upserted", "permissions": [row for row in table if row.get("status") in ("created", "updated")]},
+                    lambda: list_permissions(project_key, all_pages=True)
+                )
+        
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
-            "message": f"HTTP error updating permission: {e.response.status_code}",
+            "message": f"HTTP error upserting permissions: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
-            "message": f"Error updating permission: {str(e)}"
-        }, indent=2)
+            "message": f"Error upserting permissions: {str(e)}"
+        })
 
 
 @mcp.tool()
-async def get_resource_groups(project_key: str = "") -> str:
+async def get_resource_groups(project_key: str = "", bypass_cache: bool = False, output: str = "", fields: list = None) -> str:
     """
     Get available resource groups for a project.
     
     Args:
         project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        bypass_cache: Skip the response cache and fetch fresh data (default: False)
+        output: Output mode: pretty, compact, summary or raw (default: SELISE_OUTPUT_MODE)
+        fields: Keep only these keys in each raw item, e.g. ["itemId", "name"] (optional)
     
     Returns:
         JSON string with resource groups result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
+        output_mode = resolve_output_mode(output)
+        if not output_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid output mode '{output}'. Must be one of: pretty, compact, summary, raw."
+            })
+        
         headers = get_auth_headers()
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{API_CONFIG['IAM_GET_RESOURCE_GROUPS_URL']}?ProjectKey={project_key}",
-                headers=headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            groups_data = response.json()
+        groups_data = await fetch_json(
+            "get_resource_groups",
+            project_key,
+            "GET",
+            f"{API_CONFIG['IAM_GET_RESOURCE_GROUPS_URL']}?ProjectKey={project_key}",
+            cache_params=None,
+            bypass_cache=bypass_cache,
+            headers=headers
+        )
         
         result = {
             "status": "success",
@@ -2367,20 +5470,20 @@ async def get_resource_groups(project_key: str = "") -> str:
                 "count": group.get("count", 0)
             })
         
-        return json.dumps(result, indent=2)
+        return dump_result(result, output_mode, fields)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error getting resource groups: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error getting resource groups: {str(e)}"
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -2388,7 +5491,8 @@ async def set_role_permissions(
     role_slug: str,
     add_permissions: list = None,
     remove_permissions: list = None,
-    project_key: str = ""
+    project_key: str = "",
+    readback: str = ""
 ) -> str:
     """
     Assign or remove permissions from a role.
@@ -2398,27 +5502,35 @@ async def set_role_permissions(
         add_permissions: List of permission IDs to add to the role (default: [])
         remove_permissions: List of permission IDs to remove from the role (default: [])
         project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        readback: Post-write read-back mode: "full", "delta", "deferred" or "none" (default: server setting)
     
     Returns:
         JSON string with role permission assignment result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
+        readback_mode = resolve_readback_mode(readback)
+        if not readback_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid readback mode '{readback}'. Must be one of: full, delta, deferred, none."
+            })
+        
         if add_permissions is None:
             add_permissions = []
         if remove_permissions is None:
@@ -2433,25 +5545,20 @@ async def set_role_permissions(
             "slug": role_slug
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["IAM_SET_ROLES_URL"],
-                headers=headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            set_data = response.json()
+        response = await api_request(
+            "POST",
+            API_CONFIG["IAM_SET_ROLES_URL"],
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        set_data = response.json()
+        
+        # Role assignments change role permission listings and per-role permission counts
+        for endpoint in ("get_role_permissions", "list_permissions", "list_roles"):
+            invalidate_cache(endpoint, project_key)
         
         if set_data.get("success"):
-            # Get updated permissions to show the result
-            try:
-                updated_result = await get_role_permissions([role_slug], project_key)
-                updated_data = json.loads(updated_result)
-                updated_permissions = updated_data.get("permissions", []) if updated_data.get("status") == "success" else []
-            except Exception:
-                updated_permissions = []
-            
             result = {
                 "status": "success",
                 "message": f"Role permissions updated successfully for '{role_slug}'",
@@ -2461,9 +5568,25 @@ async def set_role_permissions(
                     "removed_permissions": remove_permissions,
                     "project_key": project_key
                 },
-                "response": set_data,
-                "updated_permissions": updated_permissions
+                "response": set_data
             }
+            
+            if readback_mode == "full":
+                # Get updated permissions to show the result
+                try:
+                    updated_result = await get_role_permissions([role_slug], project_key, output="raw")
+                    updated_data = json.loads(updated_result)
+                    updated_permissions = updated_data.get("permissions", []) if updated_data.get("status") == "success" else []
+                except Exception:
+                    updated_permissions = []
+                result["updated_permissions"] = updated_permissions
+            else:
+                apply_readback_mode(
+                    result,
+                    readback_mode,
+                    {"action": "assigned", "role_slug": role_slug, "added": add_permissions, "removed": remove_permissions},
+                    lambda: get_role_permissions([role_slug], project_key)
+                )
         else:
             result = {
                 "status": "error",
@@ -2471,20 +5594,249 @@ async def set_role_permissions(
                 "response": set_data
             }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error setting role permissions: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error setting role permissions: {str(e)}"
-        }, indent=2)
+        })
+
+
+@mcp.tool()
+async def set_role_permission_matrix(
+    matrix: dict,
+    project_key: str = "",
+    remove_unlisted: bool = True,
+    readback: str = "",
+    dry_run: bool = False
+) -> str:
+    """
+    Bring several roles to a desired set of permissions in one call.
+    
+    Permission names are resolved to IDs from one permission listing. Current assignments for
+    all roles come from one get_role_permissions query, and only the add/remove deltas are
+    applied, one set_role_permissions request per changed role, concurrently.
+    
+    Args:
+        matrix: Desired assignments as {role_slug: [permission IDs or names]}
+        project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        remove_unlisted: Remove permissions a role has but the matrix does not list (default: True).
+            Set to False to only add
+        readback: Post-write read-back mode: "full", "delta", "deferred" or "none" (default: server setting)
+        dry_run: Only report the deltas, without writing anything (default: False)
+    
+    Returns:
+        JSON string with the permissions added and removed per role
+    """
+    try:
+        # Check if authenticated
+        if not await ensure_authenticated():
+            return dump_result({
+                "status": "error",
+                "message": "Authentication required. Please login first using the login tool."
+            })
+        
+        # Use global tenant_id if project_key is not provided
+        if not project_key:
+            if not app_state["tenant_id"]:
+                return dump_result({
+                    "status": "error",
+                    "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
+                })
+            project_key = app_state["tenant_id"]
+        
+        readback_mode = resolve_readback_mode(readback)
+        if not readback_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid readback mode '{readback}'. Must be one of: full, delta, deferred, none."
+            })
+        
+        if not isinstance(matrix, dict) or not all(isinstance(entries, list) for entries in matrix.values()):
+            return dump_result({
+                "status": "error",
+                "message": "matrix must map each role slug to a list of permission IDs or names."
+            })
+        
+        headers = get_auth_headers()
+        role_slugs = list(matrix)
+        
+        permissions_payload = {
+            "page": 0,
+            "pageSize": 10,
+            "projectKey": project_key,
+            "roles": [],
+            "sort": {
+                "property": "Name",
+                "isDescending": False
+            },
+            "filter": {
+                "search": "",
+                "isBuiltIn": "",
+                "resourceGroup": ""
+            }
+        }
+        assignments_payload = {**permissions_payload, "roles": role_slugs}
+        
+        (all_permissions, _, _), (assigned_permissions, _, _) = await asyncio.gather(
+            fetch_all_pages(
+                "list_permissions",
+                project_key,
+                API_CONFIG["IAM_GET_PERMISSIONS_URL"],
+                permissions_payload,
+                headers
+            ),
+            fetch_all_pages(
+                "get_role_permissions",
+                project_key,
+                API_CONFIG["IAM_GET_PERMISSIONS_URL"],
+                assignments_payload,
+                headers
+            )
+        )
+        
+        permission_names = {permission.get("itemId"): permission.get("name") for permission in all_permissions}
+        permission_ids = {permission.get("name"): permission.get("itemId") for permission in all_permissions}
+        
+        current = {slug: set() for slug in role_slugs}
+        for permission in assigned_permissions:
+            for slug in permission.get("roles", []):
+                if slug in current:
+                    current[slug].add(permission.get("itemId"))
+        
+        table = []
+        changes = []
+        for slug in role_slugs:
+            row = {"role_slug": slug}
+            table.append(row)
+            
+            desired = set()
+            unresolved = []
+            for entry in matrix[slug]:
+                if entry in permission_names:
+                    desired.add(entry)
+                elif entry in permission_ids:
+                    desired.add(permission_ids[entry])
+                else:
+                    unresolved.append(entry)
+            if unresolved:
+                # Leave the role untouched rather than apply a partial assignment
+                row.update({"status": "failed", "error": f"Unknown permission(s): {unresolved}"})
+                continue
+            
+            to_add = sorted(desired - current[slug])
+            to_remove = sorted(current[slug] - desired) if remove_unlisted else []
+            row["added"] = [permission_names.get(item_id, item_id) for item_id in to_add]
+            row["removed"] = [permission_names.get(item_id, item_id) for item_id in to_remove]
+            if to_add or to_remove:
+                changes.append((row, slug, to_add, to_remove))
+            else:
+                row["status"] = "unchanged"
+        
+        async def apply_one(row: dict, slug: str, to_add: list, to_remove: list) -> None:
+            payload = {
+                "addPermissions": to_add,
+                "removePermissions": to_remove,
+                "projectKey": project_key,
+                "slug": slug
+            }
+            try:
+                response = await api_request(
+                    "POST",
+                    API_CONFIG["IAM_SET_ROLES_URL"],
+                    headers=headers,
+                    json=payload
+                )
+                response.raise_for_status()
+                set_data = response.json()
+            except httpx.HTTPStatusError as e:
+                row.update({"status": "failed", "error": f"HTTP {e.response.status_code}: {e.response.text[:200]}"})
+                return
+            except Exception as e:
+                row.update({"status": "failed", "error": str(e)})
+                return
+            
+            if set_data.get("success"):
+                row["status"] = "updated"
+            else:
+                row.update({"status": "failed", "error": set_data.get("errors")})
+        
+        if dry_run:
+            for row, _, _, _ in changes:
+                row["status"] = "to_update"
+            counts = {status: sum(1 for row in table if row.get("status") == status) for status in ("to_update", "unchanged", "failed")}
+            return dump_result({
+                "status": "success" if not counts["failed"] else "error",
+                "message": f"Would update {counts['to_update']} role(s); unchanged {counts['unchanged']}, invalid {counts['failed']}",
+                "project_key": project_key,
+                "dry_run": True,
+                "counts": counts,
+                "results": table
+            })
+        
+        await gather_limited([apply_one(*change) for change in changes], HTTP_CONFIG["fanout_limit"])
+        
+        counts = {status: sum(1 for row in table if row.get("status") == status) for status in ("updated", "unchanged", "failed")}
+        if counts["updated"]:
+            # Role assignments change role permission listings and per-role permission counts
+            for endpoint in ("get_role_permissions", "list_permissions", "list_roles"):
+                invalidate_cache(endpoint, project_key)
+        
+        result = {
+            "status": "success" if not counts["failed"] else ("partial" if counts["updated"] or counts["unchanged"] else "error"),
+            "message": f"Updated {counts['updated']}, unchanged {counts['unchanged']}, failed {counts['failed']} role(s)",
+            "project_key": project_key,
+            "counts": counts,
+            "results": table
+        }
+        
+        if counts["updated"]:
+            if readback_mode == "full":
+                # One listing for all roles instead of one per role
+                try:
+                    updated_permissions, _, _ = await fetch_all_pages(
+                        "get_role_permissions",
+                        project_key,
+                        API_CONFIG["IAM_GET_PERMISSIONS_URL"],
+                        assignments_payload,
+                        headers
+                    )
+                    result["updated_matrix"] = {
+                        slug: sorted(permission.get("name") for permission in updated_permissions if slug in permission.get("roles", []))
+                        for slug in role_slugs
+                    }
+                except Exception:
+                    result["updated_matrix"] = {}
+            else:
+                apply_readback_mode(
+                    result,
+                    readback_mode,
+                    {"action": "assigned", "roles": [row for row in table if row.get("status") == "updated"]},
+                    lambda: get_role_permissions(role_slugs, project_key, all_pages=True)
+                )
+        
+        return dump_result(result)
+        
+    except httpx.HTTPStatusError as e:
+        return dump_result({
+            "status": "error",
+            "message": f"HTTP error setting role permission matrix: {e.response.status_code}",
+            "details": e.response.text
+        })
+    
+    except Exception as e:
+        return dump_result({
+            "status": "error",
+            "message": f"Error setting role permission matrix: {str(e)}"
+        })
 
 
 @mcp.tool()
@@ -2495,7 +5847,13 @@ async def get_role_permissions(
     page_size: int = 10,
     search: str = "",
     is_built_in: str = "",
-    resource_group: str = ""
+    resource_group: str = "",
+    bypass_cache: bool = False,
+    all_pages: bool = False,
+    stream: bool = False,
+    ctx: Optional[Context] = None,
+    output: str = "",
+    fields: list = None
 ) -> str:
     """
     Get permissions assigned to specific role(s).
@@ -2508,27 +5866,39 @@ async def get_role_permissions(
         search: Search filter (default: "")
         is_built_in: Filter by built-in status (default: "")
         resource_group: Filter by resource group (default: "")
+        bypass_cache: Skip the response cache and fetch fresh data (default: False)
+        all_pages: Fetch every page concurrently and merge them into one de-duplicated result (default: False)
+        stream: With all_pages, stream each page to the client as a progress notification as it arrives (default: False)
+        output: Output mode: pretty, compact, summary or raw (default: SELISE_OUTPUT_MODE)
+        fields: Keep only these keys in each raw item, e.g. ["itemId", "name"] (optional)
     
     Returns:
         JSON string with role permissions result
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
+        output_mode = resolve_output_mode(output)
+        if not output_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid output mode '{output}'. Must be one of: pretty, compact, summary, raw."
+            })
+        
         headers = get_auth_headers()
         
         payload = {
@@ -2547,18 +5917,30 @@ async def get_role_permissions(
             }
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        if all_pages:
+            permissions, total_count, pages_fetched = await fetch_all_pages(
+                "get_role_permissions",
+                project_key,
                 API_CONFIG["IAM_GET_PERMISSIONS_URL"],
+                payload,
+                headers,
+                bypass_cache=bypass_cache,
+                ctx=ctx if stream else None
+            )
+        else:
+            permissions_data = await fetch_json(
+                "get_role_permissions",
+                project_key,
+                "POST",
+                API_CONFIG["IAM_GET_PERMISSIONS_URL"],
+                cache_params=payload,
+                bypass_cache=bypass_cache,
                 headers=headers,
-                json=payload,
-                timeout=30.0
+                json=payload
             )
-            response.raise_for_status()
-            permissions_data = response.json()
-        
-        permissions = permissions_data.get("data", [])
-        total_count = permissions_data.get("totalCount", 0)
+            
+            permissions = permissions_data.get("data", [])
+            total_count = permissions_data.get("totalCount", 0)
         
         result = {
             "status": "success",
@@ -2569,6 +5951,8 @@ async def get_role_permissions(
             "permissions": permissions,
             "summary": []
         }
+        if all_pages:
+            result["pages_fetched"] = pages_fetched
         
         # Add summary for easier reading
         for perm in permissions:
@@ -2582,20 +5966,21 @@ async def get_role_permissions(
                 "created_date": perm.get("createdDate")
             })
         
-        return json.dumps(result, indent=2)
+        return dump_result(result, output_mode, fields)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error getting role permissions: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error getting role permissions: {str(e)}"
-        }, indent=2)
+        })
+
 
 
 
@@ -2605,6 +5990,23 @@ async def get_role_permissions(
 
 
 
+def data_gateway_payload(project_key: str, gateway_config: dict = None) -> dict:
+    """Build the data gateway configuration payload (shared by configure_blocks_data_gateway and apply_project_plan)."""
+    # Set default gateway config if not provided
+    if gateway_config is None:
+        gateway_config = {
+            "enableDataGateway": True,
+            # Saved into the project's config, so it stays the public endpoint even when
+            # SELISE_API_BASE_URL points at a local stand-in
+            "gatewayEndpoint": f"https://api.seliseblocks.com/graphql/v1/{project_key}",
+            "enableRealTimeSubscriptions": True
+        }
+    
+    return {
+        "projectKey": project_key,
+        **gateway_config
+    }
+
 
 @mcp.tool()
 async def configure_blocks_data_gateway(
@@ -2623,45 +6025,32 @@ async def configure_blocks_data_gateway(
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
-        # Set default gateway config if not provided
-        if gateway_config is None:
-            gateway_config = {
-                "enableDataGateway": True,
-                "gatewayEndpoint": f"https://api.seliseblocks.com/graphql/v1/{project_key}",
-                "enableRealTimeSubscriptions": True
-            }
-        
         headers = get_auth_headers()
+        payload = data_gateway_payload(project_key, gateway_config)
         
-        payload = {
-            "projectKey": project_key,
-            **gateway_config
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["DATA_GATEWAY_URL"],
-                headers=headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            gateway_data = response.json()
+        response = await api_request(
+            "POST",
+            API_CONFIG["DATA_GATEWAY_URL"],
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        gateway_data = response.json()
         
         if gateway_data.get("success", True):
             result = {
@@ -2669,7 +6058,7 @@ async def configure_blocks_data_gateway(
                 "message": "Data Gateway configured successfully",
                 "config_details": {
                     "project_key": project_key,
-                    "gateway_config": gateway_config
+                    "gateway_config": {key: value for key, value in payload.items() if key != "projectKey"}
                 },
                 "response": gateway_data
             }
@@ -2681,20 +6070,43 @@ async def configure_blocks_data_gateway(
                 "response": gateway_data
             }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error configuring Data Gateway: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error configuring Data Gateway: {str(e)}"
-        }, indent=2)
+        })
+
+
+def sso_credential_payload(
+    project_key: str,
+    provider: str,
+    client_id: str,
+    client_secret: str,
+    is_enable: bool = True,
+    redirect_uri: str = ""
+) -> dict:
+    """Build the SSO credential payload (shared by add_sso_credential and apply_project_plan)."""
+    # Set default redirect URI if not provided
+    if not redirect_uri and app_state.get("application_domain"):
+        redirect_uri = f"{app_state['application_domain']}/auth/{provider}/callback"
+    
+    return {
+        "projectKey": project_key,
+        "provider": provider,
+        "clientId": client_id,
+        "clientSecret": client_secret,
+        "isEnable": is_enable,
+        "redirectUri": redirect_uri
+    }
 
 
 @mcp.tool()
@@ -2722,45 +6134,33 @@ async def add_sso_credential(
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
-            project_key = app_state["tenant_id"]
-        
-        # Set default redirect URI if not provided
-        if not redirect_uri and app_state.get("application_domain"):
-            redirect_uri = f"{app_state['application_domain']}/auth/{provider}/callback"
-        
-        headers = get_auth_headers()
-        
-        payload = {
-            "projectKey": project_key,
-            "provider": provider,
-            "clientId": client_id,
-            "clientSecret": client_secret,
-            "isEnable": is_enable,
-            "redirectUri": redirect_uri
-        }
+                })
+            project_key = app_state["tenant_id"]
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["SAVE_SSO_URL"],
-                headers=headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            sso_data = response.json()
+        headers = get_auth_headers()
+        payload = sso_credential_payload(project_key, provider, client_id, client_secret, is_enable, redirect_uri)
+        redirect_uri = payload["redirectUri"]
+        
+        response = await api_request(
+            "POST",
+            API_CONFIG["SAVE_SSO_URL"],
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        sso_data = response.json()
         
         if sso_data.get("isSuccess", True):
             result = {
@@ -2783,88 +6183,75 @@ async def add_sso_credential(
                 "response": sso_data
             }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error saving SSO credentials: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error saving SSO credentials: {str(e)}"
-        }, indent=2)
+        })
 
 
-async def get_tenant_id(tenant_group_id: str, project_name: str) -> Optional[str]:
-    """Get tenant ID for a project."""
-    try:
-        headers = get_auth_headers()
-        params = {
-            "page": 0,
-            "pageSize": 100,
-            "tenantGroupId": tenant_group_id
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                API_CONFIG["GET_PROJECTS_URL"],
-                headers=headers,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            projects_data = response.json()
-        
-        # Search for the tenant ID
-        for group in projects_data:
-            for project in group.get("projects", []):
-                if project.get("name") == project_name:
-                    return project.get("tenantId")
-        
-        return None
-        
-    except Exception as e:
-        print(f"Error getting tenant ID: {str(e)}")
-        return None
+# Project index polling configuration (new projects can take a moment to appear in listings)
+PROJECT_INDEX_CONFIG = {
+    "poll_attempts": int(os.environ.get("SELISE_PROJECT_POLL_ATTEMPTS", "3")),
+    "poll_interval": float(os.environ.get("SELISE_PROJECT_POLL_INTERVAL", "1.0"))
+}
 
 
-async def get_application_domain_by_tenant_group(tenant_group_id: str, project_name: str) -> Optional[str]:
-    """Get the real application domain for a project using tenant group ID and project name."""
-    try:
-        headers = get_auth_headers()
-        params = {
-            "page": 0,
-            "pageSize": 100,
-            "tenantGroupId": tenant_group_id
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                API_CONFIG["GET_PROJECTS_URL"],
-                headers=headers,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            projects_data = response.json()
-        
-        # Search for the project and extract its real domain
-        for group in projects_data:
-            for project in group.get("projects", []):
-                if project.get("name") == project_name:
-                    domain = project.get("applicationDomain")
-                    if domain:
-                        return domain
-        
-        return None
-        
-    except Exception as e:
-        print(f"Error getting application domain for tenant group {tenant_group_id}, project {project_name}: {str(e)}")
-        return None
+async def fetch_project_index(tenant_group_id: str) -> list:
+    """Fetch the project listing for a tenant group with a single request."""
+    headers = get_auth_headers()
+    params = {
+        "page": 0,
+        "pageSize": 100,
+        "tenantGroupId": tenant_group_id
+    }
+    
+    response = await api_request(
+        "GET",
+        API_CONFIG["GET_PROJECTS_URL"],
+        headers=headers,
+        params=params
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def find_project(projects_data: list, project_name: str) -> Optional[dict]:
+    """Find a project by name in a project listing response."""
+    for group in projects_data:
+        for project in group.get("projects", []):
+            if project.get("name") == project_name:
+                return project
+    return None
+
+
+async def wait_for_project(tenant_group_id: str, project_name: str) -> Optional[dict]:
+    """
+    Look up a project in its tenant group's listing, polling briefly if it has not appeared yet.
+    
+    Args:
+        tenant_group_id: Tenant Group ID the project belongs to
+        project_name: Name of the project
+    
+    Returns:
+        The project entry from the listing, or None if it did not appear in time
+    """
+    attempts = max(1, PROJECT_INDEX_CONFIG["poll_attempts"])
+    for attempt in range(attempts):
+        project = find_project(await fetch_project_index(tenant_group_id), project_name)
+        if project or attempt == attempts - 1:
+            return project
+        await asyncio.sleep(PROJECT_INDEX_CONFIG["poll_interval"])
+    return None
 
 
 async def get_application_domain(item_id: str) -> Optional[str]:
@@ -2873,15 +6260,14 @@ async def get_application_domain(item_id: str) -> Optional[str]:
         headers = get_auth_headers()
         params = {"id": item_id}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                API_CONFIG["GET_ITEM_URL"],
-                headers=headers,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            project_detail = response.json()
+        response = await api_request(
+            "GET",
+            API_CONFIG["GET_ITEM_URL"],
+            headers=headers,
+            params=params
+        )
+        response.raise_for_status()
+        project_detail = response.json()
         
         # Extract the application domain from the project detail
         application_contexts = project_detail.get("applicationContexts", [])
@@ -2898,50 +6284,61 @@ async def get_application_domain(item_id: str) -> Optional[str]:
         return None
         
     except Exception as e:
-        print(f"Error getting application domain for item {item_id}: {str(e)}")
+        log_event(logging.WARNING, "project_domain_error", item_id=item_id, error=str(e))
         return None
 
 
 @mcp.tool()
-async def list_github_repos(project_key: str = "") -> str:
+async def list_github_repos(project_key: str = "", bypass_cache: bool = False, output: str = "", fields: list = None) -> str:
     """
     Get all GitHub repositories for a project.
     
     Args:
         project_key: Project key (tenant ID). Uses global tenant_id if not provided
+        bypass_cache: Skip the response cache and fetch fresh data (default: False)
+        output: Output mode: pretty, compact, summary or raw (default: SELISE_OUTPUT_MODE)
+        fields: Keep only these keys in each raw item, e.g. ["itemId", "name"] (optional)
     
     Returns:
         JSON string with GitHub repositories list
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
+        output_mode = resolve_output_mode(output)
+        if not output_mode:
+            return dump_result({
+                "status": "error",
+                "message": f"Invalid output mode '{output}'. Must be one of: pretty, compact, summary, raw."
+            })
+        
         headers = get_auth_headers()
         params = {"ProjectKey": project_key}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                API_CONFIG["GITHUB_REPOS_URL"],
-                headers=headers,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            repos_data = response.json()
+        repos_data = await fetch_json(
+            "list_github_repos",
+            project_key,
+            "GET",
+            API_CONFIG["GITHUB_REPOS_URL"],
+            cache_params=params,
+            bypass_cache=bypass_cache,
+            headers=headers,
+            params=params
+        )
         
         result = {
             "status": "success",
@@ -2968,20 +6365,48 @@ async def list_github_repos(project_key: str = "") -> str:
                 "updated_at": repo.get("updatedAt")
             })
         
-        return json.dumps(result, indent=2)
+        return dump_result(result, output_mode, fields)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error listing GitHub repos: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error listing GitHub repos: {str(e)}"
-        }, indent=2)
+        })
+
+
+# MFA type codes of the MFA configuration API
+MFA_TYPE_CODES = {"email": 2, "authenticator": 1}
+
+
+def mfa_config_payload(project_key: str, mfa_types: list) -> dict:
+    """
+    Build the MFA configuration payload (shared by the MFA tools and apply_project_plan).
+    
+    Authenticator MFA always comes with email MFA as well, and an empty list disables MFA.
+    
+    Args:
+        project_key: Project key
+        mfa_types: Any of "email" and "authenticator"
+    
+    Returns:
+        Payload for the MFA configuration save endpoint
+    """
+    enabled = [mfa_type for mfa_type in ("email", "authenticator") if mfa_type in mfa_types]
+    if "authenticator" in enabled and "email" not in enabled:
+        enabled.insert(0, "email")
+    
+    return {
+        "projectKey": project_key,
+        "enableMfa": bool(enabled),
+        "userMfaType": [MFA_TYPE_CODES[mfa_type] for mfa_type in enabled]
+    }
 
 
 @mcp.tool()
@@ -2997,37 +6422,32 @@ async def enable_email_mfa(project_key: str = "") -> str:
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
         headers = get_auth_headers()
-        payload = {
-            "projectKey": project_key,
-            "enableMfa": True,
-            "userMfaType": [2]  # 2 represents email MFA
-        }
+        payload = mfa_config_payload(project_key, ["email"])
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["MFA_SAVE_URL"],
-                headers=headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            mfa_data = response.json()
+        response = await api_request(
+            "POST",
+            API_CONFIG["MFA_SAVE_URL"],
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        mfa_data = response.json()
         
         result = {
             "status": "success",
@@ -3041,20 +6461,20 @@ async def enable_email_mfa(project_key: str = "") -> str:
             "response_data": mfa_data
         }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error enabling email MFA: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error enabling email MFA: {str(e)}"
-        }, indent=2)
+        })
 
 @mcp.tool()
 async def enable_authenticator_mfa(project_key: str = "") -> str:
@@ -3069,37 +6489,32 @@ async def enable_authenticator_mfa(project_key: str = "") -> str:
     """
     try:
         # Check if authenticated
-        if not is_token_valid():
-            return json.dumps({
+        if not await ensure_authenticated():
+            return dump_result({
                 "status": "error",
                 "message": "Authentication required. Please login first using the login tool."
-            }, indent=2)
+            })
         
         # Use global tenant_id if project_key is not provided
         if not project_key:
             if not app_state["tenant_id"]:
-                return json.dumps({
+                return dump_result({
                     "status": "error",
                     "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
-                }, indent=2)
+                })
             project_key = app_state["tenant_id"]
         
         headers = get_auth_headers()
-        payload = {
-            "projectKey": project_key,
-            "enableMfa": True,
-            "userMfaType": [2, 1]  # 2 = email MFA, 1 = authenticator MFA
-        }
+        payload = mfa_config_payload(project_key, ["authenticator"])
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_CONFIG["MFA_SAVE_URL"],
-                headers=headers,
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            mfa_data = response.json()
+        response = await api_request(
+            "POST",
+            API_CONFIG["MFA_SAVE_URL"],
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        mfa_data = response.json()
         
         result = {
             "status": "success",
@@ -3114,20 +6529,570 @@ async def enable_authenticator_mfa(project_key: str = "") -> str:
             "response_data": mfa_data
         }
         
-        return json.dumps(result, indent=2)
+        return dump_result(result)
         
     except httpx.HTTPStatusError as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"HTTP error enabling authenticator MFA: {e.response.status_code}",
             "details": e.response.text
-        }, indent=2)
+        })
     
     except Exception as e:
-        return json.dumps({
+        return dump_result({
             "status": "error",
             "message": f"Error enabling authenticator MFA: {str(e)}"
-        }, indent=2)
+        })
+
+
+# Declarative project plan/apply: each step diffs one area of the desired state against live
+# state, and the steps run as a dependency graph so independent areas proceed in parallel
+PLAN_STEP_DEPENDENCIES = {
+    "project": [],
+    "schemas": ["project"],
+    "schema_fields": ["schemas"],
+    "data_gateway": ["schema_fields"],
+    "roles": ["project"],
+    "permissions": ["project"],
+    "role_permissions": ["roles", "permissions"],
+    "captcha": ["project"],
+    "sso": ["project"],
+    "mfa": ["project"],
+    "social_login": ["project"]
+}
+
+# Steps driven by a desired-state section with a different name
+PLAN_STEP_SECTIONS = {
+    "schema_fields": "schemas"
+}
+
+# Fingerprints of settings that the API can write but not read back, keyed "<project_key>:<step>[:<item>]".
+# They live in memory and are only kept across restarts with SELISE_PERSIST_STATE
+plan_state = {
+    "applied": {}
+}
+
+
+def plan_fingerprint(spec: Any) -> str:
+    """Stable hash of a desired-state fragment (secrets are only ever stored hashed)."""
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def plan_outcome(changes: list, dry_run: bool, failed: list = None) -> dict:
+    """Build a step outcome from its change list."""
+    if failed:
+        return {"status": "failed", "changes": changes, "errors": failed}
+    if not changes:
+        return {"status": "unchanged"}
+    return {"status": "planned" if dry_run else "applied", "changes": changes}
+
+
+def bulk_tool_outcome(result_json: str, dry_run: bool) -> dict:
+    """Turn the JSON result of a bulk tool into a step outcome."""
+    result = json.loads(result_json)
+    if result.get("status") not in ("success", "partial") or not result.get("counts"):
+        return {"status": "failed", "errors": [result.get("message")], "details": result.get("results") or result.get("details")}
+    
+    counts = result["counts"]
+    changed = {status: count for status, count in counts.items() if status not in ("unchanged", "skipped", "failed") and count}
+    rows = [row for row in result.get("results", []) if row.get("status") not in ("unchanged", "skipped")]
+    if counts.get("failed"):
+        return {"status": "failed", "counts": counts, "changes": rows}
+    if not changed:
+        return {"status": "unchanged"}
+    return {"status": "planned" if dry_run else "applied", "counts": counts, "changes": rows}
+
+
+async def plan_project(spec: dict, context: dict, dry_run: bool) -> dict:
+    """Find the project by name and create it if it does not exist."""
+    projects_data = await fetch_project_index(app_state.get("tenant_group_id") or "")
+    project = find_project(projects_data, spec["name"])
+    explicit_key = context.get("explicit_project_key")
+    found_key = project.get("tenantId") if project else None
+    if explicit_key and found_key != explicit_key:
+        raise ValueError(
+            f"project_key '{explicit_key}' does not match project '{spec['name']}'"
+            + (f" (tenant ID '{found_key}')" if found_key else ", which does not exist yet")
+        )
+    if project is not None:
+        context["project_key"] = found_key or context["project_key"]
+        return {"status": "unchanged", "project_key": context["project_key"]}
+    if dry_run:
+        return {"status": "planned", "changes": [f"create project {spec['name']}"]}
+    
+    result = json.loads(await create_project(
+        spec["name"],
+        spec.get("repo_name", spec["name"]),
+        spec.get("repo_link", ""),
+        spec.get("repo_id", "Any"),
+        spec.get("is_production", False)
+    ))
+    if result.get("status") != "success":
+        return {"status": "failed", "errors": [result.get("message")]}
+    # create_project succeeds without a tenant ID when the new project does not show up in the
+    # listing in time; app_state["tenant_id"] then still names the previously selected project
+    tenant_id = (result.get("project_details") or {}).get("tenantId")
+    if not tenant_id:
+        return {
+            "status": "failed",
+            "changes": [f"create project {spec['name']}"],
+            "errors": [f"Project '{spec['name']}' was created but its tenant ID could not be resolved; run get_projects and apply again"]
+        }
+    context["project_key"] = tenant_id
+    return {"status": "applied", "changes": [f"create project {spec['name']}"], "project_key": context["project_key"]}
+
+
+async def plan_schemas(spec: list, context: dict, dry_run: bool) -> dict:
+    """Create the schemas that do not exist yet."""
+    project_key = context["project_key"]
+    headers = get_auth_headers()
+    existing = await list_project_schemas(project_key, headers)
+    missing = [schema["name"] for schema in spec if schema["name"] not in existing]
+    changes = [f"create schema {name}" for name in missing]
+    if dry_run or not missing:
+        context["schema_ids"] = existing
+        return plan_outcome(changes, dry_run)
+    
+    async def create_one(name: str) -> Optional[str]:
+        payload = {
+            "schemaName": name,
+            "collectionName": f"{name}s",
+            "schemaType": 1,
+            "projectKey": project_key
+        }
+        try:
+            response = await api_request("POST", API_CONFIG["CREATE_SCHEMA_URL"], headers=headers, json=payload)
+            response.raise_for_status()
+        except Exception as e:
+            return f"{name}: {str(e)}"
+        return None
+    
+    errors = [error for error in await gather_limited([create_one(name) for name in missing], HTTP_CONFIG["fanout_limit"]) if error]
+    invalidate_cache("list_schemas", project_key)
+    context["schema_ids"] = await list_project_schemas(project_key, headers)
+    return plan_outcome(changes, dry_run, errors)
+
+
+async def plan_schema_fields(spec: list, context: dict, dry_run: bool) -> dict:
+    """Add, modify or remove schema fields so every schema matches its desired fields."""
+    project_key = context["project_key"]
+    headers = get_auth_headers()
+    schema_ids = context.get("schema_ids") or await list_project_schemas(project_key, headers)
+    
+    async def sync_one(schema: dict) -> Tuple[list, list]:
+        schema_id = schema_ids.get(schema["name"])
+        if not schema_id:
+            return [], [f"{schema['name']}: schema not found"]
+        
+        schema_data = await fetch_json(
+            "get_schema",
+            project_key,
+            "GET",
+            f"{API_CONFIG['GET_SCHEMA_URL']}/{schema_id}",
+            cache_params={"schema_id": schema_id},
+            headers=headers
+        )
+        current = extract_schema_fields(schema_data)
+        current_names = {field.get("name") for field in current}
+        desired = schema.get("fields", [])
+        merged, deletable, changes, errors = merge_schema_fields(
+            current,
+            add=[field for field in desired if field.get("name") not in current_names],
+            modify=[field for field in desired if field.get("name") in current_names],
+            remove=schema.get("remove_fields")
+        )
+        changes = [f"{schema['name']}: {change}" for change in changes]
+        errors = [f"{schema['name']}: {error}" for error in errors]
+        if errors or not changes or dry_run:
+            return changes, errors
+        
+        payload = {
+            "fields": merged,
+            "schemaDefinitionItemId": schema_id,
+            "deletableFieldNames": deletable
+        }
+        try:
+            response = await api_request("POST", API_CONFIG["SCHEMA_FIELDS_URL"], headers=headers, json=payload)
+            response.raise_for_status()
+        except Exception as e:
+            errors.append(f"{schema['name']}: {str(e)}")
+        invalidate_cache("get_schema", match={"schema_id": schema_id})
+        invalidate_cache("list_schemas", project_key)
+        return changes, errors
+    
+    outcomes = await gather_limited(
+        [sync_one(schema) for schema in spec if schema.get("fields") or schema.get("remove_fields")],
+        HTTP_CONFIG["fanout_limit"]
+    )
+    changes = [change for schema_changes, _ in outcomes for change in schema_changes]
+    errors = [error for _, schema_errors in outcomes for error in schema_errors]
+    return plan_outcome(changes, dry_run, errors)
+
+
+async def plan_captcha(spec: dict, context: dict, dry_run: bool) -> dict:
+    """Save the CAPTCHA configuration unless the live configuration already matches."""
+    project_key = context["project_key"]
+    headers = get_auth_headers()
+    params = {"ProjectKey": project_key}
+    configs_data = await fetch_json(
+        "list_captcha_configs",
+        project_key,
+        "GET",
+        API_CONFIG["CAPTCHA_LIST_URL"],
+        cache_params=params,
+        headers=headers,
+        params=params
+    )
+    
+    # The secret cannot be read back, so changes to it are detected from the last applied fingerprint.
+    # Without a record (e.g. after a restart without SELISE_PERSIST_STATE) the configuration is saved again
+    state_key = f"{project_key}:captcha"
+    fingerprint = plan_fingerprint(spec)
+    recorded = plan_state["applied"].get(state_key)
+    live = next((config for config in configs_data.get("configurations", []) if config.get("provider") == spec["provider"]), None)
+    if (
+        live is not None
+        and bool(live.get("isEnable")) == bool(spec.get("is_enable", False))
+        and live.get("captchaKey", spec["site_key"]) == spec["site_key"]
+        and recorded == fingerprint
+    ):
+        return {"status": "unchanged"}
+    
+    changes = [
+        f"save {spec['provider']} captcha configuration"
+        + (" (no record of the secret key)" if live is not None and recorded is None else "")
+    ]
+    if dry_run:
+        return plan_outcome(changes, dry_run)
+    
+    result = json.loads(await save_captcha_config(
+        spec["provider"],
+        spec["site_key"],
+        spec["secret_key"],
+        project_key,
+        spec.get("is_enable", False),
+        readback="none"
+    ))
+    if result.get("status") != "success":
+        return plan_outcome(changes, dry_run, [result.get("message")])
+    plan_state["applied"][state_key] = fingerprint
+    return plan_outcome(changes, dry_run)
+
+
+async def post_write_only_settings(step: str, project_key: str, items: list, dry_run: bool) -> dict:
+    """
+    Apply settings the API cannot read back (SSO credentials, MFA, the data gateway).
+    
+    Live state is unknown, so an item is only skipped when this server recorded applying the same
+    payload. A step whose items are all skipped reports "unknown" rather than "unchanged", and an
+    item without a record (e.g. after a restart without SELISE_PERSIST_STATE) is written again.
+    
+    Args:
+        step: Step name
+        project_key: Project key
+        items: List of (item name, url, payload)
+        dry_run: Only report the changes
+    
+    Returns:
+        Step outcome
+    """
+    headers = get_auth_headers()
+    pending = []
+    changes = []
+    for name, url, payload in items:
+        recorded = plan_state["applied"].get(f"{project_key}:{step}:{name}")
+        if recorded == plan_fingerprint(payload):
+            continue
+        pending.append((name, url, payload))
+        changes.append(f"apply {step} {name}" + (" (no record of the live settings)" if recorded is None else ""))
+    
+    if not pending:
+        return {"status": "unknown", "reason": "the API cannot read these settings back; they were last applied with the same values"}
+    if dry_run:
+        return plan_outcome(changes, dry_run)
+    
+    async def post_one(name: str, url: str, payload: dict) -> Optional[str]:
+        try:
+            response = await api_request("POST", url, headers=headers, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            return f"{name}: HTTP {e.response.status_code}"
+        except Exception as e:
+            return f"{name}: {str(e)}"
+        plan_state["applied"][f"{project_key}:{step}:{name}"] = plan_fingerprint(payload)
+        return None
+    
+    errors = [error for error in await gather_limited([post_one(*item) for item in pending], HTTP_CONFIG["fanout_limit"]) if error]
+    return plan_outcome(changes, dry_run, errors)
+
+
+async def plan_sso(spec: list, context: dict, dry_run: bool) -> dict:
+    """Save SSO credentials per provider."""
+    project_key = context["project_key"]
+    return await post_write_only_settings("sso", project_key, [
+        (
+            credential["provider"],
+            API_CONFIG["SAVE_SSO_URL"],
+            sso_credential_payload(
+                project_key,
+                credential["provider"],
+                credential["client_id"],
+                credential["client_secret"],
+                credential.get("is_enable", True),
+                credential.get("redirect_uri", "")
+            )
+        )
+        for credential in spec
+    ], dry_run)
+
+
+async def plan_mfa(spec: list, context: dict, dry_run: bool) -> dict:
+    """Save the MFA configuration (list of "email" and/or "authenticator")."""
+    project_key = context["project_key"]
+    return await post_write_only_settings("mfa", project_key, [
+        ("config", API_CONFIG["MFA_SAVE_URL"], mfa_config_payload(project_key, spec))
+    ], dry_run)
+
+
+async def plan_data_gateway(spec: dict, context: dict, dry_run: bool) -> dict:
+    """Save the data gateway configuration."""
+    project_key = context["project_key"]
+    return await post_write_only_settings("data_gateway", project_key, [
+        ("config", API_CONFIG["DATA_GATEWAY_URL"], data_gateway_payload(project_key, spec))
+    ], dry_run)
+
+
+async def plan_social_login(spec: dict, context: dict, dry_run: bool) -> dict:
+    """Apply the authentication (social login) configuration unless the live configuration already matches."""
+    project_key = context["project_key"]
+    params = {"ProjectKey": project_key}
+    live = await fetch_json(
+        "get_authentication_config",
+        project_key,
+        "GET",
+        API_CONFIG["GET_CONFIG_URL"],
+        cache_params=params,
+        headers=get_auth_headers(),
+        params=params
+    )
+    
+    def normalized(value: Any) -> Any:
+        return sorted(value) if isinstance(value, list) else value
+    
+    desired = social_login_payload(project_key, **spec)
+    changes = [
+        f"set {key} to {value}" for key, value in desired.items()
+        if key not in ("itemId", "projectKey") and normalized(live.get(key)) != normalized(value)
+    ]
+    if not changes or dry_run:
+        return plan_outcome(changes, dry_run)
+    
+    result = json.loads(await activate_social_login(project_key=project_key, readback="none", **spec))
+    if result.get("status") != "success":
+        return plan_outcome(changes, dry_run, [result.get("message")])
+    return plan_outcome(changes, dry_run)
+
+
+async def plan_roles(spec: list, context: dict, dry_run: bool) -> dict:
+    """Create missing roles."""
+    return bulk_tool_outcome(await create_roles_bulk(spec, context["project_key"], readback="none", dry_run=dry_run), dry_run)
+
+
+async def plan_permissions(spec: list, context: dict, dry_run: bool) -> dict:
+    """Create or update permissions."""
+    return bulk_tool_outcome(await upsert_permissions_bulk(spec, context["project_key"], readback="none", dry_run=dry_run), dry_run)
+
+
+async def plan_role_permissions(spec: dict, context: dict, dry_run: bool) -> dict:
+    """Bring role permission assignments to the desired matrix."""
+    return bulk_tool_outcome(await set_role_permission_matrix(spec, context["project_key"], readback="none", dry_run=dry_run), dry_run)
+
+
+PLAN_STEPS = {
+    "project": plan_project,
+    "schemas": plan_schemas,
+    "schema_fields": plan_schema_fields,
+    "data_gateway": plan_data_gateway,
+    "roles": plan_roles,
+    "permissions": plan_permissions,
+    "role_permissions": plan_role_permissions,
+    "captcha": plan_captcha,
+    "sso": plan_sso,
+    "mfa": plan_mfa,
+    "social_login": plan_social_login
+}
+
+
+async def run_plan_graph(steps: dict, context: dict, dry_run: bool) -> dict:
+    """
+    Run plan steps as a dependency graph: each step starts as soon as the steps it depends on finish.
+    
+    Args:
+        steps: Step name -> desired-state fragment, for the steps present in the document
+        context: Shared values (project_key, schema_ids) filled in by earlier steps
+        dry_run: Plan only
+    
+    Returns:
+        Step name -> outcome
+    """
+    tasks = {}
+    
+    async def run_step(name: str) -> dict:
+        started_at = time.monotonic()
+        for dependency in PLAN_STEP_DEPENDENCIES[name]:
+            if dependency not in tasks:
+                continue
+            outcome = await tasks[dependency]
+            if outcome["status"] in ("failed", "skipped"):
+                return {"status": "skipped", "reason": f"'{dependency}' {outcome['status']}"}
+            if outcome["status"] in ("planned", "pending"):
+                # Live state will only be known once the dependency has been applied
+                return {"status": "pending", "reason": f"waits for planned changes in '{dependency}'"}
+        try:
+            outcome = await PLAN_STEPS[name](steps[name], context, dry_run)
+        except httpx.HTTPStatusError as e:
+            outcome = {"status": "failed", "errors": [f"HTTP {e.response.status_code}: {e.response.text[:200]}"]}
+        except Exception as e:
+            outcome = {"status": "failed", "errors": [str(e)]}
+        outcome["seconds"] = round(time.monotonic() - started_at, 3)
+        return outcome
+    
+    for name in steps:
+        tasks[name] = asyncio.ensure_future(run_step(name))
+    
+    outcomes = await asyncio.gather(*tasks.values())
+    return dict(zip(tasks, outcomes))
+
+
+@mcp.tool()
+async def apply_project_plan(desired_state: dict, project_key: str = "", dry_run: bool = False) -> str:
+    """
+    Bring a project to a desired state described in one document.
+    
+    Each section is compared with live state and only the differences are applied. Sections run
+    as a dependency graph (schemas -> fields -> data gateway; roles + permissions -> role
+    permissions; captcha, SSO, MFA and social login independently), so independent sections
+    proceed in parallel. Re-running an unchanged document makes no writes.
+    
+    SSO credentials, MFA and the data gateway cannot be read back, so those steps compare with
+    the settings this server last applied and report "unknown" instead of "unchanged". The same
+    record covers the captcha secret key. Without SELISE_PERSIST_STATE that record is lost on
+    restart, and the next apply writes these settings again.
+    
+    Args:
+        desired_state: Document with any of these sections:
+            project: {"name", "repo_name", "repo_link", "repo_id", "is_production"} (created if missing)
+            schemas: [{"name", "fields": [field definitions], "remove_fields": [names]}]
+            roles: [{"name", "description", "slug"}]
+            permissions: [entries as accepted by upsert_permissions_bulk]
+            role_permissions: {role_slug: [permission IDs or names]}
+            captcha: {"provider", "site_key", "secret_key", "is_enable"}
+            sso: [{"provider", "client_id", "client_secret", "is_enable", "redirect_uri"}]
+            mfa: ["email", "authenticator"]
+            data_gateway: gateway configuration object
+            social_login: arguments of activate_social_login
+        project_key: Project key (tenant ID). Uses global tenant_id if not provided. With a project
+            section, it must be the tenant ID of that project
+        dry_run: Only compute the plan, without writing anything (default: False)
+    
+    Returns:
+        JSON string with the outcome of every step
+    """
+    try:
+        # Check if authenticated
+        if not await ensure_authenticated():
+            return dump_result({
+                "status": "error",
+                "message": "Authentication required. Please login first using the login tool."
+            })
+        
+        if not isinstance(desired_state, dict):
+            return dump_result({
+                "status": "error",
+                "message": "desired_state must be an object."
+            })
+        
+        sections = {PLAN_STEP_SECTIONS.get(name, name) for name in PLAN_STEPS}
+        unknown = sorted(set(desired_state) - sections)
+        if unknown:
+            return dump_result({
+                "status": "error",
+                "message": f"Unknown section(s) in desired_state: {unknown}. Supported: {sorted(sections)}"
+            })
+        
+        invalid_mfa = [mfa_type for mfa_type in desired_state.get("mfa", []) if mfa_type not in MFA_TYPE_CODES]
+        if invalid_mfa:
+            return dump_result({
+                "status": "error",
+                "message": f"Unknown MFA type(s): {invalid_mfa}. Must be email or authenticator."
+            })
+        
+        # Use global tenant_id if project_key is not provided
+        if not project_key and "project" not in desired_state:
+            if not app_state["tenant_id"]:
+                return dump_result({
+                    "status": "error",
+                    "message": "No project key provided and no tenant ID in global state. Please run get_projects or provide project_key."
+                })
+            project_key = app_state["tenant_id"]
+        
+        context = {"project_key": project_key or app_state["tenant_id"], "explicit_project_key": project_key}
+        started_at = time.monotonic()
+        steps = {
+            name: desired_state[PLAN_STEP_SECTIONS.get(name, name)]
+            for name in PLAN_STEPS
+            if PLAN_STEP_SECTIONS.get(name, name) in desired_state
+        }
+        if not any(schema.get("fields") or schema.get("remove_fields") for schema in desired_state.get("schemas", [])):
+            steps.pop("schema_fields", None)
+        
+        outcomes = await run_plan_graph(steps, context, dry_run)
+        if not dry_run and any(outcome["status"] == "applied" for outcome in outcomes.values()):
+            save_persistent_state()
+        
+        counts = {}
+        for outcome in outcomes.values():
+            counts[outcome["status"]] = counts.get(outcome["status"], 0) + 1
+        
+        failed = counts.get("failed", 0) + counts.get("skipped", 0)
+        changed = counts.get("applied", 0) + counts.get("planned", 0) + counts.get("pending", 0)
+        if failed:
+            status = "partial" if counts.get("applied") else "error"
+        else:
+            status = "success"
+        
+        if changed or failed:
+            message = f"{'Planned' if dry_run else 'Applied'} changes in {changed} step(s); {failed} step(s) failed or skipped"
+        elif counts.get("unknown"):
+            message = f"No changes to apply; {counts['unknown']} step(s) cannot be read back and were last applied with the same settings"
+        else:
+            message = "Project already matches the desired state"
+        
+        result = {
+            "status": status,
+            "message": message,
+            "project_key": context["project_key"],
+            "dry_run": dry_run,
+            "seconds": round(time.monotonic() - started_at, 3),
+            "counts": counts,
+            "steps": outcomes
+        }
+        
+        return dump_result(result)
+        
+    except httpx.HTTPStatusError as e:
+        return dump_result({
+            "status": "error",
+            "message": f"HTTP error applying project plan: {e.response.status_code}",
+            "details": e.response.text
+        })
+    
+    except Exception as e:
+        return dump_result({
+            "status": "error",
+            "message": f"Error applying project plan: {str(e)}"
+        })
+
 
 if __name__ == "__main__":
     mcp.run()
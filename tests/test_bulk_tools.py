@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the bulk tools in selise_mcp_server, run against the mock Selise API.
+Covers idempotence (a second run writes nothing), dry runs and partial-failure reporting.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "src"))
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "benchmarks"))
+
+import selise_mcp_server as server  # noqa: E402
+from mock_selise_api import create_app  # noqa: E402
+
+WRITE_PATHS = {
+    "/iam/v1/Resource/CreateRole",
+    "/iam/v1/Resource/CreatePermission",
+    "/iam/v1/Resource/UpdatePermission",
+    "/iam/v1/Resource/SetRoles",
+    "/graphql/v1/schemas/info",
+    "/graphql/v1/schemas/fields"
+}
+
+
+class FaultyTransport(httpx.AsyncBaseTransport):
+    """Forward requests to the mock app, answering the ones fail(request) selects with an HTTP 500."""
+
+    def __init__(self, app, fail=None):
+        self.inner = httpx.ASGITransport(app=app)
+        self.fail = fail
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.fail and self.fail(request):
+            return httpx.Response(500, json={"isSuccess": False, "errors": {"message": "injected failure"}})
+        return await self.inner.handle_async_request(request)
+
+
+def run_tool(app, tool_call, fail=None) -> dict:
+    """Log in to the mock app and return the parsed result of await tool_call()."""
+    server.invalidate_cache()
+    server.circuit_state["circuits"].clear()
+
+    async def run():
+        server.http_state["client"] = httpx.AsyncClient(transport=FaultyTransport(app, fail))
+        try:
+            await server.login("user@example.com", "secret")
+            return json.loads(await tool_call())
+        finally:
+            server.cancel_token_refresh()
+            await server.close_http_client()
+
+    try:
+        return asyncio.run(run())
+    finally:
+        server.circuit_state["circuits"].clear()
+
+
+def writes(app) -> int:
+    return sum(count for path, count in app.state.mock["stats"]["by_path"].items() if path in WRITE_PATHS)
+
+
+def posted(path: str, **fields):
+    """Failure selector for POSTs to path whose JSON body contains the given values."""
+    def matches(request: httpx.Request) -> bool:
+        if request.url.path != path:
+            return False
+        body = json.loads(request.content or b"{}")
+        return all(body.get(name) == value for name, value in fields.items())
+    return matches
+
+
+def mock_project(**options) -> tuple:
+    app = create_app(projects=1, **options)
+    return app, app.state.mock["projects"][0]["tenantId"]
+
+
+ROLES = [
+    {"name": "Editor", "slug": "editor", "description": "Edits content"},
+    {"name": "Viewer", "slug": "viewer", "description": "Reads content"},
+    {"name": "Admin", "slug": "admin", "description": "Already exists"}
+]
+
+
+def test_roles_bulk_is_idempotent():
+    app, project_key = mock_project(roles=2)
+
+    first = run_tool(app, lambda: server.create_roles_bulk(ROLES, project_key, readback="full"))
+    writes_after_first = writes(app)
+    second = run_tool(app, lambda: server.create_roles_bulk(ROLES, project_key, readback="full"))
+
+    assert first["status"] == "success"
+    assert first["counts"] == {"created": 2, "skipped": 1, "failed": 0}
+    assert {"editor", "viewer"} <= {role["slug"] for role in first["updated_roles"]}
+    assert second["counts"] == {"created": 0, "skipped": 3, "failed": 0}
+    assert writes_after_first == 2
+    assert writes(app) == writes_after_first
+
+
+def test_roles_bulk_dry_run_writes_nothing():
+    app, project_key = mock_project(roles=2)
+
+    result = run_tool(app, lambda: server.create_roles_bulk(ROLES, project_key, dry_run=True))
+
+    assert result["dry_run"] is True
+    assert result["counts"] == {"to_create": 2, "skipped": 1}
+    assert writes(app) == 0
+
+
+def test_roles_bulk_reports_partial_failure():
+    app, project_key = mock_project(roles=2)
+
+    result = run_tool(
+        app,
+        lambda: server.create_roles_bulk(ROLES, project_key, readback="none"),
+        fail=posted("/iam/v1/Resource/CreateRole", slug="viewer")
+    )
+    rows = {row["slug"]: row for row in result["results"]}
+
+    assert result["status"] == "partial"
+    assert result["counts"] == {"created": 1, "skipped": 1, "failed": 1}
+    assert rows["editor"]["status"] == "created" and rows["editor"]["item_id"]
+    assert rows["viewer"]["status"] == "failed" and rows["viewer"]["error"].startswith("HTTP 500")
+
+    # A rerun only retries the role that failed
+    retry = run_tool(app, lambda: server.create_roles_bulk(ROLES, project_key, readback="none"))
+    assert retry["counts"] == {"created": 1, "skipped": 2, "failed": 0}
+
+
+PERMISSIONS = [
+    {"name": "reports-export", "description": "Export reports", "resource": "reports-export", "resource_group": "reports", "tags": ["reports"]},
+    # Existing mock permission with a new description
+    {"name": "orders-permission-1", "type": 2, "description": "Change orders", "resource": "orders-resource-0", "resource_group": "orders", "tags": ["mock", "orders"]}
+]
+
+
+def test_permissions_bulk_is_idempotent():
+    app, project_key = mock_project(permissions=16)
+
+    first = run_tool(app, lambda: server.upsert_permissions_bulk(PERMISSIONS, project_key, readback="none"))
+    writes_after_first = writes(app)
+    second = run_tool(app, lambda: server.upsert_permissions_bulk(PERMISSIONS, project_key, readback="none"))
+
+    assert first["status"] == "success"
+    assert first["counts"] == {"created": 1, "updated": 1, "unchanged": 0, "failed": 0}
+    assert first["results"][1]["changed_fields"] == ["description"]
+    assert second["counts"] == {"created": 0, "updated": 0, "unchanged": 2, "failed": 0}
+    assert writes_after_first == 2
+    assert writes(app) == writes_after_first
+
+
+def test_permissions_bulk_dry_run_writes_nothing():
+    app, project_key = mock_project(permissions=16)
+
+    result = run_tool(app, lambda: server.upsert_permissions_bulk(PERMISSIONS, project_key, dry_run=True))
+
+    assert result["counts"] == {"to_create": 1, "to_update": 1, "unchanged": 0, "failed": 0}
+    assert writes(app) == 0
+
+
+def test_permissions_bulk_reports_partial_failure():
+    app, project_key = mock_project(permissions=16)
+    entries = PERMISSIONS + [
+        {"name": "typo-group", "resource": "typo", "resource_group": "reprots"},
+        {"name": "no-resource", "resource_group": "reports"}
+    ]
+
+    result = run_tool(
+        app,
+        lambda: server.upsert_permissions_bulk(entries, project_key, allow_new_resource_groups=False, readback="none"),
+        fail=posted("/iam/v1/Resource/UpdatePermission", name="orders-permission-1")
+    )
+    rows = result["results"]
+
+    assert result["status"] == "partial"
+    assert result["counts"] == {"created": 1, "updated": 0, "unchanged": 0, "failed": 3}
+    assert rows[1]["error"].startswith("HTTP 500")
+    assert rows[2]["error"] == "Unknown resource group 'reprots'"
+    assert rows[3]["error"] == "Missing required field(s): resource"
+    # Invalid entries are rejected before any request is sent; only the create reached the mock
+    assert writes(app) == 1
+
+
+MATRIX = {
+    "admin": ["users-permission-0", "orders-permission-1"],
+    "role-1": ["products-permission-2"]
+}
+
+
+def test_role_permission_matrix_is_idempotent():
+    app, project_key = mock_project(roles=3, permissions=16)
+
+    first = run_tool(app, lambda: server.set_role_permission_matrix(MATRIX, project_key, readback="full"))
+    writes_after_first = writes(app)
+    second = run_tool(app, lambda: server.set_role_permission_matrix(MATRIX, project_key, readback="full"))
+
+    assert first["status"] == "success"
+    assert first["counts"] == {"updated": 2, "unchanged": 0, "failed": 0}
+    assert first["updated_matrix"] == {slug: sorted(names) for slug, names in MATRIX.items()}
+    assert second["counts"] == {"updated": 0, "unchanged": 2, "failed": 0}
+    assert "updated_matrix" not in second
+    # One set_role_permissions request per changed role
+    assert writes_after_first == 2
+    assert writes(app) == writes_after_first
+
+
+def test_role_permission_matrix_dry_run_writes_nothing():
+    app, project_key = mock_project(roles=3, permissions=16)
+
+    result = run_tool(app, lambda: server.set_role_permission_matrix(MATRIX, project_key, dry_run=True))
+
+    assert result["counts"] == {"to_update": 2, "unchanged": 0, "failed": 0}
+    assert writes(app) == 0
+
+
+def test_role_permission_matrix_reports_partial_failure():
+    app, project_key = mock_project(roles=3, permissions=16)
+    matrix = {**MATRIX, "role-2": ["no-such-permission"]}
+
+    result = run_tool(
+        app,
+        lambda: server.set_role_permission_matrix(matrix, project_key, readback="none"),
+        fail=posted("/iam/v1/Resource/SetRoles", slug="role-1")
+    )
+    rows = {row["role_slug"]: row for row in result["results"]}
+
+    assert result["status"] == "partial"
+    assert result["counts"] == {"updated": 1, "unchanged": 0, "failed": 2}
+    assert rows["admin"]["status"] == "updated"
+    assert rows["role-1"]["error"].startswith("HTTP 500")
+    # A role with an unknown permission is left untouched
+    assert rows["role-2"]["error"] == "Unknown permission(s): ['no-such-permission']"
+
+    retry = run_tool(app, lambda: server.set_role_permission_matrix(MATRIX, project_key, readback="none"))
+    assert retry["counts"] == {"updated": 1, "unchanged": 1, "failed": 0}
+
+
+SCHEMAS = [
+    {"name": "Article", "fields": [{"name": "Title", "type": "String", "isArray": False}]},
+    {"name": "Comment"},
+    {"name": "MockEntity0"}
+]
+
+
+def test_schemas_bulk_is_idempotent():
+    app, project_key = mock_project(schemas=2)
+
+    first = run_tool(app, lambda: server.create_schemas_bulk(SCHEMAS, project_key, readback="full"))
+    writes_after_first = writes(app)
+    second = run_tool(app, lambda: server.create_schemas_bulk(SCHEMAS, project_key, readback="full"))
+    rows = {row["name"]: row for row in first["results"]}
+
+    assert first["status"] == "success"
+    assert first["counts"] == {"created": 2, "skipped": 1, "failed": 0}
+    assert rows["Article"]["fields"] == "saved 1 field(s)"
+    assert {"Article", "Comment"} <= {schema["name"] for schema in first["updated_schemas"]}
+    assert second["counts"] == {"created": 0, "skipped": 3, "failed": 0}
+    # Two creates and one field save, then nothing
+    assert writes_after_first == 3
+    assert writes(app) == writes_after_first
+
+
+def test_schemas_bulk_skips_existing_schemas_beyond_the_first_page():
+    app, project_key = mock_project(schemas=150)
+    schemas = [{"name": "Extra"}, {"name": "MockEntity0"}, {"name": "MockEntity149"}]
+
+    result = run_tool(app, lambda: server.create_schemas_bulk(schemas, project_key, readback="full"))
+
+    assert result["counts"] == {"created": 1, "skipped": 2, "failed": 0}
+    assert len(result["updated_schemas"]) == 151
+    assert writes(app) == 1
+
+
+def test_schemas_bulk_reports_partial_failure():
+    app, project_key = mock_project(schemas=2)
+
+    result = run_tool(
+        app,
+        lambda: server.create_schemas_bulk(SCHEMAS, project_key, readback="none"),
+        fail=lambda request: (
+            posted("/graphql/v1/schemas/info", schemaName="Comment")(request)
+            or request.url.path == "/graphql/v1/schemas/fields"
+        )
+    )
+    rows = {row["name"]: row for row in result["results"]}
+
+    assert result["status"] == "partial"
+    assert result["counts"] == {"created": 1, "skipped": 1, "failed": 1}
+    assert rows["Comment"]["error"].startswith("HTTP 500")
+    # The schema was created but its fields were not saved
+    assert rows["Article"]["status"] == "created"
+    assert rows["Article"]["fields"] == "failed: HTTP 500"
+
+
+def test_schemas_bulk_lists_once_more_only_after_creating():
+    app, project_key = mock_project(schemas=2)
+    by_path = app.state.mock["stats"]["by_path"]
+    original = server.CACHE_CONFIG["enabled"]
+    # Count every listing, not just the ones the response cache lets through
+    server.CACHE_CONFIG["enabled"] = False
+    try:
+        run_tool(app, lambda: server.create_schemas_bulk(SCHEMAS, project_key, readback="full"))
+        listings_with_creates = by_path["/graphql/v1/schemas"]
+        unchanged = run_tool(app, lambda: server.create_schemas_bulk(SCHEMAS, project_key, readback="full"))
+        listings_without_creates = by_path["/graphql/v1/schemas"] - listings_with_creates
+    finally:
+        server.CACHE_CONFIG["enabled"] = original
+
+    # The up-front listing, plus one trailing listing after the creates
+    assert listings_with_creates == 2
+    assert listings_without_creates == 1
+    assert {"Article", "Comment", "MockEntity0"} <= {schema["name"] for schema in unchanged["updated_schemas"]}
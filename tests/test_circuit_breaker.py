@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the per-service circuit breaker in selise_mcp_server.
+Covers opening after consecutive failures, failing fast, the half-open probe and closing again.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import selise_mcp_server as server  # noqa: E402
+
+URL = server.API_CONFIG["CAPTCHA_LIST_URL"]
+OTHER_URL = server.API_CONFIG["GET_PROJECTS_URL"]
+
+
+def run_with_upstream(statuses: dict, scenario, **config):
+    """
+    Run scenario(send) against an upstream whose status per URL path is read from statuses at request time.
+
+    Returns the scenario's result, the number of requests that reached the upstream and the final circuit state.
+    """
+    original = dict(server.CIRCUIT_CONFIG)
+    server.CIRCUIT_CONFIG.update({"enabled": True, "failure_threshold": 3, "reset_timeout": 0.05, **config})
+    server.circuit_state["circuits"].clear()
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.02)
+        return httpx.Response(statuses[request.url.path], json={})
+
+    async def send(url: str = URL):
+        try:
+            return (await server.api_request("GET", url, retry=False)).status_code
+        except server.CircuitOpenError as e:
+            return e
+
+    async def run():
+        server.http_state["client"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await scenario(send)
+        finally:
+            await server.close_http_client()
+
+    try:
+        result = asyncio.run(run())
+        return result, len(calls), dict(circuit())
+    finally:
+        server.CIRCUIT_CONFIG.update(original)
+        server.circuit_state["circuits"].clear()
+
+
+def circuit() -> dict:
+    return server.get_circuit(server.service_for_url(URL))
+
+
+def test_opens_after_consecutive_failures_and_fails_fast():
+    statuses = {httpx.URL(URL).path: 503, httpx.URL(OTHER_URL).path: 200}
+
+    async def scenario(send):
+        return [await send() for _ in range(4)] + [await send(OTHER_URL)]
+
+    results, upstream_calls, final = run_with_upstream(statuses, scenario)
+
+    assert results[:3] == [503, 503, 503]
+    rejected = results[3]
+    assert isinstance(rejected, server.CircuitOpenError)
+    assert json.loads(rejected.response.text)["error"] == "circuit_open"
+    # The open circuit only affects its own service
+    assert results[4] == 200
+    assert upstream_calls == 4
+    assert final["state"] == "open"
+    assert final["times_opened"] == 1
+
+
+def test_client_errors_do_not_count():
+    statuses = {httpx.URL(URL).path: 404}
+
+    async def scenario(send):
+        return [await send() for _ in range(5)]
+
+    results, upstream_calls, final = run_with_upstream(statuses, scenario)
+
+    assert results == [404] * 5
+    assert upstream_calls == 5
+    assert final["state"] == "closed"
+
+
+def test_half_open_probe_closes_or_reopens():
+    path = httpx.URL(URL).path
+    statuses = {path: 503}
+
+    async def scenario(send):
+        for _ in range(3):
+            await send()
+        await asyncio.sleep(0.06)
+
+        # One probe goes through; a concurrent request is rejected while it is in flight
+        statuses[path] = 503
+        probe, concurrent = await asyncio.gather(send(), send())
+        reopened = circuit()["state"]
+
+        await asyncio.sleep(0.06)
+        statuses[path] = 200
+        recovered = await send()
+        return probe, concurrent, reopened, recovered
+
+    (probe, concurrent, reopened, recovered), upstream_calls, final = run_with_upstream(statuses, scenario)
+
+    assert probe == 503
+    assert isinstance(concurrent, server.CircuitOpenError)
+    assert reopened == "open"
+    assert recovered == 200
+    assert final["state"] == "closed"
+    assert final["consecutive_failures"] == 0
+    assert upstream_calls == 5
+
+
+def test_probe_is_released_when_cancelled_in_the_rate_limiter():
+    path = httpx.URL(URL).path
+    statuses = {path: 503}
+    service = server.service_for_url(URL)
+    original_limits = dict(server.RATE_LIMIT_CONFIG)
+
+    async def scenario(send):
+        for _ in range(3):
+            await send()
+        await asyncio.sleep(0.06)
+
+        # The probe waits for a drained token bucket and is cancelled there
+        server.RATE_LIMIT_CONFIG.update({"enabled": True, "services": {service: {"rate": 0.5, "burst": 1.0}}})
+        await server.acquire_rate_limit(URL)
+        probe = asyncio.ensure_future(send())
+        await asyncio.sleep(0.02)
+        claimed = circuit()["probe_in_flight"]
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+        released = circuit()["probe_in_flight"]
+
+        server.RATE_LIMIT_CONFIG.update(original_limits)
+        statuses[path] = 200
+        return claimed, released, await send()
+
+    try:
+        (claimed, released, recovered), upstream_calls, final = run_with_upstream(statuses, scenario)
+    finally:
+        server.RATE_LIMIT_CONFIG.update(original_limits)
+        server.rate_limit_state["buckets"].clear()
+
+    assert claimed is True
+    assert released is False
+    assert recovered == 200
+    assert final["state"] == "closed"
+    assert upstream_calls == 4
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Offline tests for single-flight coalescing of identical reads in selise_mcp_server.
+Covers sharing one upstream request, distinct parameters, cancellation, errors
+and invalidation while a read is in flight.
+"""
+
+import asyncio
+import os
+import sys
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import selise_mcp_server as server  # noqa: E402
+
+URL = server.API_CONFIG["IAM_GET_ROLES_URL"]
+
+
+def reset_state():
+    server.invalidate_cache()
+    server.coalesce_state["in_flight"].clear()
+    server.coalesce_state.update({"requests": 0, "hits": 0, "by_endpoint": {}})
+    server.circuit_state["circuits"].clear()
+
+
+class Upstream:
+    """Mock upstream that holds every request until released and answers with a response version."""
+
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.calls = []
+        self.release = asyncio.Event()
+        self.arrived = asyncio.Event()
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.content)
+        version = len(self.calls)
+        self.arrived.set()
+        await self.release.wait()
+        return httpx.Response(self.status, json={"version": version})
+
+
+def run(scenario, status: int = 200):
+    reset_state()
+
+    async def main():
+        upstream = Upstream(status)
+        server.http_state["client"] = httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler))
+        try:
+            return await scenario(upstream)
+        finally:
+            await server.close_http_client()
+
+    try:
+        return asyncio.run(main())
+    finally:
+        reset_state()
+
+
+def fetch(page: int = 0, **kwargs):
+    payload = {"page": page, "pageSize": 10, "projectKey": "P1"}
+    return server.fetch_json("list_roles", "P1", "POST", URL, cache_params=payload, json=payload, retry=False, **kwargs)
+
+
+def test_identical_reads_share_one_request():
+    async def scenario(upstream):
+        tasks = [asyncio.ensure_future(fetch()) for _ in range(5)]
+        await upstream.arrived.wait()
+        upstream.release.set()
+        return await asyncio.gather(*tasks), len(upstream.calls), dict(server.coalesce_state["by_endpoint"])
+
+    results, upstream_calls, by_endpoint = run(scenario)
+
+    assert results == [{"version": 1}] * 5
+    assert upstream_calls == 1
+    assert by_endpoint["list_roles"] == {"requests": 1, "hits": 4}
+    assert server.coalesce_state["in_flight"] == {}
+
+
+def test_different_parameters_are_fetched_separately():
+    async def scenario(upstream):
+        tasks = [asyncio.ensure_future(fetch(page)) for page in (0, 1, 0)]
+        await upstream.arrived.wait()
+        upstream.release.set()
+        await asyncio.gather(*tasks)
+        return len(upstream.calls), server.coalesce_state["requests"], server.coalesce_state["hits"]
+
+    assert run(scenario) == (2, 2, 1)
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_request():
+    async def scenario(upstream):
+        first = asyncio.ensure_future(fetch())
+        second = asyncio.ensure_future(fetch())
+        await upstream.arrived.wait()
+        first.cancel()
+        await asyncio.sleep(0)
+        upstream.release.set()
+        return first.cancelled(), await second
+
+    cancelled, result = run(scenario)
+
+    assert cancelled is True
+    assert result == {"version": 1}
+
+
+def test_errors_reach_every_caller_and_clear_the_flight():
+    async def scenario(upstream):
+        tasks = [asyncio.ensure_future(fetch()) for _ in range(3)]
+        await upstream.arrived.wait()
+        upstream.release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return results, len(upstream.calls), dict(server.coalesce_state["in_flight"]), len(server.cache_state["entries"])
+
+    results, upstream_calls, in_flight, cached = run(scenario, status=500)
+
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+    assert upstream_calls == 1
+    assert in_flight == {}
+    assert cached == 0
+
+
+def test_invalidation_detaches_an_in_flight_read():
+    async def scenario(upstream):
+        stale = asyncio.ensure_future(fetch())
+        await upstream.arrived.wait()
+
+        # A write lands while the first read is in flight: later readers must not join it
+        server.invalidate_cache("list_roles", "P1")
+        fresh = asyncio.ensure_future(fetch())
+        while len(upstream.calls) < 2:
+            await asyncio.sleep(0)
+        upstream.release.set()
+        stale_result, fresh_result = await asyncio.gather(stale, fresh)
+
+        # Only the post-write response is cached
+        cached = await fetch()
+        return stale_result, fresh_result, cached, len(upstream.calls)
+
+    stale_result, fresh_result, cached, upstream_calls = run(scenario)
+
+    assert stale_result == {"version": 1}
+    assert fresh_result == {"version": 2}
+    assert cached == {"version": 2}
+    assert upstream_calls == 2
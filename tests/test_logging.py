@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the structured logger in selise_mcp_server.
+Covers the JSON line format, tool-call context and DEBUG sampling.
+"""
+
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import selise_mcp_server as server  # noqa: E402
+
+
+def make_record(level: int, event: str, **fields) -> logging.LogRecord:
+    return server.logger.makeRecord(server.logger.name, level, __file__, 0, event, None, None, extra={"fields": fields})
+
+
+def test_json_line_with_tool_context():
+    token = server.log_context.set({"request_id": "abc123", "tool": "list_roles"})
+    try:
+        record = make_record(logging.INFO, "tool_call", outcome="success", latency_ms=12.5)
+        assert server.LogContextFilter().filter(record)
+    finally:
+        server.log_context.reset(token)
+
+    entry = json.loads(server.JsonLogFormatter().format(record))
+    assert entry["event"] == "tool_call"
+    assert entry["level"] == "info"
+    assert (entry["request_id"], entry["tool"]) == ("abc123", "list_roles")
+    assert (entry["outcome"], entry["latency_ms"]) == ("success", 12.5)
+
+
+def test_debug_sampling_keeps_other_levels():
+    original = server.LOG_CONFIG["debug_sample_rate"]
+    server.LOG_CONFIG["debug_sample_rate"] = 0.0
+    try:
+        log_filter = server.LogContextFilter()
+        assert not log_filter.filter(make_record(logging.DEBUG, "upstream_request"))
+        assert log_filter.filter(make_record(logging.WARNING, "upstream_error"))
+    finally:
+        server.LOG_CONFIG["debug_sample_rate"] = original
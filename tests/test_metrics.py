@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the latency metrics in selise_mcp_server.
+Covers histogram percentiles, endpoint naming and the Prometheus text dump.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import selise_mcp_server as server  # noqa: E402
+
+
+def test_histogram_percentiles():
+    histogram = server.new_histogram()
+    for _ in range(90):
+        server.observe_latency(histogram, 0.008)
+    for _ in range(10):
+        server.observe_latency(histogram, 0.4)
+
+    summary = server.summarize_histogram(histogram)
+    assert summary["count"] == 100
+    assert 5 <= summary["p50_ms"] <= 10
+    assert 250 <= summary["p95_ms"] <= 400
+    assert summary["max_ms"] == 400.0
+    assert server.summarize_histogram(server.new_histogram())["p99_ms"] is None
+
+
+def test_endpoint_names_collapse_ids():
+    roles_url = server.API_CONFIG["IAM_GET_ROLES_URL"]
+    schema_url = server.API_CONFIG["GET_SCHEMA_URL"]
+
+    assert server.endpoint_name("post", roles_url) == "POST IAM_GET_ROLES_URL"
+    assert server.endpoint_name("GET", f"{schema_url}/abc-123") == "GET GET_SCHEMA_URL/{id}"
+
+
+def test_prometheus_dump():
+    server.reset_metrics()
+    server.record_upstream_request("POST", server.API_CONFIG["IAM_GET_ROLES_URL"], 0.03, None)
+
+    text = server.render_prometheus_metrics()
+    assert 'selise_mcp_upstream_duration_seconds_bucket{endpoint="POST IAM_GET_ROLES_URL",le="0.05"} 1' in text
+    assert 'selise_mcp_upstream_errors_total{endpoint="POST IAM_GET_ROLES_URL"} 1' in text
+    server.reset_metrics()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Offline tests for tool result serialization in selise_mcp_server.
+Covers the pretty, compact, summary and raw output modes, field projection and
+automatic read-backs under a non-default server output mode.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "src"))
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "benchmarks"))
+
+import selise_mcp_server as server  # noqa: E402
+from mock_selise_api import create_app  # noqa: E402
+
+
+RESULT = {
+    "status": "success",
+    "roles": [{"itemId": "r1", "name": "Admin", "slug": "admin"}],
+    "summary": [{"name": "Admin", "slug": "admin"}]
+}
+
+
+def test_pretty_and_compact_without_orjson():
+    original = server.orjson
+    server.orjson = None
+    try:
+        assert server.dump_result(RESULT, "pretty") == json.dumps(RESULT, indent=2)
+        assert server.dump_result(RESULT, "compact") == json.dumps(RESULT, separators=(",", ":"))
+    finally:
+        server.orjson = original
+
+
+def test_summary_and_raw_modes_drop_the_other_list():
+    summary = json.loads(server.dump_result(RESULT, "summary"))
+    raw = json.loads(server.dump_result(RESULT, "raw"))
+
+    assert "roles" not in summary and summary["summary"] == RESULT["summary"]
+    assert "summary" not in raw and raw["roles"] == RESULT["roles"]
+    # The caller's result is left untouched
+    assert "roles" in RESULT and "summary" in RESULT
+
+
+def test_field_projection_and_invalid_mode():
+    projected = json.loads(server.dump_result(RESULT, "raw", fields=["itemId"]))
+
+    assert projected["roles"] == [{"itemId": "r1"}]
+    assert server.resolve_output_mode("bogus") is None
+
+
+def test_readback_ignores_summary_output_mode():
+    app = create_app(projects=1, roles=2)
+    project_key = app.state.mock["projects"][0]["tenantId"]
+
+    async def create_role_in_summary_mode():
+        server.invalidate_cache()
+        server.http_state["client"] = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+        try:
+            await server.login("user@example.com", "secret")
+            return json.loads(await server.create_role("Reviewer", "Reviews content", "reviewer", project_key, readback="full"))
+        finally:
+            server.cancel_token_refresh()
+            await server.close_http_client()
+
+    original = server.OUTPUT_CONFIG["mode"]
+    server.OUTPUT_CONFIG["mode"] = "summary"
+    try:
+        result = asyncio.run(create_role_in_summary_mode())
+    finally:
+        server.OUTPUT_CONFIG["mode"] = original
+
+    assert result["status"] == "success"
+    assert "reviewer" in [role["slug"] for role in result["updated_roles"]]
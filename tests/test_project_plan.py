@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Offline tests for apply_project_plan in selise_mcp_server, run against the mock Selise API.
+Covers idempotence, settings that cannot be read back, dry runs, partial failures,
+a mismatched project_key and the payloads shared with the single-purpose tools.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "src"))
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "benchmarks"))
+
+import selise_mcp_server as server  # noqa: E402
+from mock_selise_api import DEFAULT_PROJECT_NAME, create_app  # noqa: E402
+
+WRITE_PATHS = {
+    "/identifier/v1/Project/Create",
+    "/graphql/v1/schemas/info",
+    "/graphql/v1/schemas/fields",
+    "/graphql/v1/configurations",
+    "/iam/v1/Resource/CreateRole",
+    "/iam/v1/Resource/CreatePermission",
+    "/iam/v1/Resource/UpdatePermission",
+    "/iam/v1/Resource/SetRoles",
+    "/captcha/v1/Configuration/Save",
+    "/authentication/v1/Social/SaveSsoCredential",
+    "/mfa/v1/Configuration/Save",
+    "/authentication/v1/Configuration/Update"
+}
+
+APPLICATION_DOMAIN = f"https://dev-{DEFAULT_PROJECT_NAME}.seliseblocks.com"
+
+DOCUMENT = {
+    "project": {"name": DEFAULT_PROJECT_NAME},
+    "schemas": [{"name": "Article", "fields": [{"name": "Title", "type": "String", "isArray": False}]}],
+    "data_gateway": {"enableDataGateway": True, "enableRealTimeSubscriptions": False},
+    "roles": [{"name": "Editor", "slug": "editor", "description": "Edits articles"}],
+    "permissions": [{"name": "articles-edit", "resource": "articles", "resource_group": "reports", "tags": ["articles"]}],
+    "role_permissions": {"editor": ["articles-edit"]},
+    "captcha": {"provider": "recaptcha", "site_key": "site-key", "secret_key": "secret", "is_enable": True},
+    "sso": [{"provider": "google", "client_id": "client-id", "client_secret": "client-secret"}],
+    "mfa": ["authenticator"],
+    "social_login": {"refresh_token_minutes": 600}
+}
+
+
+class FaultyTransport(httpx.AsyncBaseTransport):
+    """Forward requests to the mock app, answering the ones fail(request) selects with an HTTP 500."""
+
+    def __init__(self, app, fail=None):
+        self.inner = httpx.ASGITransport(app=app)
+        self.fail = fail
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.fail and self.fail(request):
+            return httpx.Response(500, json={"isSuccess": False, "errors": {"message": "injected failure"}})
+        return await self.inner.handle_async_request(request)
+
+
+def reset_state():
+    server.invalidate_cache()
+    server.circuit_state["circuits"].clear()
+    server.plan_state["applied"].clear()
+
+
+def apply(app, document: dict = DOCUMENT, fail=None, **kwargs) -> dict:
+    """Log in to the mock app and return the parsed result of apply_project_plan."""
+    server.invalidate_cache()
+    server.circuit_state["circuits"].clear()
+
+    async def run():
+        server.http_state["client"] = httpx.AsyncClient(transport=FaultyTransport(app, fail))
+        try:
+            await server.login("user@example.com", "secret")
+            server.app_state["application_domain"] = APPLICATION_DOMAIN
+            return json.loads(await server.apply_project_plan(document, **kwargs))
+        finally:
+            server.cancel_token_refresh()
+            await server.close_http_client()
+
+    try:
+        return asyncio.run(run())
+    finally:
+        server.circuit_state["circuits"].clear()
+
+
+def writes(app) -> int:
+    return sum(count for path, count in app.state.mock["stats"]["by_path"].items() if path in WRITE_PATHS)
+
+
+def statuses(result: dict) -> dict:
+    return {name: step["status"] for name, step in result["steps"].items()}
+
+
+def mock_project() -> tuple:
+    reset_state()
+    app = create_app(projects=1, roles=2, permissions=16, schemas=2)
+    return app, app.state.mock["projects"][0]["tenantId"]
+
+
+def test_second_apply_makes_no_writes():
+    app, project_key = mock_project()
+    try:
+        first = apply(app)
+        writes_after_first = writes(app)
+        second = apply(app)
+    finally:
+        reset_state()
+
+    assert first["status"] == "success"
+    assert first["project_key"] == project_key
+    assert set(statuses(first).values()) == {"unchanged", "applied"}
+    assert statuses(first)["project"] == "unchanged"
+    assert writes_after_first > 0
+
+    assert second["status"] == "success"
+    assert writes(app) == writes_after_first
+    # Settings the API cannot read back are reported as unknown, not unchanged
+    assert statuses(second) == {
+        **{name: "unchanged" for name in second["steps"]},
+        "sso": "unknown",
+        "mfa": "unknown",
+        "data_gateway": "unknown"
+    }
+    assert second["message"].startswith("No changes to apply; 3 step(s) cannot be read back")
+
+
+def test_write_only_settings_are_written_again_without_a_record():
+    app, _ = mock_project()
+    try:
+        apply(app)
+        # As after a restart without SELISE_PERSIST_STATE
+        server.plan_state["applied"].clear()
+        planned = apply(app, dry_run=True)
+    finally:
+        reset_state()
+
+    assert statuses(planned)["sso"] == "planned"
+    assert planned["steps"]["sso"]["changes"] == ["apply sso google (no record of the live settings)"]
+    # The captcha site key matches live state, but its secret can only be checked against the record
+    assert statuses(planned)["captcha"] == "planned"
+    assert planned["steps"]["captcha"]["changes"] == ["save recaptcha captcha configuration (no record of the secret key)"]
+    assert statuses(planned)["roles"] == "unchanged"
+
+
+def test_changed_captcha_secret_is_saved_without_a_record():
+    app, project_key = mock_project()
+    document = {"captcha": DOCUMENT["captcha"]}
+    rotated = {"captcha": {**DOCUMENT["captcha"], "secret_key": "rotated-secret"}}
+    try:
+        apply(app, document, project_key=project_key)
+        server.plan_state["applied"].clear()
+        result = apply(app, rotated, project_key=project_key)
+        again = apply(app, rotated, project_key=project_key)
+    finally:
+        reset_state()
+
+    assert statuses(result) == {"captcha": "applied"}
+    assert statuses(again) == {"captcha": "unchanged"}
+    assert app.state.mock["stats"]["by_path"]["/captcha/v1/Configuration/Save"] == 2
+
+
+def test_dry_run_writes_nothing():
+    app, _ = mock_project()
+    try:
+        result = apply(app, dry_run=True)
+    finally:
+        reset_state()
+
+    steps = statuses(result)
+    assert result["dry_run"] is True
+    assert writes(app) == 0
+    assert steps["schemas"] == "planned"
+    # Steps that depend on planned changes cannot be compared until those are applied
+    assert steps["schema_fields"] == "pending"
+    assert steps["data_gateway"] == "pending"
+    assert steps["role_permissions"] == "pending"
+    assert server.plan_state["applied"] == {}
+
+
+def test_partial_failure_skips_dependent_steps():
+    app, _ = mock_project()
+    try:
+        result = apply(app, fail=lambda request: request.url.path in ("/graphql/v1/schemas/info", "/mfa/v1/Configuration/Save"))
+        retry = apply(app)
+    finally:
+        reset_state()
+
+    steps = statuses(result)
+    assert result["status"] == "partial"
+    assert steps["schemas"] == "failed"
+    assert steps["schema_fields"] == "skipped"
+    assert steps["data_gateway"] == "skipped"
+    assert steps["mfa"] == "failed"
+    assert result["steps"]["mfa"]["errors"] == ["config: HTTP 500"]
+    assert steps["roles"] == "applied"
+    assert steps["sso"] == "applied"
+
+    # The failed and skipped steps are applied on the next run; the rest is left alone
+    retry_steps = statuses(retry)
+    assert retry["status"] == "success"
+    assert {name for name, status in retry_steps.items() if status == "applied"} == {"schemas", "schema_fields", "data_gateway", "mfa"}
+
+
+def test_mismatched_project_key_is_rejected():
+    app, _ = mock_project()
+    try:
+        result = apply(app, project_key="OTHERPROJECTKEY")
+    finally:
+        reset_state()
+
+    assert result["status"] == "error"
+    assert result["steps"]["project"]["errors"] == [
+        f"project_key 'OTHERPROJECTKEY' does not match project '{DEFAULT_PROJECT_NAME}' (tenant ID 'MOCKPROJECTKEY0001')"
+    ]
+    assert statuses(result)["schemas"] == "skipped"
+    assert writes(app) == 0
+
+
+def test_plan_writes_the_same_payloads_as_the_tools():
+    app, project_key = mock_project()
+    try:
+        apply(app, {"sso": DOCUMENT["sso"], "mfa": DOCUMENT["mfa"], "data_gateway": DOCUMENT["data_gateway"]}, project_key=project_key)
+    finally:
+        reset_state()
+    project = app.state.mock["project_data"][project_key]
+
+    assert project["sso"] == [server.sso_credential_payload(project_key, "google", "client-id", "client-secret")]
+    assert project["sso"][0]["redirectUri"] == f"{APPLICATION_DOMAIN}/auth/google/callback"
+    assert project["mfa"] == {"projectKey": project_key, "enableMfa": True, "userMfaType": [2, 1]}
+    assert project["data_gateway"] == server.data_gateway_payload(project_key, DOCUMENT["data_gateway"])
+
+
+def test_new_project_without_a_tenant_id_fails_the_plan():
+    app, project_key = mock_project()
+    document = {"project": {"name": "newproject"}, "schemas": [{"name": "Article"}]}
+    original_retry = dict(server.RETRY_CONFIG)
+    original_poll = dict(server.PROJECT_INDEX_CONFIG)
+    server.RETRY_CONFIG["enabled"] = False
+    server.PROJECT_INDEX_CONFIG.update({"poll_attempts": 1, "poll_interval": 0})
+    # A previously selected project must not receive the new project's writes
+    server.app_state["tenant_id"] = project_key
+    try:
+        result = apply(
+            app,
+            document,
+            # The new project never shows up in its tenant group's listing
+            fail=lambda request: (
+                request.url.path == "/identifier/v1/Project/Gets"
+                and request.url.params.get("tenantGroupId") not in ("", None, app.state.mock["projects"][0]["tenantGroupId"])
+            )
+        )
+    finally:
+        server.RETRY_CONFIG.update(original_retry)
+        server.PROJECT_INDEX_CONFIG.update(original_poll)
+        server.app_state["tenant_id"] = None
+        reset_state()
+
+    assert statuses(result) == {"project": "failed", "schemas": "skipped"}
+    assert "tenant ID could not be resolved" in result["steps"]["project"]["errors"][0]
+    assert app.state.mock["stats"]["by_path"]["/identifier/v1/Project/Create"] == 1
+    assert "/graphql/v1/schemas/info" not in app.state.mock["stats"]["by_path"]
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the client-side token-bucket rate limiter in selise_mcp_server.
+Covers the opt-in default, burst and pacing, arrival order and per-service buckets.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import selise_mcp_server as server  # noqa: E402
+
+ROLES_URL = server.API_CONFIG["IAM_GET_ROLES_URL"]
+CAPTCHA_URL = server.API_CONFIG["CAPTCHA_LIST_URL"]
+
+
+def send_all(requests: list, limits: dict) -> tuple:
+    """
+    Send (label, method, url) requests concurrently with the given per-service limits.
+    
+    Returns (label, seconds) pairs in arrival order and the bucket counters per service.
+    """
+    original = dict(server.RATE_LIMIT_CONFIG)
+    server.RATE_LIMIT_CONFIG.update({"enabled": True, "services": limits})
+    server.rate_limit_state["buckets"].clear()
+    arrivals = []
+
+    async def run():
+        started_at = time.monotonic()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            arrivals.append((request.headers["x-label"], time.monotonic() - started_at))
+            return httpx.Response(200, json={})
+
+        server.http_state["client"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            await asyncio.gather(*(
+                server.api_request(method, url, headers={"x-label": label}, retry=False)
+                for label, method, url in requests
+            ))
+        finally:
+            await server.close_http_client()
+
+    try:
+        asyncio.run(run())
+        buckets = {
+            service: {key: bucket[key] for key in ("requests", "delayed", "max_queue_depth")}
+            for service, bucket in server.rate_limit_state["buckets"].items()
+        }
+    finally:
+        server.RATE_LIMIT_CONFIG.update(original)
+        server.rate_limit_state["buckets"].clear()
+    return arrivals, buckets
+
+
+def test_parse_rate_limit():
+    assert server.parse_rate_limit("5/10") == {"rate": 5.0, "burst": 10.0}
+    assert server.parse_rate_limit("3") == {"rate": 3.0, "burst": 3.0}
+
+
+def test_limiter_is_off_by_default():
+    if "SELISE_RATE_LIMIT" not in os.environ:
+        assert server.RATE_LIMIT_CONFIG["enabled"] is False
+
+    original = server.RATE_LIMIT_CONFIG["enabled"]
+    server.RATE_LIMIT_CONFIG["enabled"] = False
+    try:
+        assert asyncio.run(server.acquire_rate_limit(ROLES_URL)) == 0.0
+        assert server.rate_limit_state["buckets"] == {}
+    finally:
+        server.RATE_LIMIT_CONFIG["enabled"] = original
+
+
+def test_burst_then_paced_in_arrival_order():
+    requests = [(str(index), "POST", ROLES_URL) for index in range(6)]
+    arrivals, buckets = send_all(requests, {"iam": {"rate": 20.0, "burst": 2.0}})
+
+    assert [label for label, _ in arrivals] == [str(index) for index in range(6)]
+    # Two requests fit the burst; the other four are paced at 20 per second
+    assert arrivals[1][1] < 0.04
+    assert arrivals[-1][1] >= 0.18
+    assert buckets["iam"]["requests"] == 6
+    assert buckets["iam"]["delayed"] == 4
+    assert buckets["iam"]["max_queue_depth"] >= 4
+
+
+def test_services_have_separate_buckets():
+    requests = [(f"iam-{index}", "POST", ROLES_URL) for index in range(4)] + [("captcha", "GET", CAPTCHA_URL)]
+    arrivals, _ = send_all(requests, {"iam": {"rate": 10.0, "burst": 1.0}})
+    arrivals = dict(arrivals)
+
+    # The drained IAM bucket does not hold up the captcha service
+    assert arrivals["captcha"] < 0.05
+    assert arrivals["iam-3"] >= 0.25
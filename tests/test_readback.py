@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the post-write read-back modes in selise_mcp_server.
+Covers resolving the mode, the "delta" payload, the "deferred" background read and "none",
+with the write tools run against the mock Selise API.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "src"))
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "benchmarks"))
+
+import selise_mcp_server as server  # noqa: E402
+from mock_selise_api import create_app  # noqa: E402
+
+LIST_ROLES_PATH = "/iam/v1/Resource/GetRoles"
+
+
+def run_against_mock(app, scenario):
+    """Log in to the mock app and return await scenario(), after any background read-backs finish."""
+    server.invalidate_cache()
+    server.circuit_state["circuits"].clear()
+
+    async def run():
+        server.http_state["client"] = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+        try:
+            await server.login("user@example.com", "secret")
+            return await scenario()
+        finally:
+            await asyncio.gather(*server.background_tasks, return_exceptions=True)
+            server.cancel_token_refresh()
+            await server.close_http_client()
+
+    try:
+        return asyncio.run(run())
+    finally:
+        server.invalidate_cache()
+        server.circuit_state["circuits"].clear()
+
+
+def mock_project() -> tuple:
+    app = create_app(projects=1, roles=2)
+    return app, app.state.mock["projects"][0]["tenantId"]
+
+
+def role_listings(app) -> int:
+    return app.state.mock["stats"]["by_path"].get(LIST_ROLES_PATH, 0)
+
+
+def test_resolve_readback_mode():
+    original = server.READBACK_CONFIG["mode"]
+    server.READBACK_CONFIG["mode"] = "delta"
+    try:
+        assert server.resolve_readback_mode("") == "delta"
+        assert server.resolve_readback_mode("DEFERRED") == "deferred"
+        assert server.resolve_readback_mode("bogus") is None
+    finally:
+        server.READBACK_CONFIG["mode"] = original
+
+
+def test_apply_readback_mode_none_and_delta_do_not_read():
+    calls = []
+
+    def read_back():
+        calls.append(True)
+
+    result = {"status": "success"}
+    server.apply_readback_mode(result, "none", {"action": "created"}, read_back)
+    assert result == {"status": "success"}
+
+    server.apply_readback_mode(result, "delta", {"action": "created"}, read_back)
+    assert result == {"status": "success", "delta": {"action": "created"}}
+    assert calls == []
+
+
+def test_delta_returns_the_local_change_without_a_listing():
+    app, project_key = mock_project()
+
+    async def scenario():
+        single = json.loads(await server.create_role("Reviewer", "Reviews content", "reviewer", project_key, readback="delta"))
+        bulk = json.loads(await server.create_roles_bulk(
+            [{"name": "Editor", "slug": "editor"}, {"name": "Reviewer", "slug": "reviewer"}],
+            project_key,
+            readback="delta"
+        ))
+        return single, bulk
+
+    single, bulk = run_against_mock(app, scenario)
+
+    assert single["delta"] == {
+        "action": "created",
+        "role": {"slug": "reviewer", "name": "Reviewer", "item_id": single["role_details"]["item_id"]}
+    }
+    assert "updated_roles" not in single and "readback" not in single
+    assert bulk["delta"]["action"] == "created"
+    assert [row["slug"] for row in bulk["delta"]["roles"]] == ["editor"]
+    # Only create_roles_bulk's up-front listing reached the mock
+    assert role_listings(app) == 1
+
+
+def test_deferred_schedules_the_listing_in_the_background():
+    app, project_key = mock_project()
+
+    async def scenario():
+        result = json.loads(await server.create_role("Reviewer", "Reviews content", "reviewer", project_key, readback="deferred"))
+        scheduled = len(server.background_tasks)
+        listings_on_return = role_listings(app)
+        await asyncio.gather(*server.background_tasks)
+
+        # The background read warmed the cache, so the next listing is served without a request
+        listed = json.loads(await server.list_roles(project_key, output="raw"))
+        return result, scheduled, listings_on_return, listed
+
+    result, scheduled, listings_on_return, listed = run_against_mock(app, scenario)
+
+    assert result["readback"] == "deferred"
+    assert "delta" not in result and "updated_roles" not in result
+    assert scheduled == 1
+    assert listings_on_return == 0
+    assert role_listings(app) == 1
+    assert "reviewer" in [role["slug"] for role in listed["roles"]]
+    assert server.background_tasks == set()
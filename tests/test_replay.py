@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Offline regression tests that replay recorded Selise API sessions through the MCP tools.
+Covers the role, permission, CAPTCHA and role-assignment flows of the live-API scripts in
+this directory, plus cassette scrubbing.
+
+Re-record the cassettes against the live API (or any SELISE_API_BASE_URL):
+    SELISE_USERNAME=... SELISE_PASSWORD=... SELISE_PROJECT_KEY=... python tests/test_replay.py
+or against the local stand-in in benchmarks/mock_selise_api.py:
+    python tests/test_replay.py --mock
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import httpx
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+CASSETTE_DIR = os.path.join(TESTS_DIR, "cassettes")
+PROJECT_KEY = "95E5FD12E64E429295758B2CB1EA29D2"
+
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "src"))
+
+import selise_mcp_server as server  # noqa: E402
+
+
+async def role_flow(project_key: str) -> dict:
+    roles = json.loads(await server.list_roles(project_key))
+    created = json.loads(await server.create_role("Replay Editor", "Edits content", "replay-editor", project_key, readback="none"))
+    after = json.loads(await server.list_roles(project_key, bypass_cache=True))
+    return {"roles": roles, "created": created, "after": after}
+
+
+async def permission_flow(project_key: str) -> dict:
+    groups = json.loads(await server.get_resource_groups(project_key))
+    created = json.loads(await server.create_permission(
+        "replay-permission", "Created by the replay flow", "replay-resource", "replay", ["replay"], project_key, readback="none"
+    ))
+    listed = json.loads(await server.list_permissions(project_key, search="replay-permission", bypass_cache=True))
+    item_id = listed["permissions"][0]["itemId"]
+    updated = json.loads(await server.update_permission(
+        item_id, "replay-permission", "Updated by the replay flow", "replay-resource", "replay", ["replay", "updated"], project_key, readback="none"
+    ))
+    return {"groups": groups, "created": created, "listed": listed, "updated": updated}
+
+
+async def captcha_flow(project_key: str) -> dict:
+    saved = json.loads(await server.save_captcha_config("recaptcha", "replay-site-key", "replay-secret-key", project_key, readback="none"))
+    listed = json.loads(await server.list_captcha_configs(project_key, bypass_cache=True))
+    item_id = listed["configurations"][-1]["itemId"]
+    toggled = json.loads(await server.update_captcha_status(item_id, True, project_key, readback="none"))
+    return {"saved": saved, "listed": listed, "toggled": toggled}
+
+
+async def role_assignment_flow(project_key: str) -> dict:
+    permissions = json.loads(await server.list_permissions(project_key, page_size=3))
+    permission_ids = [permission["itemId"] for permission in permissions["permissions"]]
+    assigned = json.loads(await server.set_role_permissions("admin", permission_ids, [], project_key, readback="none"))
+    role_permissions = json.loads(await server.get_role_permissions(["admin"], project_key, bypass_cache=True))
+    return {"permission_ids": permission_ids, "assigned": assigned, "role_permissions": role_permissions}
+
+
+FLOWS = {
+    "roles": role_flow,
+    "permissions": permission_flow,
+    "captcha": captcha_flow,
+    "role_assignment": role_assignment_flow
+}
+
+
+async def run_flow(name: str, transport: httpx.AsyncBaseTransport, username: str, password: str, project_key: str) -> dict:
+    """Run one flow on a fresh session over the given transport."""
+    server.invalidate_cache()
+    server.http_state["client"] = httpx.AsyncClient(transport=transport)
+    try:
+        login = json.loads(await server.login(username, password))
+        assert login["status"] == "success", login
+        return await FLOWS[name](project_key)
+    finally:
+        server.cancel_token_refresh()
+        await server.close_http_client()
+
+
+def recorded_project_key(exchanges: list) -> str:
+    """Project key the cassette was recorded with, so replayed requests match the recorded ones."""
+    for exchange in exchanges:
+        query = dict(httpx.QueryParams(exchange["query"]))
+        if query.get("ProjectKey"):
+            return query["ProjectKey"]
+        if exchange["body"] and exchange["body"].startswith("{"):
+            project_key = json.loads(exchange["body"]).get("projectKey")
+            if project_key:
+                return project_key
+    return PROJECT_KEY
+
+
+def replay(name: str) -> dict:
+    exchanges = server.load_cassette(os.path.join(CASSETTE_DIR, f"{name}.jsonl"))
+    project_key = recorded_project_key(exchanges)
+    return asyncio.run(run_flow(name, server.ReplayTransport(exchanges), "user@example.com", "secret", project_key))
+
+
+def test_role_flow_replay():
+    result = replay("roles")
+
+    assert result["roles"]["status"] == "success"
+    assert result["created"]["status"] == "success"
+    assert "replay-editor" in [role["slug"] for role in result["after"]["roles"]]
+    assert result["after"]["total_count"] == result["roles"]["total_count"] + 1
+
+
+def test_permission_flow_replay():
+    result = replay("permissions")
+
+    assert result["groups"]["status"] == "success"
+    assert result["created"]["status"] == "success"
+    assert result["listed"]["total_count"] == 1
+    assert result["updated"]["status"] == "success"
+
+
+def test_captcha_flow_replay():
+    result = replay("captcha")
+
+    assert result["saved"]["status"] == "success"
+    assert result["listed"]["summary"][-1]["provider"] == "recaptcha"
+    assert result["toggled"]["status"] == "success"
+
+
+def test_role_assignment_flow_replay():
+    result = replay("role_assignment")
+
+    assert len(result["permission_ids"]) == 3
+    assert result["assigned"]["status"] == "success"
+    assigned = {permission["itemId"] for permission in result["role_permissions"]["permissions"]}
+    assert set(result["permission_ids"]) <= assigned
+
+
+def test_cassettes_are_scrubbed():
+    for name in FLOWS:
+        with open(os.path.join(CASSETTE_DIR, f"{name}.jsonl"), encoding="utf-8") as cassette:
+            text = cassette.read()
+        assert "eyJ" not in text
+        for exchange in server.load_cassette(os.path.join(CASSETTE_DIR, f"{name}.jsonl")):
+            if exchange["path"].endswith("/OAuth/Token"):
+                assert "password=%5BREDACTED%5D" in exchange["body"]
+                assert json.loads(exchange["response"])["access_token"] == server.REDACTED
+
+
+def test_replay_miss_is_reported():
+    transport = server.ReplayTransport([])
+
+    async def request():
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get(server.API_CONFIG["GET_PROJECTS_URL"])
+
+    try:
+        asyncio.run(request())
+    except server.CassetteMiss as e:
+        assert "/identifier/v1/Project/Gets" in str(e)
+    else:
+        raise AssertionError("expected CassetteMiss")
+
+
+def test_replay_speed_honours_recorded_offsets():
+    url = httpx.URL(server.API_CONFIG["GET_PROJECTS_URL"])
+    exchanges = [
+        {"offset": offset, "elapsed": 0.02, "method": "GET", "path": url.path, "query": "", "body": "",
+         "status": 200, "headers": {"content-type": "application/json"}, "response": "[]"}
+        for offset in (0.0, 0.3)
+    ]
+    transport = server.ReplayTransport(exchanges, speed=2.0)
+
+    async def request_twice():
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get(str(url))
+            await client.get(str(url))
+
+    started_at = time.monotonic()
+    asyncio.run(request_twice())
+    # The second response is due at (0.3 + 0.02) / 2 after the start
+    assert time.monotonic() - started_at >= 0.15
+
+
+def test_replay_miss_does_not_open_the_circuit():
+    server.circuit_state["circuits"].clear()
+    server.http_state["client"] = httpx.AsyncClient(transport=server.ReplayTransport([]))
+    url = server.API_CONFIG["GET_PROJECTS_URL"]
+
+    async def miss_repeatedly():
+        try:
+            for _ in range(server.CIRCUIT_CONFIG["failure_threshold"] + 1):
+                try:
+                    await server.api_request("GET", url)
+                except server.CassetteMiss:
+                    pass
+        finally:
+            await server.close_http_client()
+
+    asyncio.run(miss_repeatedly())
+    circuit = server.get_circuit(server.service_for_url(url))
+    assert circuit["state"] == "closed"
+    assert circuit["consecutive_failures"] == 0
+
+
+def record(use_mock: bool) -> None:
+    """Record every flow into tests/cassettes, replacing the existing cassettes."""
+    os.makedirs(CASSETTE_DIR, exist_ok=True)
+    for name in FLOWS:
+        path = os.path.join(CASSETTE_DIR, f"{name}.jsonl")
+        if os.path.exists(path):
+            os.remove(path)
+        if use_mock:
+            sys.path.insert(0, os.path.join(TESTS_DIR, "..", "benchmarks"))
+            from mock_selise_api import create_app
+
+            inner = httpx.ASGITransport(app=create_app(roles=3, permissions=12, schemas=2, projects=1))
+            credentials = ("user@example.com", "secret", PROJECT_KEY)
+        else:
+            inner = httpx.AsyncHTTPTransport()
+            credentials = (os.environ["SELISE_USERNAME"], os.environ["SELISE_PASSWORD"], os.environ["SELISE_PROJECT_KEY"])
+        asyncio.run(run_flow(name, server.RecordingTransport(inner, path), *credentials))
+        print(f"Recorded {path}")
+
+
+if __name__ == "__main__":
+    record("--mock" in sys.argv)
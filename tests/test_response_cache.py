@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the read-only response cache in selise_mcp_server.
+Covers TTL expiry, LRU eviction, the memory cap and write-through invalidation.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import selise_mcp_server as server  # noqa: E402
+
+
+def reset_cache():
+    server.invalidate_cache()
+    for counter in ("hits", "misses", "evictions", "invalidations"):
+        server.cache_state[counter] = 0
+
+
+def test_cache_hit_and_ttl_expiry():
+    reset_cache()
+    key = server.make_cache_key("list_roles", "P1", {"page": 0})
+    server.cache_put(key, {"data": [1]}, 10)
+
+    assert server.cache_get(key) == (True, {"data": [1]})
+
+    # Force the entry past its TTL
+    expires_at, data, size = server.cache_state["entries"][key]
+    server.cache_state["entries"][key] = (time.monotonic() - 1, data, size)
+    assert server.cache_get(key) == (False, None)
+    assert server.cache_state["bytes"] == 0
+
+
+def test_lru_eviction_respects_entry_and_byte_limits():
+    reset_cache()
+    original = dict(server.CACHE_CONFIG)
+    server.CACHE_CONFIG.update({"max_entries": 2, "max_bytes": 100})
+    try:
+        keys = [server.make_cache_key("list_roles", "P1", {"page": i}) for i in range(3)]
+        server.cache_put(keys[0], "a", 10)
+        server.cache_put(keys[1], "b", 10)
+        server.cache_get(keys[0])  # keys[0] becomes most recently used
+        server.cache_put(keys[2], "c", 10)
+
+        assert keys[1] not in server.cache_state["entries"]
+        assert keys[0] in server.cache_state["entries"]
+
+        # A single oversized response is never cached
+        server.cache_put(server.make_cache_key("list_roles", "P1", {"page": 9}), "big", 1000)
+        assert server.cache_state["bytes"] <= 100
+    finally:
+        server.CACHE_CONFIG.update(original)
+
+
+def test_invalidation_by_endpoint_project_and_params():
+    reset_cache()
+    server.cache_put(server.make_cache_key("list_roles", "P1", {}), "roles-1", 1)
+    server.cache_put(server.make_cache_key("list_roles", "P2", {}), "roles-2", 1)
+    server.cache_put(server.make_cache_key("get_schema", "P1", {"schema_id": "S1"}), "s1", 1)
+    server.cache_put(server.make_cache_key("get_schema", "P1", {"schema_id": "S2"}), "s2", 1)
+
+    assert server.invalidate_cache("list_roles", "P1") == 1
+    assert server.invalidate_cache("get_schema", match={"schema_id": "S1"}) == 1
+
+    remaining = set(server.cache_state["entries"])
+    assert server.make_cache_key("list_roles", "P2", {}) in remaining
+    assert server.make_cache_key("get_schema", "P1", {"schema_id": "S2"}) in remaining
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Offline tests for retries of transient upstream failures in selise_mcp_server.
+Covers backoff, Retry-After, the attempt cap, the retry budget and non-idempotent requests.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import selise_mcp_server as server  # noqa: E402
+
+URL = server.API_CONFIG["GET_PROJECTS_URL"]
+
+
+def scripted(responses: list, calls: list):
+    """Handler that answers with the scripted statuses (or raises scripted exceptions), repeating the last one."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        step = responses[min(len(calls), len(responses) - 1)]
+        calls.append(request.method)
+        if isinstance(step, Exception):
+            raise step
+        status, headers = step if isinstance(step, tuple) else (step, {})
+        return httpx.Response(status, headers=headers, json={})
+    return handler
+
+
+def send(responses: list, method: str = "GET", budget: float = None, **config) -> tuple:
+    """Send one request through send_with_retry; returns (response or exception, calls, seconds)."""
+    original = dict(server.RETRY_CONFIG)
+    server.RETRY_CONFIG.update({"base_delay": 0.001, "max_delay": 0.01, **config})
+    server.retry_state["budget"] = server.RETRY_CONFIG["budget_max"] if budget is None else budget
+    server.circuit_state["circuits"].clear()
+    calls = []
+
+    async def run():
+        server.http_state["client"] = httpx.AsyncClient(transport=httpx.MockTransport(scripted(responses, calls)))
+        try:
+            return await server.send_with_retry(method, URL)
+        except httpx.HTTPError as e:
+            return e
+        finally:
+            await server.close_http_client()
+
+    started_at = time.monotonic()
+    try:
+        outcome = asyncio.run(run())
+    finally:
+        server.RETRY_CONFIG.update(original)
+        server.circuit_state["circuits"].clear()
+    return outcome, calls, time.monotonic() - started_at
+
+
+def test_transient_failures_are_retried_until_success():
+    retries_before = server.retry_state["retries"]
+    response, calls, _ = send([503, 502, 200])
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert server.retry_state["retries"] - retries_before == 2
+
+
+def test_connect_errors_are_retried():
+    response, calls, _ = send([httpx.ConnectError("refused"), 200])
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+def test_attempts_are_capped():
+    response, calls, _ = send([503], max_attempts=3)
+
+    assert response.status_code == 503
+    assert len(calls) == 3
+
+
+def test_retry_after_sets_the_minimum_wait():
+    response, calls, seconds = send([(429, {"Retry-After": "0.2"}), 200])
+
+    assert response.status_code == 200
+    assert seconds >= 0.2
+
+    # A Retry-After beyond max_retry_after is returned to the caller instead of waited out
+    response, calls, _ = send([(429, {"Retry-After": "120"}), 200])
+    assert response.status_code == 429
+    assert len(calls) == 1
+
+
+def test_non_idempotent_requests_are_not_retried():
+    response, calls, _ = send([503, 200], method="POST")
+
+    assert response.status_code == 503
+    assert calls == ["POST"]
+
+
+def test_exhausted_budget_stops_retries():
+    exhausted_before = server.retry_state["budget_exhausted"]
+    response, calls, _ = send([503, 200], budget=0)
+
+    assert response.status_code == 503
+    assert len(calls) == 1
+    assert server.retry_state["budget_exhausted"] == exhausted_before + 1
+
+
+def test_backoff_is_capped_with_retry_after_floor():
+    for attempt in range(12):
+        assert 0 <= server.retry_delay(attempt) <= server.RETRY_CONFIG["max_delay"]
+    assert server.retry_delay(0, retry_after=3.0) >= 3.0
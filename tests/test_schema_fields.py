@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Offline tests for schema field merging in selise_mcp_server.
+Covers the add/modify/remove diff used by update_schema_fields and apply_project_plan.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import selise_mcp_server as server  # noqa: E402
+
+
+CURRENT = [
+    {"name": "Title", "type": "String"},
+    {"name": "Price", "type": "Float"}
+]
+
+
+def test_add_modify_remove():
+    merged, deletable, changes, errors = server.merge_schema_fields(
+        CURRENT,
+        add=[{"name": "Sku", "type": "String"}],
+        modify=[{"name": "Price", "type": "Decimal"}],
+        remove=["Title"]
+    )
+
+    assert errors == []
+    assert merged == [{"name": "Price", "type": "Decimal"}, {"name": "Sku", "type": "String"}]
+    assert deletable == ["Title"]
+    assert changes == ["add Sku", "modify Price (type)", "remove Title"]
+    # The current field list is not modified in place
+    assert CURRENT[1]["type"] == "Float"
+
+
+def test_no_op_and_errors():
+    merged, deletable, changes, errors = server.merge_schema_fields(CURRENT, modify=[{"name": "Price", "type": "Float"}])
+    assert (merged, deletable, changes, errors) == (CURRENT, [], [], [])
+
+    _, _, _, errors = server.merge_schema_fields(
+        CURRENT,
+        add=[{"name": "Title", "type": "String"}],
+        modify=[{"name": "Missing"}],
+        remove=["Gone"]
+    )
+    assert errors == [
+        "Field 'Title' already exists",
+        "Field 'Missing' does not exist",
+        "Field 'Gone' does not exist"
+    ]
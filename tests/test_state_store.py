@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the encrypted on-disk state store in selise_mcp_server.
+Covers the save/restore round-trip, encryption at rest and a wrong key.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from cryptography.fernet import Fernet
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import selise_mcp_server as server  # noqa: E402
+
+
+def clear_state():
+    server.auth_state.update({"access_token": None, "refresh_token": None, "expires_at": None})
+    for key in server.app_state:
+        server.app_state[key] = None
+    server.plan_state["applied"].clear()
+
+
+def use_store(path: str, key: bytes) -> dict:
+    original = dict(server.STATE_STORE_CONFIG)
+    server.STATE_STORE_CONFIG.update({"enabled": True, "path": path, "key": key})
+    return original
+
+
+def test_round_trip_is_encrypted():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "state.enc")
+        original = use_store(path, Fernet.generate_key())
+        try:
+            expires_at = datetime.now() + timedelta(hours=1)
+            server.auth_state.update({"access_token": "access-1", "refresh_token": "refresh-1", "expires_at": expires_at})
+            server.app_state.update({"tenant_id": "TENANT1", "application_domain": "https://dev-app.seliseblocks.com"})
+            server.plan_state["applied"]["TENANT1:mfa:config"] = "abc"
+            assert server.save_persistent_state() is True
+
+            with open(path, "rb") as state_file:
+                assert b"access-1" not in state_file.read()
+
+            clear_state()
+            assert server.load_persistent_state() is True
+            assert server.auth_state["access_token"] == "access-1"
+            assert server.auth_state["refresh_token"] == "refresh-1"
+            assert server.auth_state["expires_at"] == expires_at
+            assert server.app_state["tenant_id"] == "TENANT1"
+            assert server.plan_state["applied"] == {"TENANT1:mfa:config": "abc"}
+        finally:
+            server.STATE_STORE_CONFIG.update(original)
+            clear_state()
+
+
+def test_wrong_key_restores_nothing():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "state.enc")
+        original = use_store(path, Fernet.generate_key())
+        try:
+            server.auth_state.update({"access_token": "access-1", "refresh_token": "refresh-1", "expires_at": datetime.now()})
+            assert server.save_persistent_state() is True
+
+            clear_state()
+            server.STATE_STORE_CONFIG["key"] = Fernet.generate_key()
+            assert server.load_persistent_state() is False
+            assert server.auth_state["access_token"] is None
+            assert "could not be decrypted" in server.store_state["last_error"]
+        finally:
+            server.STATE_STORE_CONFIG.update(original)
+            clear_state()
+
+
+def test_key_file_is_created_next_to_the_state_file():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "nested", "state.enc")
+        original = use_store(path, None)
+        try:
+            server.app_state["tenant_id"] = "TENANT2"
+            assert server.save_persistent_state() is True
+            if os.name != "nt":
+                assert os.stat(f"{path}.key").st_mode & 0o777 == 0o600
+
+            clear_state()
+            assert server.load_persistent_state() is True
+            assert server.app_state["tenant_id"] == "TENANT2"
+        finally:
+            server.STATE_STORE_CONFIG.update(original)
+            clear_state()
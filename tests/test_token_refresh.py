@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Offline tests for access token refresh in selise_mcp_server.
+Covers the single-flight refresh on 401, refresh of an expired token before a call,
+and a failed refresh.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import selise_mcp_server as server  # noqa: E402
+
+
+def set_tokens(access_token: str, refresh_token: str, expires_in: float) -> None:
+    server.auth_state.update({
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "expires_at": datetime.now() + timedelta(seconds=expires_in),
+        "token_type": "bearer"
+    })
+    server.refresh_state.update({"in_flight": None, "refresh_count": 0, "last_error": None})
+    server.circuit_state["circuits"].clear()
+
+
+async def run_with_transport(handler, coroutine_factory):
+    server.http_state["client"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        return await coroutine_factory()
+    finally:
+        server.cancel_token_refresh()
+        await server.close_http_client()
+
+
+def token_handler(calls: dict, status: int = 200):
+    """Token endpoint that issues "new-token" (without a new refresh token) and a projects endpoint that wants it."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/OAuth/Token"):
+            calls["token"] += 1
+            assert b"grant_type=refresh_token" in request.content
+            if status != 200:
+                return httpx.Response(status, json={"error": "invalid_grant"})
+            return httpx.Response(200, json={"access_token": "new-token", "expires_in": 3600})
+        calls["api"] += 1
+        if request.headers.get("Authorization") != "Bearer new-token":
+            return httpx.Response(401, json={"error": "expired"})
+        return httpx.Response(200, json=[])
+    return handler
+
+
+def test_concurrent_401s_share_one_refresh():
+    set_tokens("old-token", "refresh-1", 3600)
+    calls = {"token": 0, "api": 0}
+
+    async def five_requests():
+        headers = server.get_auth_headers()
+        return await asyncio.gather(*(
+            server.api_request("GET", server.API_CONFIG["GET_PROJECTS_URL"], headers=headers) for _ in range(5)
+        ))
+
+    responses = asyncio.run(run_with_transport(token_handler(calls), five_requests))
+
+    assert [response.status_code for response in responses] == [200] * 5
+    assert calls["token"] == 1
+    assert server.auth_state["access_token"] == "new-token"
+    # The response had no refresh_token, so the stored one is kept
+    assert server.auth_state["refresh_token"] == "refresh-1"
+    assert server.refresh_state["refresh_count"] == 1
+
+
+def test_expired_token_is_refreshed_before_the_call():
+    set_tokens("old-token", "refresh-1", -10)
+    calls = {"token": 0, "api": 0}
+
+    authenticated = asyncio.run(run_with_transport(token_handler(calls), server.ensure_authenticated))
+
+    assert authenticated is True
+    assert calls == {"token": 1, "api": 0}
+    assert server.is_token_valid()
+
+
+def test_failed_refresh_reports_unauthenticated():
+    set_tokens("old-token", "refresh-1", -10)
+    calls = {"token": 0, "api": 0}
+
+    authenticated = asyncio.run(run_with_transport(token_handler(calls, status=400), server.ensure_authenticated))
+
+    assert authenticated is False
+    assert calls["token"] == 1
+    assert "400" in server.refresh_state["last_error"]